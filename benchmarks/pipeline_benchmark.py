@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""
+Offline end-to-end pipeline benchmark
+
+Runs WeiboTrendsAnalyzer.analyze_trends and generate_html_report against
+local stand-ins for every external service, so pipeline changes can be
+measured without spending API quota:
+
+- tianapi and SerpAPI are served by a local aiohttp stub server
+- claude_agent_sdk.query is replaced by an async generator that streams a
+  synthetic concept back in chunks
+
+Each stub has a configurable latency, error rate and payload size. Results
+(throughput, p50/p95 latency per stage, peak memory) are written as JSON so
+runs can be compared between commits.
+
+Usage:
+    python benchmarks/pipeline_benchmark.py [--topics 10,50,200,1000] [--concurrency 20] [--output bench.json]
+"""
+import io
+import os
+import re
+import sys
+import json
+import time
+import random
+import socket
+import asyncio
+import argparse
+import platform
+import resource
+import subprocess
+import tempfile
+import tracemalloc
+from contextlib import redirect_stdout
+from types import SimpleNamespace
+from typing import Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Stubs answer instantly compared to real providers; production rate limits would dominate
+for _provider in ("TIANAPI", "SERPAPI", "GOOGLE", "CLAUDE"):
+    os.environ.setdefault(f"{_provider}_RATE_LIMIT", "0")
+
+from aiohttp import web
+from claude_agent_sdk import ProcessError
+
+from scripts import weibo_analyzer
+from scripts.http_client import close_http_pool
+from scripts.weibo_analyzer import WeiboTrendsAnalyzer
+
+STAGES = ("fetch", "search", "llm", "organize", "render")
+
+# Stub services and their default latency (ms), error rate and payload size (bytes)
+STUB_DEFAULTS = {
+    "fetch": {"latency_ms": 80.0, "error_rate": 0.0, "payload_bytes": 64},
+    "search": {"latency_ms": 30.0, "error_rate": 0.0, "payload_bytes": 300},
+    "llm": {"latency_ms": 150.0, "error_rate": 0.0, "payload_bytes": 400}
+}
+
+TOPIC_PATTERN = re.compile(r"\*\*热搜话题\*\*：(.+)")
+
+
+class StubProfile:
+    """Latency, error rate and payload size of one stubbed service"""
+
+    def __init__(self, latency_ms: float, error_rate: float, payload_bytes: int, rng: random.Random):
+        self.latency_ms = latency_ms
+        self.error_rate = error_rate
+        self.payload_bytes = payload_bytes
+        self.rng = rng
+
+    async def wait(self):
+        """Sleep for the configured latency, jittered by ±50%"""
+        await asyncio.sleep(self.latency_ms * self.rng.uniform(0.5, 1.5) / 1000)
+
+    def should_fail(self) -> bool:
+        return self.rng.random() < self.error_rate
+
+    def padding(self) -> str:
+        """Filler text of roughly payload_bytes UTF-8 bytes (CJK characters are 3 bytes each)"""
+        return "模拟内容" * (self.payload_bytes // 12) or "模"
+
+
+class StubServer:
+    """Local HTTP server imitating the tianapi board and SerpAPI search endpoints"""
+
+    def __init__(self, fetch: StubProfile, search: StubProfile):
+        self.fetch = fetch
+        self.search = search
+        self.board_size = 10
+        self._runner = None
+        self.base_url = ""
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get("/weibohot", self._board)
+        app.router.add_get("/search.json", self._search)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        sock = socket.socket()
+        sock.bind(("127.0.0.1", 0))
+        await web.SockSite(self._runner, sock).start()
+        self.base_url = f"http://127.0.0.1:{sock.getsockname()[1]}"
+
+    async def stop(self):
+        await self._runner.cleanup()
+
+    async def _board(self, request: web.Request) -> web.Response:
+        await self.fetch.wait()
+        if self.fetch.should_fail():
+            return web.Response(status=503, text="stub unavailable")
+        topics = [
+            {
+                "hotword": f"基准话题{idx}",
+                "hotwordnum": f"综艺 {1_000_000 - idx * 97}",
+                "hottag": "热",
+                "note": self.fetch.padding()
+            }
+            for idx in range(1, self.board_size + 1)
+        ]
+        return web.json_response({"code": 200, "result": {"list": topics}})
+
+    async def _search(self, request: web.Request) -> web.Response:
+        await self.search.wait()
+        if self.search.should_fail():
+            return web.Response(status=503, text="stub unavailable")
+        query = request.query.get("q", "")
+        num = int(request.query.get("num", "5"))
+        results = [
+            {"title": f"{query} 结果{i}", "snippet": self.search.padding(), "link": f"https://example.com/{i}"}
+            for i in range(num)
+        ]
+        return web.json_response({"organic_results": results})
+
+
+def make_query_stub(profile: StubProfile):
+    """Build a stand-in for claude_agent_sdk.query that streams synthetic concepts"""
+
+    def concept(keyword: str) -> Dict:
+        return {
+            "keyword": keyword,
+            "product_name": f"{keyword}文创礼盒",
+            "market_category": "文创",
+            "target_audience": "18-35岁年轻人群",
+            "description": profile.padding(),
+            "manufacturing_details": "小批量柔性生产",
+            "score_breakdown": {
+                "development_potential": profile.rng.randint(10, 40),
+                "interest_level": profile.rng.randint(5, 20),
+                "life_utility": profile.rng.randint(5, 20),
+                "production_ease": profile.rng.randint(5, 20)
+            },
+            "total_score": 0,
+            "score_justification": "基准测试生成"
+        }
+
+    async def query(prompt: str, **kwargs):
+        await profile.wait()
+        if profile.should_fail():
+            # What the SDK raises when the CLI run fails, e.g. on an overloaded API
+            raise ProcessError("stub LLM overloaded", exit_code=1)
+
+        concepts = [concept(keyword.strip()) for keyword in TOPIC_PATTERN.findall(prompt)]
+        for c in concepts:
+            c["total_score"] = sum(c["score_breakdown"].values())
+        answer = json.dumps(concepts if len(concepts) > 1 else concepts[0], ensure_ascii=False)
+
+        # Stream the answer in a few chunks, like assistant message deltas
+        step = max(1, len(answer) // 4)
+        for start in range(0, len(answer), step):
+            yield SimpleNamespace(content=[SimpleNamespace(text=answer[start:start + step])])
+
+    return query
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Nearest-rank percentile (0 for an empty list)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(q / 100 * len(ordered)) - 1))]
+
+
+def timed(fn, timings: List[float]):
+    """Wrap a coroutine function so each call's duration is appended to `timings` (ms)"""
+    async def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return await fn(*args, **kwargs)
+        finally:
+            timings.append((time.perf_counter() - start) * 1000)
+    return wrapper
+
+
+def timed_sync(fn, timings: List[float]):
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            timings.append((time.perf_counter() - start) * 1000)
+    return wrapper
+
+
+async def run_scale(server: StubServer, topics: int, args, output_dir: str) -> Dict:
+    """Run the pipeline once for `topics` topics and collect its measurements"""
+    server.board_size = topics
+    timings: Dict[str, List[float]] = {stage: [] for stage in STAGES}
+
+    analyzer = WeiboTrendsAnalyzer("bench", "bench", "bench")
+    analyzer.weibo_client.base_url = f"{server.base_url}/weibohot"
+    analyzer.search_client.base_url = f"{server.base_url}/search.json"
+
+    analyzer.weibo_client.fetch_trending_topics_async = timed(
+        analyzer.weibo_client.fetch_trending_topics_async, timings["fetch"])
+    analyzer.search_client.search_async = timed(analyzer.search_client.search_async, timings["search"])
+    analyzer._query_llm = timed(analyzer._query_llm, timings["llm"])
+    analyzer.organize_results = timed_sync(analyzer.organize_results, timings["organize"])
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    with redirect_stdout(io.StringIO()):
+        results = await analyzer.analyze_trends(
+            limit=topics,
+            concurrency=args.concurrency,
+            batch_size=args.batch_size,
+            dedup_threshold=0
+        )
+        render_start = time.perf_counter()
+        analyzer.generate_html_report(results, output_dir)
+        timings["render"].append((time.perf_counter() - render_start) * 1000)
+    wall = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    products = results.get("all_products", [])
+    return {
+        "topics": topics,
+        "analyzed": len(products),
+        "fallback_concepts": sum(1 for p in products if p.get("score_justification", "").startswith("⚠️")),
+        "wall_seconds": round(wall, 3),
+        "throughput_topics_per_second": round(len(products) / wall, 2) if wall else 0.0,
+        "peak_traced_memory_mb": round(peak / 1024 / 1024, 2),
+        "stages": {
+            stage: {
+                "calls": len(values),
+                "p50_ms": round(percentile(values, 50), 2),
+                "p95_ms": round(percentile(values, 95), 2),
+                "total_ms": round(sum(values), 2)
+            }
+            for stage, values in timings.items()
+        }
+    }
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+async def run_benchmark(args) -> Dict:
+    rng = random.Random(args.seed)
+    profiles = {
+        name: StubProfile(
+            getattr(args, f"{name}_latency_ms"),
+            getattr(args, f"{name}_error_rate"),
+            getattr(args, f"{name}_payload_bytes"),
+            rng
+        )
+        for name in STUB_DEFAULTS
+    }
+
+    server = StubServer(profiles["fetch"], profiles["search"])
+    await server.start()
+    weibo_analyzer.query = make_query_stub(profiles["llm"])
+
+    scales = []
+    try:
+        with tempfile.TemporaryDirectory() as output_dir:
+            for topics in args.topics:
+                print(f"⏱️  {topics} topics...", file=sys.stderr)
+                scale = await run_scale(server, topics, args, output_dir)
+                print(f"  ✅ {scale['wall_seconds']}s, {scale['throughput_topics_per_second']} topics/s, "
+                      f"peak {scale['peak_traced_memory_mb']} MB", file=sys.stderr)
+                scales.append(scale)
+    finally:
+        await close_http_pool()
+        await server.stop()
+
+    return {
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "config": {
+            "concurrency": args.concurrency,
+            "batch_size": args.batch_size,
+            "seed": args.seed,
+            "stubs": {
+                name: {
+                    "latency_ms": p.latency_ms,
+                    "error_rate": p.error_rate,
+                    "payload_bytes": p.payload_bytes
+                }
+                for name, p in profiles.items()
+            }
+        },
+        "max_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 2),
+        "scales": scales
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline end-to-end pipeline benchmark")
+    parser.add_argument("--topics", default="10,50,200,1000",
+                        help="comma-separated topic counts to run (default: 10,50,200,1000)")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--batch-size", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="write the JSON results here instead of stdout")
+    for name, defaults in STUB_DEFAULTS.items():
+        parser.add_argument(f"--{name}-latency-ms", type=float, default=defaults["latency_ms"])
+        parser.add_argument(f"--{name}-error-rate", type=float, default=defaults["error_rate"])
+        parser.add_argument(f"--{name}-payload-bytes", type=int, default=defaults["payload_bytes"])
+    args = parser.parse_args()
+    args.topics = [int(n) for n in args.topics.split(",") if n]
+
+    report = asyncio.run(run_benchmark(args))
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output + "\n")
+        print(f"✅ Results saved: {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Render-only benchmark for the HTML report
+
+Compares the old per-call Environment (parse + compile the template on every
+render) against the shared environment, both cold (new process, bytecode
+cache on disk) and warm (template already loaded).
+
+Usage:
+    python benchmarks/render_benchmark.py [--data reports/weibo-trends-data-YYYY-MM-DD.json] [--runs 50]
+"""
+import os
+import sys
+import time
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from jinja2 import Environment, FileSystemLoader
+
+from scripts.assets import read_asset
+from scripts.data_format import find_data_files, load_results
+from scripts.templating import TEMPLATE_DIR, create_template_env
+
+TEMPLATE_NAME = "dashboard_template.html"
+
+
+def render(template, results):
+    return template.render(
+        assets={"css": {"inline": read_asset("dashboard.css")}, "js": {"inline": read_asset("dashboard.js")}},
+        metadata=results["metadata"],
+        excellent_products=results["products"]["excellent"],
+        good_products=results["products"]["good"],
+        other_products=results["products"]["other"],
+        # Every card inline, as with DASHBOARD_INLINE_CARDS=0
+        tier_offsets={
+            "excellent": 0,
+            "good": len(results["products"]["excellent"]),
+            "other": len(results["products"]["excellent"]) + len(results["products"]["good"])
+        },
+        lazy_cards={}
+    )
+
+
+def time_runs(fn, runs):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark HTML report rendering")
+    parser.add_argument("--data", help="analysis JSON to render (defaults to the latest report)")
+    parser.add_argument("--runs", type=int, default=50)
+    args = parser.parse_args()
+
+    data_file = args.data or str(max(find_data_files("reports").items())[1])
+    results = load_results(data_file)
+
+    def legacy():
+        env = Environment(loader=FileSystemLoader(TEMPLATE_DIR))
+        render(env.get_template(TEMPLATE_NAME), results)
+
+    # Populate the on-disk bytecode cache once, as a previous run would have
+    create_template_env().get_template(TEMPLATE_NAME)
+
+    def cold_cached():
+        render(create_template_env().get_template(TEMPLATE_NAME), results)
+
+    warm_template = create_template_env().get_template(TEMPLATE_NAME)
+
+    def warm():
+        render(warm_template, results)
+
+    print(f"📊 Rendering {data_file} ({args.runs} runs each)")
+    baseline = None
+    for name, fn in (("per-call Environment", legacy),
+                     ("new process, bytecode cache", cold_cached),
+                     ("shared environment", warm)):
+        timings = time_runs(fn, args.runs)
+        median = statistics.median(timings)
+        baseline = baseline or median
+        print(f"  {name:<30} median {median:8.2f} ms   speedup x{baseline / median:5.1f}")
+
+
+if __name__ == "__main__":
+    main()
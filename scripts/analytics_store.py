@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+Historical analytics store for Weibo Trends Analyzer
+
+Every run's topics and product concepts are appended to an indexed SQLite
+database so cross-day questions don't require parsing every daily JSON file.
+
+Usage:
+    python scripts/analytics_store.py backfill [--reports-dir reports]
+    python scripts/analytics_store.py keyword <keyword> [--contains]
+    python scripts/analytics_store.py top [--category <market category>] [--since YYYY-MM-DD] [--limit 10]
+    python scripts/analytics_store.py stats
+
+Dates with a data file in --reports-dir (default reports) but no rows in the
+store are ingested before any query runs.
+"""
+import os
+import sys
+import json
+import time
+import sqlite3
+import argparse
+from typing import Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.data_format import find_data_files, load_results
+
+DEFAULT_DB_PATH = ".cache/analytics.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_date TEXT PRIMARY KEY,
+    generated_at TEXT,
+    total_analyzed INTEGER,
+    average_score REAL,
+    ingested_at REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS concepts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_date TEXT NOT NULL REFERENCES runs(run_date) ON DELETE CASCADE,
+    keyword TEXT NOT NULL,
+    rank INTEGER,
+    heat_value INTEGER,
+    tag TEXT,
+    category TEXT,
+    product_name TEXT,
+    market_category TEXT,
+    target_audience TEXT,
+    description TEXT,
+    total_score INTEGER,
+    development_potential INTEGER,
+    interest_level INTEGER,
+    life_utility INTEGER,
+    production_ease INTEGER,
+    tier_class TEXT,
+    data TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_concepts_run_date ON concepts(run_date);
+CREATE INDEX IF NOT EXISTS idx_concepts_keyword ON concepts(keyword);
+CREATE INDEX IF NOT EXISTS idx_concepts_category ON concepts(category);
+CREATE INDEX IF NOT EXISTS idx_concepts_market_category_score ON concepts(market_category, total_score DESC);
+CREATE INDEX IF NOT EXISTS idx_concepts_score ON concepts(total_score DESC);
+"""
+
+# Columns returned by queries (the full concept stays available in `data`)
+SUMMARY_COLUMNS = (
+    "run_date, keyword, rank, heat_value, category, product_name, "
+    "market_category, total_score, tier_class"
+)
+
+
+class AnalyticsStore:
+    """Indexed SQLite store of all analysed topics and their concepts"""
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Args:
+            path: Database file (defaults to ANALYTICS_DB_PATH or .cache/analytics.sqlite)
+        """
+        self.path = path or os.getenv("ANALYTICS_DB_PATH", DEFAULT_DB_PATH)
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(self.path)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.executescript(SCHEMA)
+
+    def ingest_results(self, results: Dict, run_date: str) -> int:
+        """
+        Store one run's results, replacing any earlier ingest of the same date
+
+        Args:
+            results: Analysis results dictionary (as saved to the daily JSON)
+            run_date: Run date (YYYY-MM-DD)
+
+        Returns:
+            Number of concepts stored
+        """
+        metadata = results.get("metadata", {})
+        products = results.get("all_products", [])
+
+        with self._conn:
+            self._conn.execute("DELETE FROM runs WHERE run_date = ?", (run_date,))
+            self._conn.execute(
+                "INSERT INTO runs (run_date, generated_at, total_analyzed, average_score, ingested_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (run_date, metadata.get("generated_at"), metadata.get("total_analyzed"),
+                 metadata.get("average_score"), time.time())
+            )
+            self._conn.executemany(
+                "INSERT INTO concepts (run_date, keyword, rank, heat_value, tag, category, product_name, "
+                "market_category, target_audience, description, total_score, development_potential, "
+                "interest_level, life_utility, production_ease, tier_class, data) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [self._concept_row(run_date, product) for product in products]
+            )
+
+        return len(products)
+
+    def backfill(self, reports_dir: str = "reports", force: bool = False) -> Dict[str, int]:
+        """
+        Ingest existing daily JSON files
+
+        Args:
+            reports_dir: Directory containing weibo-trends-data-* files
+            force: Re-ingest dates that are already stored
+
+        Returns:
+            Mapping of run date to number of concepts ingested
+        """
+        known = {row[0] for row in self._conn.execute("SELECT run_date FROM runs")}
+        ingested = {}
+
+        for run_date, json_file in sorted(find_data_files(reports_dir).items()):
+            if run_date in known and not force:
+                continue
+
+            try:
+                results = load_results(json_file)
+            except (OSError, ValueError) as e:
+                print(f"⚠️  Skipping {json_file.name}: {e}")
+                continue
+
+            ingested[run_date] = self.ingest_results(results, run_date)
+
+        return ingested
+
+    def concepts_for_keyword(self, keyword: str, contains: bool = False) -> List[Dict]:
+        """
+        All concepts generated for a trending keyword, newest first
+
+        Args:
+            keyword: Trending keyword
+            contains: Match keywords containing `keyword` instead of exact matches
+
+        Returns:
+            List of concept summary dictionaries
+        """
+        if contains:
+            where, param = "keyword LIKE ?", f"%{keyword}%"
+        else:
+            where, param = "keyword = ?", keyword
+
+        rows = self._conn.execute(
+            f"SELECT {SUMMARY_COLUMNS} FROM concepts WHERE {where} ORDER BY run_date DESC, rank",
+            (param,)
+        )
+        return [dict(row) for row in rows]
+
+    def top_concepts(
+        self,
+        market_category: Optional[str] = None,
+        since: Optional[str] = None,
+        limit: int = 10
+    ) -> List[Dict]:
+        """
+        Highest-scoring concepts, optionally within one market category
+
+        Args:
+            market_category: Market category to filter on (e.g. "文创")
+            since: Only include runs on or after this date (YYYY-MM-DD)
+            limit: Maximum number of concepts
+
+        Returns:
+            List of concept summary dictionaries, best first
+        """
+        conditions, params = [], []
+        if market_category:
+            conditions.append("market_category = ?")
+            params.append(market_category)
+        if since:
+            conditions.append("run_date >= ?")
+            params.append(since)
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        rows = self._conn.execute(
+            f"SELECT {SUMMARY_COLUMNS} FROM concepts {where} "
+            "ORDER BY total_score DESC, run_date DESC LIMIT ?",
+            (*params, limit)
+        )
+        return [dict(row) for row in rows]
+
+    def stats(self) -> Dict:
+        """Return overall counts for the store"""
+        runs, first, last = self._conn.execute(
+            "SELECT COUNT(*), MIN(run_date), MAX(run_date) FROM runs"
+        ).fetchone()
+        (concepts,) = self._conn.execute("SELECT COUNT(*) FROM concepts").fetchone()
+        return {"runs": runs, "concepts": concepts, "first_run": first, "last_run": last}
+
+    def close(self):
+        """Close the database connection"""
+        self._conn.close()
+
+    @staticmethod
+    def _concept_row(run_date: str, product: Dict) -> tuple:
+        breakdown = product.get("score_breakdown", {}) or {}
+        return (
+            run_date,
+            product.get("keyword", ""),
+            product.get("rank"),
+            product.get("heat_value"),
+            product.get("tag", ""),
+            product.get("category", ""),
+            product.get("product_name", ""),
+            product.get("market_category", ""),
+            product.get("target_audience", ""),
+            product.get("description", ""),
+            product.get("total_score"),
+            breakdown.get("development_potential"),
+            breakdown.get("interest_level"),
+            breakdown.get("life_utility"),
+            breakdown.get("production_ease"),
+            product.get("tier_class", ""),
+            json.dumps(product, ensure_ascii=False)
+        )
+
+
+def _print_concepts(concepts: List[Dict]):
+    if not concepts:
+        print("📭 No matching concepts")
+        return
+    for c in concepts:
+        print(f"  {c['run_date']}  #{c['rank']:<3} {c['total_score']:>3}/100  "
+              f"{c['keyword']} → {c['product_name']} ({c['market_category']})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query the historical analytics store")
+    parser.add_argument("--db", help=f"database path (default: $ANALYTICS_DB_PATH or {DEFAULT_DB_PATH})")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    # Every command first ingests dates that exist on disk but not in the store
+    # (e.g. a fresh CI cache), so answers always cover the full history
+    reports = argparse.ArgumentParser(add_help=False)
+    reports.add_argument("--reports-dir", default="reports")
+
+    backfill = sub.add_parser("backfill", parents=[reports], help="ingest existing daily JSON files")
+    backfill.add_argument("--force", action="store_true", help="re-ingest dates already stored")
+
+    keyword = sub.add_parser("keyword", parents=[reports], help="all concepts for a keyword")
+    keyword.add_argument("keyword")
+    keyword.add_argument("--contains", action="store_true", help="substring match")
+
+    top = sub.add_parser("top", parents=[reports], help="top-scoring concepts")
+    top.add_argument("--category", help="market category, e.g. 文创")
+    top.add_argument("--since", help="YYYY-MM-DD")
+    top.add_argument("--limit", type=int, default=10)
+
+    sub.add_parser("stats", parents=[reports], help="store summary")
+
+    args = parser.parse_args()
+    store = AnalyticsStore(args.db)
+    start = time.perf_counter()
+
+    ingested = store.backfill(args.reports_dir, force=getattr(args, "force", False))
+    if args.command == "backfill" or ingested:
+        print(f"✅ Backfilled {len(ingested)} run(s), {sum(ingested.values())} concept(s)")
+
+    if args.command == "keyword":
+        _print_concepts(store.concepts_for_keyword(args.keyword, contains=args.contains))
+    elif args.command == "top":
+        _print_concepts(store.top_concepts(args.category, since=args.since, limit=args.limit))
+    elif args.command == "stats":
+        stats = store.stats()
+        print(f"📊 {stats['runs']} run(s), {stats['concepts']} concept(s), "
+              f"{stats['first_run']} ~ {stats['last_run']}")
+
+    print(f"⏱️  {(time.perf_counter() - start) * 1000:.1f} ms")
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""
+Shared stylesheet and script assets for report pages
+
+The CSS and JS in scripts/static are either inlined into each page or
+published once under <reports>/assets/ with a content hash in the filename
+and linked from every page. Hashed files never change, so browsers and CDNs
+can cache them indefinitely, and pages from earlier runs keep pointing at the
+version they were rendered with.
+
+Published assets and pages get .gz (and, when the brotli package is
+installed, .br) precompressed siblings for static hosts that serve them.
+"""
+import os
+import gzip
+import shutil
+import hashlib
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+SOURCE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+
+# Subdirectory of the reports directory that holds published assets
+ASSET_SUBDIR = "assets"
+
+# Hex digits of the content hash kept in asset filenames
+HASH_LENGTH = 10
+
+# Precompressed siblings written next to a published file
+PRECOMPRESSED_SUFFIXES = (".gz", ".br")
+
+# Read size when compressing
+COMPRESS_CHUNK_BYTES = 256 * 1024
+
+
+def asset_mode() -> str:
+    """Asset mode from REPORT_ASSETS: shared hashed files (the default) or inline"""
+    return "inline" if os.getenv("REPORT_ASSETS", "shared").lower() == "inline" else "shared"
+
+
+def precompress_enabled() -> bool:
+    """False when PRECOMPRESS=off"""
+    return os.getenv("PRECOMPRESS", "on").lower() != "off"
+
+
+@lru_cache(maxsize=None)
+def read_asset(name: str) -> str:
+    """
+    Read an asset's source
+
+    Args:
+        name: Filename in scripts/static (e.g. "dashboard.css")
+
+    Returns:
+        Asset text
+    """
+    with open(os.path.join(SOURCE_DIR, name), 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def hashed_name(name: str) -> str:
+    """Filename with the content hash inserted before the extension (dashboard.<hash>.css)"""
+    stem, ext = os.path.splitext(name)
+    digest = hashlib.sha256(read_asset(name).encode('utf-8')).hexdigest()[:HASH_LENGTH]
+    return f"{stem}.{digest}{ext}"
+
+
+def precompress(path: str) -> List[str]:
+    """
+    Write precompressed siblings of a file (path.gz, and path.br if brotli is available)
+
+    The file is compressed in chunks, so large pages are never read into memory whole.
+
+    Args:
+        path: File to compress
+
+    Returns:
+        Paths written
+    """
+    written = []
+
+    target = f"{path}.gz"
+    with open(path, 'rb') as src, open(f"{target}.tmp", 'wb') as raw:
+        # No filename and mtime=0 keep the .gz bytes identical for identical input
+        with gzip.GzipFile(filename="", mode='wb', fileobj=raw, compresslevel=9, mtime=0) as out:
+            shutil.copyfileobj(src, out, COMPRESS_CHUNK_BYTES)
+    os.replace(f"{target}.tmp", target)
+    written.append(target)
+
+    if brotli is not None:
+        target = f"{path}.br"
+        compressor = brotli.Compressor(quality=11)
+        with open(path, 'rb') as src, open(f"{target}.tmp", 'wb') as out:
+            for chunk in iter(lambda: src.read(COMPRESS_CHUNK_BYTES), b""):
+                out.write(compressor.process(chunk))
+            out.write(compressor.finish())
+        os.replace(f"{target}.tmp", target)
+        written.append(target)
+
+    return written
+
+
+def remove_with_siblings(path: str):
+    """Delete a published file together with its precompressed siblings"""
+    for target in (path, *(path + suffix for suffix in PRECOMPRESSED_SUFFIXES)):
+        if os.path.exists(target):
+            os.remove(target)
+
+
+def publish_asset(name: str, output_dir: str) -> str:
+    """
+    Write an asset under <output_dir>/assets/ with a content-hashed filename
+
+    Already published versions are left alone.
+
+    Args:
+        name: Filename in scripts/static
+        output_dir: Reports directory the linking pages live in
+
+    Returns:
+        URL of the asset relative to those pages
+    """
+    filename = hashed_name(name)
+    asset_dir = os.path.join(output_dir, ASSET_SUBDIR)
+    path = os.path.join(asset_dir, filename)
+
+    if not os.path.exists(path):
+        os.makedirs(asset_dir, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(read_asset(name))
+        os.replace(tmp_path, path)
+        if precompress_enabled():
+            precompress(path)
+
+    return f"{ASSET_SUBDIR}/{filename}"
+
+
+def page_assets(output_dir: str, css: str, js: Optional[str] = None) -> Dict[str, Dict[str, str]]:
+    """
+    Template context for a page's stylesheet and script
+
+    Args:
+        output_dir: Directory the page is written to
+        css: Stylesheet filename in scripts/static
+        js: Script filename in scripts/static, if the page has one
+
+    Returns:
+        {"css": {...}, "js": {...}}, each holding either "href" or "inline"
+    """
+    shared = asset_mode() == "shared"
+    assets = {}
+    for kind, name in (("css", css), ("js", js)):
+        if name is None:
+            continue
+        assets[kind] = {"href": publish_asset(name, output_dir)} if shared else {"inline": read_asset(name)}
+    return assets
@@ -0,0 +1,226 @@
+"""
+Persistent on-disk caches for Weibo Trends Analyzer
+"""
+import os
+import json
+import time
+import hashlib
+import sqlite3
+from typing import Any, Dict, Optional
+
+
+class CacheMissError(Exception):
+    """Raised in replay-only mode when a required cache entry is missing"""
+
+
+class SQLiteCache:
+    """Size-bounded key/value cache stored in a SQLite file, with optional TTL"""
+
+    def __init__(
+        self,
+        path: str,
+        ttl_seconds: Optional[float] = None,
+        max_entries: int = 5000,
+        table: str = "cache"
+    ):
+        """
+        Args:
+            path: SQLite database file (parent directories are created)
+            ttl_seconds: Entry lifetime in seconds, or None for no expiry
+            max_entries: Maximum number of entries; least recently used are evicted
+            table: Table name, so several caches can share one file
+        """
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.table = table
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+            "created_at REAL NOT NULL, last_access REAL NOT NULL)"
+        )
+        self._conn.execute(
+            f"CREATE INDEX IF NOT EXISTS idx_{table}_last_access ON {table}(last_access)"
+        )
+        self._purge_expired()
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Look up a cached value
+
+        Args:
+            key: Cache key
+
+        Returns:
+            The decoded value, or None on a miss or an expired entry
+        """
+        row = self._conn.execute(
+            f"SELECT value, created_at FROM {self.table} WHERE key = ?", (key,)
+        ).fetchone()
+
+        now = time.time()
+        if row is None or self._is_expired(row[1], now):
+            self.misses += 1
+            return None
+
+        self._conn.execute(
+            f"UPDATE {self.table} SET last_access = ? WHERE key = ?", (now, key)
+        )
+        self._conn.commit()
+        self.hits += 1
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Any):
+        """
+        Store a JSON-serialisable value, evicting old entries if over capacity
+
+        Args:
+            key: Cache key
+            value: Value to store
+        """
+        now = time.time()
+        self._conn.execute(
+            f"INSERT OR REPLACE INTO {self.table} (key, value, created_at, last_access) "
+            "VALUES (?, ?, ?, ?)",
+            (key, json.dumps(value, ensure_ascii=False), now, now)
+        )
+        self._evict()
+        self._conn.commit()
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss/eviction counters and the current entry count"""
+        (size,) = self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": size
+        }
+
+    def close(self):
+        """Close the underlying database connection"""
+        self._conn.close()
+
+    def _is_expired(self, created_at: float, now: float) -> bool:
+        return self.ttl_seconds is not None and now - created_at > self.ttl_seconds
+
+    def _purge_expired(self):
+        if self.ttl_seconds is not None:
+            self._conn.execute(
+                f"DELETE FROM {self.table} WHERE created_at < ?",
+                (time.time() - self.ttl_seconds,)
+            )
+
+    def _evict(self):
+        (size,) = self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()
+        overflow = size - self.max_entries
+        if overflow > 0:
+            self._conn.execute(
+                f"DELETE FROM {self.table} WHERE key IN ("
+                f"SELECT key FROM {self.table} ORDER BY last_access ASC LIMIT ?)",
+                (overflow,)
+            )
+            self.evictions += overflow
+
+
+class SearchCache(SQLiteCache):
+    """Cache for SearchAPIClient.search results, keyed by engine, query and result count"""
+
+    def __init__(self, path: str, ttl_seconds: Optional[float] = 24 * 3600, max_entries: int = 5000):
+        super().__init__(path, ttl_seconds=ttl_seconds, max_entries=max_entries, table="search_results")
+
+    @staticmethod
+    def make_key(engine: str, query: str, num_results: int) -> str:
+        """Build the cache key for one search call"""
+        return json.dumps([engine, query, num_results], ensure_ascii=False)
+
+
+class LLMResponseCache(SQLiteCache):
+    """Content-addressed cache of raw LLM responses, keyed by a hash of prompt and model settings"""
+
+    def __init__(self, path: str, max_entries: int = 2000, replay_only: bool = False):
+        """
+        Args:
+            path: SQLite database file
+            max_entries: Maximum number of responses kept
+            replay_only: If True, lookups that miss raise CacheMissError
+        """
+        super().__init__(path, ttl_seconds=None, max_entries=max_entries, table="llm_responses")
+        self.replay_only = replay_only
+
+    @staticmethod
+    def make_key(prompt: str, settings: Dict[str, Any]) -> str:
+        """Hash the prompt together with the model settings that affect the response"""
+        payload = json.dumps({"prompt": prompt, "settings": settings}, ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def lookup(self, key: str) -> Optional[str]:
+        """
+        Return the cached response text for a key
+
+        Raises:
+            CacheMissError: On a miss when running in replay-only mode
+        """
+        response = self.get(key)
+        if response is None and self.replay_only:
+            raise CacheMissError(f"LLM response {key[:12]} not in cache (replay-only mode)")
+        return response
+
+
+def create_search_cache_from_env(ignore_ttl: bool = False) -> Optional[SearchCache]:
+    """
+    Build the search cache from environment variables
+
+    SEARCH_CACHE_PATH, SEARCH_CACHE_TTL_HOURS (0 disables the cache) and
+    SEARCH_CACHE_MAX_ENTRIES override the defaults.
+
+    Args:
+        ignore_ttl: Keep and serve expired entries (used for offline replays)
+
+    Returns:
+        SearchCache instance, or None if caching is disabled
+    """
+    ttl_hours = float(os.getenv("SEARCH_CACHE_TTL_HOURS", "24"))
+    if ttl_hours <= 0 and not ignore_ttl:
+        return None
+
+    return SearchCache(
+        path=os.getenv("SEARCH_CACHE_PATH", ".cache/search_cache.sqlite"),
+        ttl_seconds=None if ignore_ttl else ttl_hours * 3600,
+        max_entries=int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", "5000"))
+    )
+
+
+def create_llm_cache_from_env() -> Optional[LLMResponseCache]:
+    """
+    Build the LLM response cache from environment variables
+
+    LLM_CACHE_MODE is "on" (default), "off" or "replay" (serve from cache only
+    and fail fast on a miss). LLM_CACHE_PATH and LLM_CACHE_MAX_ENTRIES
+    override the defaults.
+
+    Returns:
+        LLMResponseCache instance, or None if caching is disabled
+    """
+    mode = os.getenv("LLM_CACHE_MODE", "on").lower()
+    if mode == "off":
+        return None
+    if mode not in ("on", "replay"):
+        raise ValueError(f"Unsupported LLM_CACHE_MODE: {mode}")
+
+    return LLMResponseCache(
+        path=os.getenv("LLM_CACHE_PATH", ".cache/llm_cache.sqlite"),
+        max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", "2000")),
+        replay_only=mode == "replay"
+    )
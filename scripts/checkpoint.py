@@ -0,0 +1,154 @@
+"""
+Per-run checkpoints for resumable analysis
+
+Every run appends to a JSON-lines file: first its run date and the list of
+topics it is going to analyze, then one record per topic as soon as its research and
+product concept are done. If the process dies part-way, a resumed run
+reloads the file and only analyzes the topics that have no record yet, and
+its results are saved under the original run's date.
+"""
+import os
+import json
+from datetime import datetime
+from typing import Dict, List, Optional
+
+DEFAULT_CHECKPOINT_DIR = ".cache/checkpoints"
+
+# Checkpoint files kept in the directory (oldest are deleted)
+MAX_CHECKPOINTS = 10
+
+
+class RunCheckpoint:
+    """Append-only record of one analysis run's progress"""
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: Checkpoint file (created on first write)
+        """
+        self.path = path
+        self.run_date: Optional[str] = None
+        self.topics: List[Dict] = []
+        self.concepts: Dict[str, Dict] = {}
+        self._load()
+
+    @classmethod
+    def create(cls, directory: Optional[str] = None) -> "RunCheckpoint":
+        """
+        Start a checkpoint for a new run
+
+        Args:
+            directory: Checkpoint directory (defaults to CHECKPOINT_DIR or .cache/checkpoints)
+        """
+        directory = directory or os.getenv("CHECKPOINT_DIR", DEFAULT_CHECKPOINT_DIR)
+        os.makedirs(directory, exist_ok=True)
+        _prune(directory, keep=MAX_CHECKPOINTS - 1)
+        name = f"run-{datetime.now().strftime('%Y-%m-%d_%H%M%S_%f')}.jsonl"
+        return cls(os.path.join(directory, name))
+
+    @classmethod
+    def latest(cls, directory: Optional[str] = None) -> Optional["RunCheckpoint"]:
+        """
+        Reopen the most recent unfinished run's checkpoint
+
+        Args:
+            directory: Checkpoint directory (defaults to CHECKPOINT_DIR or .cache/checkpoints)
+
+        Returns:
+            The checkpoint, or None if there is nothing to resume
+        """
+        directory = directory or os.getenv("CHECKPOINT_DIR", DEFAULT_CHECKPOINT_DIR)
+        candidates = _checkpoint_files(directory)
+        return cls(candidates[0]) if candidates else None
+
+    @property
+    def started(self) -> bool:
+        """True once the run's topic list has been recorded"""
+        return bool(self.topics)
+
+    def start(self, topics: List[Dict], run_date: str):
+        """
+        Record the topics this run is going to analyze
+
+        Args:
+            topics: Topics in the order they are analyzed
+            run_date: Date (YYYY-MM-DD) the run's results are saved under
+        """
+        self.topics = list(topics)
+        self.run_date = run_date
+        self._append({"type": "topics", "run_date": run_date, "topics": self.topics})
+
+    def record(self, concept: Dict):
+        """
+        Record a finished topic
+
+        Fallback concepts are written too but don't count as done, so a
+        resumed run gives those topics another try.
+
+        Args:
+            concept: Completed product concept (includes its research summary)
+        """
+        self._append({"type": "concept", "concept": concept})
+        if not concept.get("fallback_reason"):
+            self.concepts[concept["keyword"]] = concept
+
+    def pending(self) -> List[Dict]:
+        """Recorded topics that have no finished concept yet, in their original order"""
+        return [topic for topic in self.topics if topic["keyword"] not in self.concepts]
+
+    def discard(self):
+        """Delete the checkpoint once the run's results are safely written"""
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+    def _append(self, record: Dict):
+        # One flushed line per record, so a crash loses at most the line being written
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                lines = f.readlines()
+        except FileNotFoundError:
+            return
+
+        if lines and not lines[-1].endswith("\n"):
+            # Drop the line cut off by the crash, so new records start on a line of their own
+            lines.pop()
+            with open(self.path, 'rb+') as f:
+                f.truncate(sum(len(line.encode('utf-8')) for line in lines))
+
+        for line in lines:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if record.get("type") == "topics":
+                self.topics = record["topics"]
+                self.run_date = record.get("run_date")
+            elif record.get("type") == "concept":
+                concept = record["concept"]
+                if concept.get("fallback_reason"):
+                    self.concepts.pop(concept["keyword"], None)
+                else:
+                    self.concepts[concept["keyword"]] = concept
+
+
+def _checkpoint_files(directory: str) -> List[str]:
+    """Checkpoint files in `directory`, newest first"""
+    if not os.path.isdir(directory):
+        return []
+    entries = [
+        entry for entry in os.scandir(directory)
+        if entry.name.startswith("run-") and entry.name.endswith(".jsonl")
+    ]
+    entries.sort(key=lambda entry: entry.name, reverse=True)
+    return [entry.path for entry in entries]
+
+
+def _prune(directory: str, keep: int):
+    for path in _checkpoint_files(directory)[keep:]:
+        os.remove(path)
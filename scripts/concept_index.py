@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+Similar-concept lookup over report history
+
+A BM25 full-text index over the character bigrams of every stored concept's
+product_name, description and market_category. It lives next to the
+analytics store's tables and is brought up to date incrementally: only runs
+ingested since the last sync are (re)indexed.
+
+Usage:
+    python scripts/concept_index.py sync
+    python scripts/concept_index.py rebuild
+    python scripts/concept_index.py similar <text> [-k 5]
+"""
+import os
+import re
+import sys
+import json
+import math
+import time
+import sqlite3
+import argparse
+from collections import Counter
+from typing import Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.analytics_store import DEFAULT_DB_PATH, SCHEMA as ANALYTICS_SCHEMA
+from scripts.utils import char_ngrams
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS concept_docs (
+    doc_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_date TEXT NOT NULL,
+    keyword TEXT NOT NULL,
+    product_name TEXT,
+    market_category TEXT,
+    total_score INTEGER,
+    length REAL NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_concept_docs_run_date ON concept_docs(run_date);
+
+CREATE TABLE IF NOT EXISTS concept_postings (
+    gram TEXT NOT NULL,
+    doc_id INTEGER NOT NULL,
+    tf REAL NOT NULL,
+    PRIMARY KEY (gram, doc_id)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_concept_postings_doc_id ON concept_postings(doc_id);
+
+CREATE TABLE IF NOT EXISTS concept_index_runs (
+    run_date TEXT PRIMARY KEY,
+    ingested_at REAL NOT NULL
+);
+"""
+
+# Term-frequency weight of each indexed field (product names are short but decisive)
+FIELD_WEIGHTS = {
+    "product_name": 2.0,
+    "market_category": 1.0,
+    "description": 1.0
+}
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+# Minimum BM25 score for a neighbour to be attached by annotate(); matches on
+# boilerplate bigrams shared by nearly every concept score far below this
+MIN_ANNOTATION_SIMILARITY = 1.0
+
+_NOISE_PATTERN = re.compile(r"[\W_]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Character bigrams of `text`, lowercased, with punctuation removed"""
+    return char_ngrams(_NOISE_PATTERN.sub(" ", text.lower()), 2)
+
+
+def weighted_terms(concept: Dict) -> Counter:
+    """Field-weighted term frequencies for one concept"""
+    terms = Counter()
+    for field, weight in FIELD_WEIGHTS.items():
+        for gram in tokenize(concept.get(field) or ""):
+            terms[gram] += weight
+    return terms
+
+
+class ConceptIndex:
+    """BM25 index of historical product concepts"""
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Args:
+            path: Analytics database file (defaults to ANALYTICS_DB_PATH or .cache/analytics.sqlite)
+        """
+        self.path = path or os.getenv("ANALYTICS_DB_PATH", DEFAULT_DB_PATH)
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(self.path)
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.executescript(ANALYTICS_SCHEMA)
+        self._conn.executescript(SCHEMA)
+
+    def sync(self) -> Dict[str, int]:
+        """
+        Index runs ingested into the analytics store since the last sync
+
+        Runs re-ingested since they were indexed are re-indexed, and runs
+        that were removed from the store are dropped from the index.
+
+        Returns:
+            Mapping of run date to number of concepts indexed
+        """
+        stored = dict(self._conn.execute("SELECT run_date, ingested_at FROM runs"))
+        indexed = dict(self._conn.execute("SELECT run_date, ingested_at FROM concept_index_runs"))
+        synced = {}
+
+        with self._conn:
+            for run_date in indexed.keys() - stored.keys():
+                self._delete_run(run_date)
+                self._conn.execute("DELETE FROM concept_index_runs WHERE run_date = ?", (run_date,))
+
+            for run_date, ingested_at in sorted(stored.items()):
+                if indexed.get(run_date) == ingested_at:
+                    continue
+
+                concepts = [
+                    json.loads(data) for (data,) in
+                    self._conn.execute("SELECT data FROM concepts WHERE run_date = ?", (run_date,))
+                ]
+                self._delete_run(run_date)
+                for concept in concepts:
+                    self._add_concept(run_date, concept)
+
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO concept_index_runs (run_date, ingested_at) VALUES (?, ?)",
+                    (run_date, ingested_at)
+                )
+                synced[run_date] = len(concepts)
+
+        return synced
+
+    def rebuild(self) -> Dict[str, int]:
+        """Drop the whole index and re-index every stored run"""
+        with self._conn:
+            self._conn.execute("DELETE FROM concept_postings")
+            self._conn.execute("DELETE FROM concept_docs")
+            self._conn.execute("DELETE FROM concept_index_runs")
+        return self.sync()
+
+    def similar(self, text: str, k: int = 5, exclude_run_date: Optional[str] = None) -> List[Dict]:
+        """
+        Top-K historical concepts most similar to a text
+
+        Args:
+            text: Query text (e.g. a product name and description)
+            k: Number of concepts to return
+            exclude_run_date: Leave out concepts from this run (e.g. the current one)
+
+        Returns:
+            Concept summaries with their BM25 score, best first
+        """
+        return self._search(Counter(tokenize(text)), k, exclude_run_date)
+
+    def similar_to_concept(
+        self,
+        concept: Dict,
+        k: int = 5,
+        exclude_run_date: Optional[str] = None
+    ) -> List[Dict]:
+        """
+        Top-K historical concepts most similar to a product concept
+
+        Args:
+            concept: Product concept dictionary
+            k: Number of concepts to return
+            exclude_run_date: Leave out concepts from this run (e.g. the current one)
+
+        Returns:
+            Concept summaries with their BM25 score, best first
+        """
+        return self._search(weighted_terms(concept), k, exclude_run_date)
+
+    def annotate(self, products: List[Dict], k: int = 3, exclude_run_date: Optional[str] = None) -> int:
+        """
+        Attach each product's nearest historical concepts as `similar_concepts`
+
+        Args:
+            products: Product concept dictionaries (modified in place)
+            k: Neighbours per product
+            exclude_run_date: Run the products belong to, so they don't match themselves
+
+        Returns:
+            Number of products with at least one neighbour
+        """
+        annotated = 0
+        for product in products:
+            neighbours = [
+                n for n in self.similar_to_concept(product, k, exclude_run_date)
+                if n["similarity"] >= MIN_ANNOTATION_SIMILARITY
+            ]
+            product["similar_concepts"] = neighbours
+            annotated += bool(neighbours)
+        return annotated
+
+    def close(self):
+        """Close the database connection"""
+        self._conn.close()
+
+    def _add_concept(self, run_date: str, concept: Dict):
+        terms = weighted_terms(concept)
+        cursor = self._conn.execute(
+            "INSERT INTO concept_docs (run_date, keyword, product_name, market_category, total_score, length) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (run_date, concept.get("keyword", ""), concept.get("product_name", ""),
+             concept.get("market_category", ""), concept.get("total_score"), sum(terms.values()))
+        )
+        self._conn.executemany(
+            "INSERT INTO concept_postings (gram, doc_id, tf) VALUES (?, ?, ?)",
+            [(gram, cursor.lastrowid, tf) for gram, tf in terms.items()]
+        )
+
+    def _delete_run(self, run_date: str):
+        self._conn.execute(
+            "DELETE FROM concept_postings WHERE doc_id IN "
+            "(SELECT doc_id FROM concept_docs WHERE run_date = ?)",
+            (run_date,)
+        )
+        self._conn.execute("DELETE FROM concept_docs WHERE run_date = ?", (run_date,))
+
+    def _search(self, query_terms: Counter, k: int, exclude_run_date: Optional[str]) -> List[Dict]:
+        if not query_terms or k <= 0:
+            return []
+
+        total_docs, avg_length = self._conn.execute(
+            "SELECT COUNT(*), AVG(length) FROM concept_docs"
+        ).fetchone()
+        if not total_docs:
+            return []
+
+        grams = list(query_terms)
+        placeholders = ",".join("?" * len(grams))
+        postings: Dict[str, List] = {}
+        for gram, doc_id, tf, length in self._conn.execute(
+            "SELECT p.gram, p.doc_id, p.tf, d.length FROM concept_postings p "
+            f"JOIN concept_docs d ON d.doc_id = p.doc_id WHERE p.gram IN ({placeholders})",
+            grams
+        ):
+            postings.setdefault(gram, []).append((doc_id, tf, length))
+
+        scores: Dict[int, float] = {}
+        for gram, entries in postings.items():
+            df = len(entries)
+            idf = math.log(1 + (total_docs - df + 0.5) / (df + 0.5))
+            weight = idf * query_terms[gram]
+            for doc_id, tf, length in entries:
+                norm = tf + K1 * (1 - B + B * length / avg_length)
+                scores[doc_id] = scores.get(doc_id, 0.0) + weight * tf * (K1 + 1) / norm
+
+        if exclude_run_date:
+            for (doc_id,) in self._conn.execute(
+                "SELECT doc_id FROM concept_docs WHERE run_date = ?", (exclude_run_date,)
+            ):
+                scores.pop(doc_id, None)
+
+        top = sorted(scores, key=scores.get, reverse=True)[:k]
+        if not top:
+            return []
+
+        rows = {
+            row[0]: row[1:] for row in self._conn.execute(
+                "SELECT doc_id, run_date, keyword, product_name, market_category, total_score "
+                f"FROM concept_docs WHERE doc_id IN ({','.join('?' * len(top))})",
+                top
+            )
+        }
+        return [
+            {
+                "run_date": rows[doc_id][0],
+                "keyword": rows[doc_id][1],
+                "product_name": rows[doc_id][2],
+                "market_category": rows[doc_id][3],
+                "total_score": rows[doc_id][4],
+                "similarity": round(scores[doc_id], 2)
+            }
+            for doc_id in top
+        ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Find similar product concepts in report history")
+    parser.add_argument("--db", help=f"database path (default: $ANALYTICS_DB_PATH or {DEFAULT_DB_PATH})")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    sub.add_parser("sync", help="index runs added to the analytics store since the last sync")
+    sub.add_parser("rebuild", help="re-index every stored run")
+
+    similar = sub.add_parser("similar", help="top-K similar historical concepts")
+    similar.add_argument("text", help="product name and/or description")
+    similar.add_argument("-k", type=int, default=5)
+
+    args = parser.parse_args()
+    index = ConceptIndex(args.db)
+    start = time.perf_counter()
+
+    if args.command in ("sync", "rebuild"):
+        synced = index.sync() if args.command == "sync" else index.rebuild()
+        print(f"✅ Indexed {len(synced)} run(s), {sum(synced.values())} concept(s)")
+    elif args.command == "similar":
+        matches = index.similar(args.text, k=args.k)
+        if not matches:
+            print("📭 No similar concepts")
+        for m in matches:
+            print(f"  {m['similarity']:6.2f}  {m['run_date']}  {m['product_name']} "
+                  f"({m['market_category']}, {m['total_score']}/100) ← {m['keyword']}")
+
+    print(f"⏱️  {(time.perf_counter() - start) * 1000:.1f} ms")
+    index.close()
+
+
+if __name__ == "__main__":
+    main()
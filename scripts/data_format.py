@@ -0,0 +1,345 @@
+"""
+Compact storage format for daily analysis data
+
+The results dictionary produced by organize_results() repeats every product
+(once in its tier list, once in all_products) and embeds the full research
+text in every concept. On disk each product is stored once instead:
+
+    {
+      "format": "weibo-trends-compact",
+      "version": 2,
+      "metadata": {...},
+      "tiers": {"excellent": [0, 3], "good": [1], "other": [2]},
+      "products": [{..., "research_summary": {"social_media": "<text id>", ...}}],
+      "texts": {"<text id>": "research text", ...}
+    }
+
+Tier lists are indexes into `products`, and research text lives in a side
+table keyed by a hash of its content, so identical text (such as the
+"search unavailable" placeholders) is stored once. The same records can be
+written as gzip-compressed JSON lines (DATA_FORMAT=ndjson) with the header
+on the first line, which lets readers that only need the metadata stop early.
+
+load_results() returns the familiar results dictionary for both this format
+and the original pretty-printed files. Existing files can be rewritten with:
+
+    python scripts/data_format.py convert [--reports-dir reports] [--format json|ndjson]
+"""
+import os
+import gzip
+import json
+import hashlib
+import argparse
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+COMPACT_FORMAT = "weibo-trends-compact"
+COMPACT_VERSION = 2
+
+DATA_FILE_PREFIX = "weibo-trends-data-"
+
+# File suffix for each DATA_FORMAT value
+DATA_FILE_SUFFIXES = {
+    "json": ".json",
+    "ndjson": ".ndjson.gz"
+}
+
+TIERS = ("excellent", "good", "other")
+
+# Hex digits of the content hash used as a text id
+TEXT_ID_LENGTH = 16
+
+
+def data_format() -> str:
+    """Output format from DATA_FORMAT: "json" (compact JSON, the default) or "ndjson" (gzip JSON lines)"""
+    fmt = os.getenv("DATA_FORMAT", "json").lower()
+    return fmt if fmt in DATA_FILE_SUFFIXES else "json"
+
+
+def data_filename(date_str: str, fmt: Optional[str] = None) -> str:
+    """Daily data filename for a date in the given (or configured) format"""
+    return f"{DATA_FILE_PREFIX}{date_str}{DATA_FILE_SUFFIXES[fmt or data_format()]}"
+
+
+def data_file_date(name: str) -> Optional[str]:
+    """Date of a daily data filename in any format, or None for other files"""
+    if not name.startswith(DATA_FILE_PREFIX):
+        return None
+    for suffix in DATA_FILE_SUFFIXES.values():
+        if name.endswith(suffix):
+            return name[len(DATA_FILE_PREFIX):-len(suffix)]
+    return None
+
+
+def find_data_files(reports_dir: str) -> Dict[str, Path]:
+    """
+    Daily data files in a reports directory, by date
+
+    Args:
+        reports_dir: Reports directory
+
+    Returns:
+        Mapping of date string to file path (the newest file when a date exists in two formats)
+    """
+    found: Dict[str, os.DirEntry] = {}
+    if not os.path.isdir(reports_dir):
+        return {}
+    with os.scandir(reports_dir) as it:
+        for entry in it:
+            date_str = data_file_date(entry.name)
+            if date_str is None:
+                continue
+            if date_str not in found or entry.stat().st_mtime > found[date_str].stat().st_mtime:
+                found[date_str] = entry
+    return {date_str: Path(entry.path) for date_str, entry in found.items()}
+
+
+def text_id(text: str) -> str:
+    """Content-addressed id of a research text"""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()[:TEXT_ID_LENGTH]
+
+
+def _pack_product(product: Dict, texts: Dict[str, str]) -> Dict:
+    packed = dict(product)
+    research = product.get("research_summary")
+    if isinstance(research, dict):
+        refs = {}
+        for field, text in research.items():
+            if isinstance(text, str):
+                refs[field] = text_id(text)
+                texts[refs[field]] = text
+            else:
+                refs[field] = text
+        packed["research_summary"] = refs
+    return packed
+
+
+def pack_results(results: Dict) -> Dict:
+    """
+    Convert a results dictionary to the compact format
+
+    Args:
+        results: Results dictionary from organize_results()
+
+    Returns:
+        Compact document (see module docstring)
+    """
+    all_products = results.get("all_products", [])
+    texts: Dict[str, str] = {}
+    products = [_pack_product(product, texts) for product in all_products]
+
+    # Tier entries are normally the same objects as in all_products; results
+    # loaded from an original-format file have equal copies instead
+    by_identity = {id(product): idx for idx, product in enumerate(all_products)}
+    by_keyword = {product.get("keyword"): idx for idx, product in enumerate(all_products)}
+
+    tiers = {}
+    for tier in TIERS:
+        indexes = []
+        for product in results.get("products", {}).get(tier, []):
+            idx = by_identity.get(id(product), by_keyword.get(product.get("keyword")))
+            if idx is None:
+                products.append(_pack_product(product, texts))
+                idx = len(products) - 1
+            indexes.append(idx)
+        tiers[tier] = indexes
+
+    return {
+        "format": COMPACT_FORMAT,
+        "version": COMPACT_VERSION,
+        "metadata": results.get("metadata", {}),
+        "tiers": tiers,
+        "products": products,
+        "texts": texts
+    }
+
+
+def unpack_results(document: Dict) -> Dict:
+    """
+    Convert a stored document back to the results dictionary shape
+
+    Documents in the original format are returned unchanged. Tier lists
+    share product objects with all_products, as they do after organize_results().
+
+    Args:
+        document: Parsed data file
+
+    Returns:
+        Results dictionary with metadata, products.{excellent,good,other} and all_products
+    """
+    if document.get("format") != COMPACT_FORMAT:
+        return document
+
+    texts = document.get("texts", {})
+    all_products = []
+    for product in document.get("products", []):
+        research = product.get("research_summary")
+        if isinstance(research, dict):
+            product["research_summary"] = {
+                field: texts.get(ref, ref) if isinstance(ref, str) else ref
+                for field, ref in research.items()
+            }
+        all_products.append(product)
+
+    tiers = document.get("tiers", {})
+    return {
+        "metadata": document.get("metadata", {}),
+        "products": {tier: [all_products[idx] for idx in tiers.get(tier, [])] for tier in TIERS},
+        "all_products": all_products
+    }
+
+
+def _ndjson_records(document: Dict) -> Iterator[Dict]:
+    yield {
+        "type": "header",
+        "format": document["format"],
+        "version": document["version"],
+        "metadata": document["metadata"],
+        "tiers": document["tiers"]
+    }
+    for tid, text in document["texts"].items():
+        yield {"type": "text", "id": tid, "text": text}
+    for product in document["products"]:
+        yield {"type": "product", "product": product}
+
+
+def _document_from_ndjson(lines: Iterable[str]) -> Dict:
+    document = {"texts": {}, "products": []}
+    for line in lines:
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        kind = record.pop("type", None)
+        if kind == "header":
+            document.update(record)
+        elif kind == "text":
+            document["texts"][record["id"]] = record["text"]
+        elif kind == "product":
+            document["products"].append(record["product"])
+    return document
+
+
+def save_results(results: Dict, output_dir: str, date_str: str, fmt: Optional[str] = None) -> str:
+    """
+    Write a day's results in the compact format (atomically)
+
+    A file for the same date in the other format is removed, so a day
+    never has two diverging data files.
+
+    Args:
+        results: Results dictionary from organize_results()
+        output_dir: Reports directory
+        date_str: Report date (YYYY-MM-DD)
+        fmt: "json" or "ndjson" (defaults to DATA_FORMAT)
+
+    Returns:
+        Path to the saved file
+    """
+    fmt = fmt or data_format()
+    os.makedirs(output_dir, exist_ok=True)
+    filepath = os.path.join(output_dir, data_filename(date_str, fmt))
+    document = pack_results(results)
+
+    # Write then rename, so a report being updated in place is never read half-written
+    tmp_path = f"{filepath}.tmp"
+    if fmt == "ndjson":
+        with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+            for record in _ndjson_records(document):
+                f.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+    else:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(document, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp_path, filepath)
+
+    for other in DATA_FILE_SUFFIXES:
+        if other != fmt:
+            stale_path = os.path.join(output_dir, data_filename(date_str, other))
+            if os.path.exists(stale_path):
+                os.remove(stale_path)
+
+    return filepath
+
+
+def load_results(path) -> Dict:
+    """
+    Load a daily data file in any supported format
+
+    Args:
+        path: Data file (.json in the original or compact format, or .ndjson.gz)
+
+    Returns:
+        Results dictionary
+
+    Raises:
+        OSError, ValueError: If the file can't be read or parsed
+    """
+    path = str(path)
+    if path.endswith(".gz"):
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            return unpack_results(_document_from_ndjson(f))
+
+    with open(path, 'r', encoding='utf-8') as f:
+        return unpack_results(json.load(f))
+
+
+def load_metadata(path) -> Dict:
+    """
+    Read only a data file's metadata
+
+    JSON-lines files stop after the header line; JSON files are parsed in full.
+
+    Args:
+        path: Data file
+
+    Returns:
+        Metadata dictionary
+
+    Raises:
+        OSError, ValueError: If the file can't be read or parsed
+    """
+    path = str(path)
+    if path.endswith(".gz"):
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            return json.loads(f.readline()).get("metadata", {})
+
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f).get("metadata", {})
+
+
+def convert_reports(reports_dir: str = "reports", fmt: Optional[str] = None) -> Dict[str, Tuple[int, int]]:
+    """
+    Rewrite every daily data file in the compact format
+
+    Args:
+        reports_dir: Reports directory
+        fmt: "json" or "ndjson" (defaults to DATA_FORMAT)
+
+    Returns:
+        Mapping of date to (old size, new size) in bytes
+    """
+    converted = {}
+    for date_str, path in sorted(find_data_files(reports_dir).items()):
+        old_size = path.stat().st_size
+        new_path = save_results(load_results(path), reports_dir, date_str, fmt)
+        converted[date_str] = (old_size, os.path.getsize(new_path))
+    return converted
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Daily data file format utilities")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    convert = sub.add_parser("convert", help="rewrite existing data files in the compact format")
+    convert.add_argument("--reports-dir", default="reports")
+    convert.add_argument("--format", choices=sorted(DATA_FILE_SUFFIXES), help="default: $DATA_FORMAT or json")
+
+    args = parser.parse_args()
+    if args.command == "convert":
+        converted = convert_reports(args.reports_dir, args.format)
+        old_total = sum(old for old, _ in converted.values())
+        new_total = sum(new for _, new in converted.values())
+        print(f"✅ Converted {len(converted)} file(s): {old_total / 1024:.1f} KB → {new_total / 1024:.1f} KB")
+
+
+if __name__ == "__main__":
+    main()
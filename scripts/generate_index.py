@@ -3,494 +3,331 @@ Generate index.html for GitHub Pages
 Lists all generated Weibo Trends Analysis reports
 """
 import os
+import sys
 import json
+import zlib
+import hashlib
 from datetime import datetime
 from pathlib import Path
+from typing import Dict, List, Optional
 
+# Add parent directory to path to import the shared template environment
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-def get_report_files(reports_dir="reports"):
-    """Get all HTML and JSON report files"""
-    reports_path = Path(reports_dir)
+from scripts.assets import page_assets, precompress, precompress_enabled, remove_with_siblings
+from scripts.data_format import data_file_date, load_metadata
+from scripts.templating import get_template, render_to_file
 
-    if not reports_path.exists():
-        return []
+MANIFEST_FILENAME = "manifest.json"
+MANIFEST_VERSION = 2
 
-    html_files = sorted(reports_path.glob("weibo-trends-analysis-*.html"), reverse=True)
+# Reports per index page
+PAGE_SIZE = 30
 
-    reports = []
-    for html_file in html_files:
-        # Extract date from filename
-        filename = html_file.name
-        date_str = filename.replace("weibo-trends-analysis-", "").replace(".html", "")
-
-        # Check if corresponding JSON exists
-        json_file = reports_path / f"weibo-trends-data-{date_str}.json"
-
-        # Get file size
-        file_size = html_file.stat().st_size / 1024  # KB
-
-        # Try to get metadata from JSON
-        metadata = {}
-        if json_file.exists():
-            try:
-                with open(json_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    metadata = data.get('metadata', {})
-            except:
-                pass
 
-        reports.append({
-            'date': date_str,
-            'html_file': filename,
-            'json_file': f"weibo-trends-data-{date_str}.json" if json_file.exists() else None,
-            'file_size': round(file_size, 1),
-            'metadata': metadata
-        })
+def load_manifest(reports_path: Path) -> Dict:
+    """Load reports/manifest.json, or return an empty manifest"""
+    manifest_file = reports_path / MANIFEST_FILENAME
+    try:
+        with open(manifest_file, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get("version") == MANIFEST_VERSION:
+            return manifest
+    except (OSError, ValueError):
+        pass
+    return {"version": MANIFEST_VERSION, "reports": {}}
 
-    return reports
 
+def save_manifest(reports_path: Path, manifest: Dict):
+    """Write the manifest atomically"""
+    manifest_file = reports_path / MANIFEST_FILENAME
+    tmp_file = manifest_file.with_suffix(".json.tmp")
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1, sort_keys=True)
+    os.replace(tmp_file, manifest_file)
 
-def generate_index_html(reports, output_file="reports/index.html"):
-    """Generate index.html listing all reports"""
-
-    html_content = """<!DOCTYPE html>
-<html lang="zh-CN">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>微博热搜创意产品分析 - 历史报告</title>
-    <style>
-        * {
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }
 
-        body {
-            font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", "PingFang SC", "Hiragino Sans GB", "Microsoft YaHei", sans-serif;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            min-height: 100vh;
-            padding: 20px;
-        }
+# Local (uncommitted) record of each data file's size, mtime and CRC32
+DEFAULT_STAT_CACHE_PATH = ".cache/manifest-stat.json"
 
-        .container {
-            max-width: 1200px;
-            margin: 0 auto;
-            background: white;
-            border-radius: 20px;
-            box-shadow: 0 20px 60px rgba(0, 0, 0, 0.3);
-            overflow: hidden;
-        }
+# Read size when checksumming
+CRC_CHUNK_BYTES = 256 * 1024
 
-        header {
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-            padding: 60px 40px;
-            text-align: center;
-        }
 
-        header h1 {
-            font-size: 2.5em;
-            margin-bottom: 10px;
-        }
+def _file_crc32(path: Path) -> int:
+    crc = 0
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CRC_CHUNK_BYTES), b""):
+            crc = zlib.crc32(chunk, crc)
+    return crc
 
-        header .subtitle {
-            font-size: 1.2em;
-            opacity: 0.9;
-            margin-bottom: 20px;
-        }
 
-        .stats {
-            display: flex;
-            justify-content: center;
-            gap: 40px;
-            margin-top: 30px;
-            flex-wrap: wrap;
-        }
+def _load_stat_cache(path: str) -> Dict[str, Dict]:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
 
-        .stat-item {
-            text-align: center;
-        }
 
-        .stat-value {
-            font-size: 2.5em;
-            font-weight: bold;
-        }
+def _save_stat_cache(path: str, stats: Dict[str, Dict]):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(stats, f, sort_keys=True)
+    os.replace(tmp_path, path)
 
-        .stat-label {
-            font-size: 0.9em;
-            opacity: 0.8;
-            margin-top: 5px;
-        }
 
-        .content {
-            padding: 40px;
-        }
+def _read_metadata(json_path: Path) -> Dict:
+    try:
+        return load_metadata(json_path)
+    except (OSError, ValueError, AttributeError):
+        return {}
 
-        .intro {
-            background: #f8f9fa;
-            padding: 30px;
-            border-radius: 15px;
-            margin-bottom: 40px;
-            border-left: 5px solid #667eea;
-        }
 
-        .intro h2 {
-            color: #667eea;
-            margin-bottom: 15px;
-        }
+def _json_entry(json_path: Path, stat: os.stat_result, previous: Optional[Dict], local: Optional[Dict]) -> Dict:
+    """
+    Build the manifest entry for a data file, re-reading it only if it changed
 
-        .intro p {
-            line-height: 1.8;
-            color: #555;
-            margin-bottom: 10px;
-        }
+    Entries are keyed on size and CRC32: the manifest is committed, and
+    mtimes change on every fresh checkout without the content changing. The
+    CRC32 is only recomputed when the file's size or local mtime differs
+    from the uncommitted stat cache, and the file is only parsed when the
+    CRC32 differs from the manifest.
 
-        .reports-section {
-            margin-top: 30px;
-        }
+    Args:
+        json_path: Data file
+        stat: Its stat result
+        previous: Its entry in the manifest, if any
+        local: Its entry in the stat cache, if any
 
-        .section-title {
-            font-size: 1.8em;
-            margin-bottom: 25px;
-            padding-bottom: 10px;
-            border-bottom: 3px solid #667eea;
-            color: #333;
-        }
+    Returns:
+        Manifest entry
+    """
+    if local and local.get("size") == stat.st_size and local.get("mtime") == stat.st_mtime:
+        crc = local["crc32"]
+    else:
+        crc = _file_crc32(json_path)
 
-        .reports-grid {
-            display: grid;
-            grid-template-columns: repeat(auto-fill, minmax(350px, 1fr));
-            gap: 25px;
-        }
+    if previous and previous.get("size") == stat.st_size and previous.get("crc32") == crc:
+        return previous
 
-        .report-card {
-            background: white;
-            border: 2px solid #e0e0e0;
-            border-radius: 15px;
-            padding: 25px;
-            transition: all 0.3s;
-            cursor: pointer;
-        }
+    return {
+        "file": json_path.name,
+        "size": stat.st_size,
+        "crc32": crc,
+        "metadata": _read_metadata(json_path)
+    }
 
-        .report-card:hover {
-            transform: translateY(-5px);
-            box-shadow: 0 10px 30px rgba(102, 126, 234, 0.2);
-            border-color: #667eea;
-        }
 
-        .report-date {
-            font-size: 1.4em;
-            font-weight: bold;
-            color: #667eea;
-            margin-bottom: 15px;
-        }
+def update_manifest(reports_dir: str = "reports", stat_cache_path: Optional[str] = None) -> Dict:
+    """
+    Bring reports/manifest.json up to date with the reports directory
 
-        .report-meta {
-            display: grid;
-            grid-template-columns: 1fr 1fr;
-            gap: 10px;
-            margin: 15px 0;
-            font-size: 0.9em;
-        }
+    Only new or changed data files are read; entries for deleted reports are
+    dropped. The manifest is rewritten only if something changed.
 
-        .meta-item {
-            background: #f8f9fa;
-            padding: 10px;
-            border-radius: 8px;
-        }
+    Args:
+        reports_dir: Reports directory
+        stat_cache_path: Local stat cache (defaults to MANIFEST_STAT_CACHE or
+            .cache/manifest-stat.json)
 
-        .meta-label {
-            color: #666;
-            font-size: 0.85em;
-            margin-bottom: 3px;
-        }
+    Returns:
+        The up-to-date manifest
+    """
+    reports_path = Path(reports_dir)
+    manifest = load_manifest(reports_path)
+    old_entries = manifest["reports"]
+
+    stat_cache_path = stat_cache_path or os.getenv("MANIFEST_STAT_CACHE", DEFAULT_STAT_CACHE_PATH)
+    old_stats = _load_stat_cache(stat_cache_path)
+    # Keyed by absolute path, so one cache serves any reports directory
+    reports_prefix = os.path.join(os.path.abspath(reports_dir), "")
+    new_stats = {key: value for key, value in old_stats.items() if not key.startswith(reports_prefix)}
+
+    html_stats = {}
+    json_stats = {}
+    with os.scandir(reports_path) as it:
+        for entry in it:
+            name = entry.name
+            if name.startswith("weibo-trends-analysis-") and name.endswith(".html"):
+                html_stats[name[len("weibo-trends-analysis-"):-len(".html")]] = entry.stat()
+            elif data_file_date(name) is not None:
+                # A day's data may exist in both formats for a moment while switching; the newest wins
+                stat = entry.stat()
+                previous_json = json_stats.get(data_file_date(name))
+                if previous_json is None or stat.st_mtime > previous_json[1].st_mtime:
+                    json_stats[data_file_date(name)] = (name, stat)
+
+    new_entries = {}
+    for date_str, html_stat in html_stats.items():
+        previous = old_entries.get(date_str, {})
+        entry = {
+            "html_file": f"weibo-trends-analysis-{date_str}.html",
+            "html_size": html_stat.st_size,
+            "json": None
+        }
+
+        if date_str in json_stats:
+            json_name, json_stat = json_stats[date_str]
+            previous_json = previous.get("json")
+            if previous_json and previous_json.get("file") != json_name:
+                previous_json = None
+            json_path = reports_path / json_name
+            stat_key = reports_prefix + json_name
+            entry["json"] = _json_entry(json_path, json_stat, previous_json, old_stats.get(stat_key))
+            new_stats[stat_key] = {
+                "size": json_stat.st_size,
+                "mtime": json_stat.st_mtime,
+                "crc32": entry["json"]["crc32"]
+            }
 
-        .meta-value {
-            color: #333;
-            font-weight: bold;
-            font-size: 1.1em;
-        }
+        new_entries[date_str] = entry
 
-        .report-actions {
-            display: flex;
-            gap: 10px;
-            margin-top: 20px;
-        }
+    if new_entries != old_entries:
+        manifest["reports"] = new_entries
+        save_manifest(reports_path, manifest)
+    if new_stats != old_stats:
+        _save_stat_cache(stat_cache_path, new_stats)
 
-        .btn {
-            flex: 1;
-            padding: 12px 20px;
-            border: none;
-            border-radius: 8px;
-            font-size: 0.95em;
-            font-weight: 500;
-            cursor: pointer;
-            transition: all 0.3s;
-            text-decoration: none;
-            text-align: center;
-            display: inline-block;
-        }
+    return manifest
 
-        .btn-primary {
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-        }
 
-        .btn-primary:hover {
-            transform: scale(1.05);
-            box-shadow: 0 5px 15px rgba(102, 126, 234, 0.3);
-        }
+def get_report_files(reports_dir="reports"):
+    """Get all HTML and JSON report files"""
+    reports_path = Path(reports_dir)
 
-        .btn-secondary {
-            background: #f8f9fa;
-            color: #667eea;
-            border: 2px solid #667eea;
-        }
+    if not reports_path.exists():
+        return []
 
-        .btn-secondary:hover {
-            background: #667eea;
-            color: white;
-        }
+    manifest = update_manifest(reports_dir)
 
-        .empty-state {
-            text-align: center;
-            padding: 60px 20px;
-            color: #999;
-        }
+    reports = []
+    for date_str in sorted(manifest["reports"], reverse=True):
+        entry = manifest["reports"][date_str]
+        json_entry = entry["json"]
 
-        .empty-state-icon {
-            font-size: 4em;
-            margin-bottom: 20px;
-        }
+        reports.append({
+            'date': date_str,
+            'html_file': entry["html_file"],
+            'json_file': json_entry["file"] if json_entry else None,
+            'file_size': round(entry["html_size"] / 1024, 1),  # KB
+            'metadata': json_entry["metadata"] if json_entry else {}
+        })
 
-        footer {
-            background: #2c3e50;
-            color: white;
-            padding: 30px 40px;
-            text-align: center;
-        }
+    return reports
 
-        footer p {
-            margin: 10px 0;
-            opacity: 0.8;
-        }
 
-        footer a {
-            color: #667eea;
-            text-decoration: none;
-        }
+def archive_page_name(page_number: int) -> str:
+    """Filename of an archive page (page 1 holds the oldest reports)"""
+    return f"index-page-{page_number}.html"
 
-        footer a:hover {
-            text-decoration: underline;
-        }
 
-        @media (max-width: 768px) {
-            .reports-grid {
-                grid-template-columns: 1fr;
-            }
+def _page_signature(reports: List[Dict], prev_url: Optional[str], next_url: Optional[str]) -> str:
+    payload = json.dumps([reports, prev_url, next_url], ensure_ascii=False, sort_keys=True)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
 
-            header h1 {
-                font-size: 2em;
-            }
 
-            .stats {
-                flex-direction: column;
-                gap: 20px;
-            }
+def _write_page(path: str, template, **context):
+    render_to_file(template, path, **context)
+    if precompress_enabled():
+        precompress(path)
 
-            .report-meta {
-                grid-template-columns: 1fr;
-            }
-        }
 
-        .badge {
-            display: inline-block;
-            padding: 4px 12px;
-            border-radius: 12px;
-            font-size: 0.85em;
-            font-weight: 500;
-            margin-top: 10px;
-        }
+def generate_index_html(reports, output_file="reports/index.html", page_size=PAGE_SIZE):
+    """
+    Generate index.html plus fixed-size archive pages listing all reports
 
-        .badge-new {
-            background: #4caf50;
-            color: white;
-        }
+    index.html shows the newest `page_size` reports and links to the archive.
+    Archive pages hold fixed chronological chunks (page 1 = oldest), so a new
+    report only lands on the last page; pages whose content and prev/next
+    links are unchanged are not rewritten.
 
-        .badge-info {
-            background: #2196f3;
-            color: white;
-        }
-    </style>
-</head>
-<body>
-    <div class="container">
-        <header>
-            <h1>🔥 微博热搜创意产品分析</h1>
-            <p class="subtitle">Weibo Trends Product Analysis - Historical Reports</p>
-            <div class="stats">
-                <div class="stat-item">
-                    <div class="stat-value">{{total_reports}}</div>
-                    <div class="stat-label">历史报告</div>
-                </div>
-                <div class="stat-item">
-                    <div class="stat-value">{{latest_date}}</div>
-                    <div class="stat-label">最新更新</div>
-                </div>
-                <div class="stat-item">
-                    <div class="stat-value">🤖</div>
-                    <div class="stat-label">AI 驱动</div>
-                </div>
-            </div>
-        </header>
-
-        <div class="content">
-            <div class="intro">
-                <h2>📊 关于本项目</h2>
-                <p>本项目基于 <strong>Claude Agent SDK</strong> 和 <strong>GitHub Actions</strong>，每天自动分析微博热搜话题，并通过 AI 生成创意小商品设计建议。</p>
-                <p>🎯 <strong>100分评分系统</strong>：从可发展度、有趣度、生活有用度、生产容易度四个维度评估产品潜力。</p>
-                <p>🚀 <strong>自动化流程</strong>：每天北京时间早上 9:00 自动运行，无需人工干预。</p>
-            </div>
-
-            <div class="reports-section">
-                <h2 class="section-title">📁 历史报告列表</h2>
-
-                {{#if reports}}
-                <div class="reports-grid">
-                    {{#each reports}}
-                    <div class="report-card">
-                        <div class="report-date">📅 {{date}}</div>
-                        {{#if is_latest}}
-                        <span class="badge badge-new">最新</span>
-                        {{/if}}
-
-                        <div class="report-meta">
-                            {{#if metadata.total_analyzed}}
-                            <div class="meta-item">
-                                <div class="meta-label">分析数量</div>
-                                <div class="meta-value">{{metadata.total_analyzed}}</div>
-                            </div>
-                            {{/if}}
-                            {{#if metadata.average_score}}
-                            <div class="meta-item">
-                                <div class="meta-label">平均分数</div>
-                                <div class="meta-value">{{metadata.average_score}}</div>
-                            </div>
-                            {{/if}}
-                            {{#if metadata.excellent_count}}
-                            <div class="meta-item">
-                                <div class="meta-label">🏆 优秀产品</div>
-                                <div class="meta-value">{{metadata.excellent_count}}</div>
-                            </div>
-                            {{/if}}
-                            <div class="meta-item">
-                                <div class="meta-label">文件大小</div>
-                                <div class="meta-value">{{file_size}} KB</div>
-                            </div>
-                        </div>
-
-                        <div class="report-actions">
-                            <a href="{{html_file}}" class="btn btn-primary" target="_blank">📊 查看报告</a>
-                            {{#if json_file}}
-                            <a href="{{json_file}}" class="btn btn-secondary" download>📥 下载数据</a>
-                            {{/if}}
-                        </div>
-                    </div>
-                    {{/each}}
-                </div>
-                {{else}}
-                <div class="empty-state">
-                    <div class="empty-state-icon">📭</div>
-                    <h3>暂无报告</h3>
-                    <p>首次运行后将会生成报告</p>
-                </div>
-                {{/if}}
-            </div>
-        </div>
-
-        <footer>
-            <p>🤖 Powered by <a href="https://www.anthropic.com/" target="_blank">Claude Agent SDK</a> & GitHub Actions</p>
-            <p>📊 数据来源：<a href="https://www.tianapi.com/" target="_blank">天行数据 - 微博热搜API</a></p>
-            <p>🔗 项目源码：<a href="https://github.com/yitongcodes/weibo_trends_analyzer_web" target="_blank">GitHub Repository</a></p>
-            <p style="margin-top: 15px; font-size: 0.9em;">生成时间：{{generated_time}}</p>
-        </footer>
-    </div>
-</body>
-</html>
-"""
+    Args:
+        reports: Report entries from get_report_files(), newest first
+        output_file: Path of the landing page
+        page_size: Reports per page
 
-    # Prepare template data
-    latest_date = reports[0]['date'] if reports else "N/A"
-
-    # Mark the first report as latest
-    if reports:
-        reports[0]['is_latest'] = True
-
-    # Simple template replacement (using Python string formatting)
-    # For production, you might want to use Jinja2
-    html = html_content.replace('{{total_reports}}', str(len(reports)))
-    html = html.replace('{{latest_date}}', latest_date)
-    html = html.replace('{{generated_time}}', datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC'))
-
-    # Build reports HTML
-    if reports:
-        reports_html = ""
-        for report in reports:
-            reports_html += f"""
-                    <div class="report-card">
-                        <div class="report-date">📅 {report['date']}</div>
-                        {'<span class="badge badge-new">最新</span>' if report.get('is_latest') else ''}
-
-                        <div class="report-meta">
-                            {'<div class="meta-item"><div class="meta-label">分析数量</div><div class="meta-value">' + str(report['metadata'].get('total_analyzed', 'N/A')) + '</div></div>' if report['metadata'].get('total_analyzed') else ''}
-                            {'<div class="meta-item"><div class="meta-label">平均分数</div><div class="meta-value">' + str(report['metadata'].get('average_score', 'N/A')) + '</div></div>' if report['metadata'].get('average_score') else ''}
-                            {'<div class="meta-item"><div class="meta-label">🏆 优秀产品</div><div class="meta-value">' + str(report['metadata'].get('excellent_count', 0)) + '</div></div>' if report['metadata'].get('excellent_count') is not None else ''}
-                            <div class="meta-item">
-                                <div class="meta-label">文件大小</div>
-                                <div class="meta-value">{report['file_size']} KB</div>
-                            </div>
-                        </div>
-
-                        <div class="report-actions">
-                            <a href="{report['html_file']}" class="btn btn-primary" target="_blank">📊 查看报告</a>
-                            {'<a href="' + report['json_file'] + '" class="btn btn-secondary" download>📥 下载数据</a>' if report['json_file'] else ''}
-                        </div>
-                    </div>
-"""
+    Returns:
+        Path of the landing page
+    """
+    output_dir = os.path.dirname(output_file) or "."
+    os.makedirs(output_dir, exist_ok=True)
 
-        # Replace template blocks
-        html = html.replace('{{#if reports}}', '')
-        html = html.replace('{{#each reports}}', '')
-        html = html.replace('{{#if is_latest}}', '')
-        html = html.replace('{{/if}}', '')
-        html = html.replace('{{#if metadata.total_analyzed}}', '')
-        html = html.replace('{{#if metadata.average_score}}', '')
-        html = html.replace('{{#if metadata.excellent_count}}', '')
-        html = html.replace('{{#if json_file}}', '')
-        html = html.replace('{{/each}}', '')
-        html = html.replace('{{else}}', '<!--')
-        html = html.replace('{{/if}}', '-->')
-
-        # Find and replace the reports grid section
-        import re
-        html = re.sub(r'<div class="reports-grid">.*?</div>\s*<!--',
-                     f'<div class="reports-grid">{reports_html}</div><!--',
-                     html, flags=re.DOTALL)
-    else:
-        # Show empty state
-        html = html.replace('{{#if reports}}', '<!--')
-        html = html.replace('{{#each reports}}', '')
-        html = html.replace('{{/each}}', '')
-        html = html.replace('{{else}}', '-->')
-        html = html.replace('{{/if}}', '')
-
-    # Write to file
-    os.makedirs(os.path.dirname(output_file), exist_ok=True)
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(html)
-
-    print(f"✅ Generated index.html with {len(reports)} report(s)")
+    template = get_template("index_template.html")
+    assets = page_assets(output_dir, css="index.css")
+    generated_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')
+
+    manifest = load_manifest(Path(output_dir))
+    old_signatures = manifest.get("pages", {})
+    new_signatures = {}
+
+    # Archive pages: fixed chunks in chronological order
+    chronological = list(reversed(reports))
+    chunks = [chronological[i:i + page_size] for i in range(0, len(chronological), page_size)]
+    archive_pages = []
+    rewritten = 0
+
+    for number, chunk in enumerate(chunks, 1):
+        name = archive_page_name(number)
+        prev_url = archive_page_name(number - 1) if number > 1 else None
+        next_url = archive_page_name(number + 1) if number < len(chunks) else None
+        page_reports = list(reversed(chunk))
+
+        archive_pages.append({
+            'url': name,
+            'first_date': chunk[0]['date'],
+            'last_date': chunk[-1]['date']
+        })
+
+        signature = _page_signature(page_reports, prev_url, next_url)
+        new_signatures[name] = signature
+        page_path = os.path.join(output_dir, name)
+        if old_signatures.get(name) == signature and os.path.exists(page_path):
+            continue
+
+        _write_page(
+            page_path,
+            template,
+            assets=assets,
+            is_archive=True,
+            page_number=number,
+            first_date=chunk[0]['date'],
+            last_date=chunk[-1]['date'],
+            reports=page_reports,
+            prev_url=prev_url,
+            next_url=next_url,
+            generated_time=generated_time
+        )
+        rewritten += 1
+
+    # Remove archive pages that no longer have any reports
+    for name in set(old_signatures) - set(new_signatures):
+        remove_with_siblings(os.path.join(output_dir, name))
+
+    if new_signatures != old_signatures:
+        manifest["pages"] = new_signatures
+        save_manifest(Path(output_dir), manifest)
+
+    # Landing page: newest reports, with the first one marked as latest
+    latest = [dict(report) for report in reports[:page_size]]
+    if latest:
+        latest[0]['is_latest'] = True
+
+    _write_page(
+        output_file,
+        template,
+        assets=assets,
+        is_archive=False,
+        reports=latest,
+        total_reports=len(reports),
+        latest_date=reports[0]['date'] if reports else "N/A",
+        archive_pages=list(reversed(archive_pages)) if len(reports) > page_size else [],
+        generated_time=generated_time
+    )
+
+    print(f"✅ Generated index.html with {len(reports)} report(s) "
+          f"({rewritten}/{len(chunks)} archive page(s) updated)")
     return output_file
 
 
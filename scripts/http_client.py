@@ -0,0 +1,155 @@
+"""
+Shared async HTTP layer for the API clients
+
+All outbound HTTP goes through one pooled aiohttp session per event loop, so
+connections are kept alive and reused instead of paying a TLS handshake on
+every call.
+"""
+import os
+import json
+import asyncio
+from typing import Any, Awaitable, Dict, Optional
+
+import aiohttp
+
+from scripts.telemetry import current_span
+
+
+class HTTPSessionPool:
+    """Lazily created, connection-pooled aiohttp session"""
+
+    def __init__(
+        self,
+        limit: int = 100,
+        limit_per_host: int = 10,
+        timeout: float = 10.0,
+        connect_timeout: float = 5.0
+    ):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.timeout = aiohttp.ClientTimeout(total=timeout, connect=connect_timeout)
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def get_session(self) -> aiohttp.ClientSession:
+        """
+        Return the shared session, creating it for the running event loop
+
+        Returns:
+            aiohttp client session bound to the current event loop
+        """
+        loop = asyncio.get_running_loop()
+
+        if self._session is None or self._session.closed or self._loop is not loop:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                ttl_dns_cache=300
+            )
+            self._session = aiohttp.ClientSession(connector=connector, timeout=self.timeout)
+            self._loop = loop
+
+        return self._session
+
+    async def get_json(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None
+    ) -> Any:
+        """
+        Perform a GET request and decode the JSON body
+
+        Args:
+            url: Request URL
+            params: Query parameters (None values are dropped)
+            timeout: Optional total timeout overriding the pool default
+
+        Returns:
+            Decoded JSON response
+
+        Raises:
+            aiohttp.ClientError: On connection errors or non-2xx responses
+            asyncio.TimeoutError: If the request times out
+        """
+        session = self.get_session()
+        params = {k: v for k, v in (params or {}).items() if v is not None}
+        # Without an override the pool's timeout applies; passing timeout=None would disable it
+        request_timeout = self.timeout
+        if timeout:
+            request_timeout = aiohttp.ClientTimeout(total=timeout, connect=self.timeout.connect)
+
+        async with session.get(url, params=params, timeout=request_timeout) as response:
+            response.raise_for_status()
+            body = await response.read()
+
+        # Response size is attributed to the stage making the request
+        span = current_span()
+        if span is not None:
+            span.add("bytes", len(body))
+        return json.loads(body)
+
+    async def close(self):
+        """Close the shared session if one is open"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._loop = None
+
+
+_pool: Optional[HTTPSessionPool] = None
+
+
+def get_http_pool() -> HTTPSessionPool:
+    """
+    Return the process-wide session pool, configured from environment variables
+
+    HTTP_TIMEOUT, HTTP_CONNECT_TIMEOUT, HTTP_POOL_LIMIT and HTTP_LIMIT_PER_HOST
+    override the defaults.
+    """
+    global _pool
+    if _pool is None:
+        _pool = HTTPSessionPool(
+            limit=int(os.getenv("HTTP_POOL_LIMIT", "100")),
+            limit_per_host=int(os.getenv("HTTP_LIMIT_PER_HOST", "10")),
+            timeout=float(os.getenv("HTTP_TIMEOUT", "10")),
+            connect_timeout=float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+        )
+    return _pool
+
+
+async def close_http_pool():
+    """Close the process-wide session pool"""
+    if _pool is not None:
+        await _pool.close()
+
+
+def run_sync(awaitable: Awaitable) -> Any:
+    """
+    Run an async client call from synchronous code
+
+    Args:
+        awaitable: Coroutine to run
+
+    Returns:
+        The coroutine's result
+
+    Raises:
+        RuntimeError: If called from inside a running event loop
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        pass
+    else:
+        if asyncio.iscoroutine(awaitable):
+            awaitable.close()
+        raise RuntimeError("Sync client API called inside an event loop; use the *_async method instead")
+
+    async def runner():
+        try:
+            return await awaitable
+        finally:
+            await close_http_pool()
+
+    return asyncio.run(runner())
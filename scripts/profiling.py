@@ -0,0 +1,187 @@
+"""
+Opt-in run profiling
+
+Wraps an analyzer run in cProfile, tracemalloc and an asyncio task factory
+that times every task from creation to completion. The results are written
+to PROFILE_DIR (default profiles/), outside the published reports since
+they contain local source paths, so a slow production run can be diagnosed
+from its own artifacts:
+
+- profile.pstats: raw cProfile data (for pstats, snakeviz, etc.)
+- hot_functions.txt: functions sorted by cumulative and by own time
+- allocations.txt: top allocation sites still held at the end of the run
+- tasks.json: wall-clock time of asyncio tasks, grouped by coroutine
+"""
+import os
+import io
+import json
+import time
+import asyncio
+import cProfile
+import pstats
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+
+DEFAULT_PROFILE_DIR = "profiles"
+
+# Rows per table in hot_functions.txt and allocations.txt
+TOP_N = 40
+
+# Frames kept per allocation traceback
+TRACEMALLOC_FRAMES = 10
+
+# Individual tasks listed in tasks.json (slowest first)
+SLOWEST_TASKS = 50
+
+
+def profiling_enabled(flag: bool = False) -> bool:
+    """True when profiling was requested by CLI flag or ANALYZER_PROFILE"""
+    return flag or os.getenv("ANALYZER_PROFILE", "").lower() in ("1", "true", "on", "yes")
+
+
+class TaskTimer:
+    """asyncio task factory that records each task's wall-clock lifetime"""
+
+    def __init__(self):
+        self.records: List[Dict] = []
+        self._previous_factory = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def install(self, loop: asyncio.AbstractEventLoop):
+        self._loop = loop
+        self._previous_factory = loop.get_task_factory()
+        loop.set_task_factory(self._create_task)
+
+    def uninstall(self):
+        if self._loop is not None:
+            self._loop.set_task_factory(self._previous_factory)
+            self._loop = None
+
+    def _create_task(self, loop, coro, **kwargs):
+        if self._previous_factory is not None:
+            task = self._previous_factory(loop, coro, **kwargs)
+        else:
+            task = asyncio.Task(coro, loop=loop, **kwargs)
+
+        name = getattr(coro, "__qualname__", type(coro).__name__)
+        created = time.perf_counter()
+
+        def done(t: asyncio.Task):
+            status = "cancelled" if t.cancelled() else ("error" if t.exception() else "ok")
+            self.records.append({
+                "coroutine": name,
+                "task": t.get_name(),
+                "wall_ms": round((time.perf_counter() - created) * 1000, 3),
+                "status": status
+            })
+
+        task.add_done_callback(done)
+        return task
+
+    def breakdown(self) -> Dict:
+        """Per-coroutine totals (largest total first) and the slowest individual tasks"""
+        groups: Dict[str, List[float]] = {}
+        for record in self.records:
+            groups.setdefault(record["coroutine"], []).append(record["wall_ms"])
+
+        by_coroutine = []
+        for name, values in groups.items():
+            ordered = sorted(values)
+            by_coroutine.append({
+                "coroutine": name,
+                "tasks": len(values),
+                "total_ms": round(sum(values), 3),
+                "mean_ms": round(sum(values) / len(values), 3),
+                "p95_ms": ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))],
+                "max_ms": ordered[-1]
+            })
+        by_coroutine.sort(key=lambda g: g["total_ms"], reverse=True)
+
+        slowest = sorted(self.records, key=lambda r: r["wall_ms"], reverse=True)[:SLOWEST_TASKS]
+        return {"tasks": len(self.records), "by_coroutine": by_coroutine, "slowest": slowest}
+
+
+def _hot_functions(profiler: cProfile.Profile) -> str:
+    out = io.StringIO()
+    for sort_key in ("cumulative", "tottime"):
+        out.write(f"===== Sorted by {sort_key} =====\n")
+        stats = pstats.Stats(profiler, stream=out)
+        stats.strip_dirs().sort_stats(sort_key).print_stats(TOP_N)
+    return out.getvalue()
+
+
+def _allocations(snapshot: tracemalloc.Snapshot, peak: int) -> str:
+    snapshot = snapshot.filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap*>")
+    ))
+    lines = [f"Peak traced memory: {peak / 1024 / 1024:.2f} MB", ""]
+
+    lines.append(f"===== Top {TOP_N} allocation sites (by line) =====")
+    for stat in snapshot.statistics("lineno")[:TOP_N]:
+        lines.append(str(stat))
+
+    lines.append("")
+    lines.append("===== Top 10 allocation tracebacks =====")
+    for stat in snapshot.statistics("traceback")[:10]:
+        lines.append(f"{stat.count} blocks, {stat.size / 1024:.1f} KiB")
+        lines.extend(f"    {line}" for line in stat.traceback.format())
+    return "\n".join(lines) + "\n"
+
+
+@contextmanager
+def profile_run(enabled: bool, directory: Optional[str] = None) -> Iterator[Optional[str]]:
+    """
+    Profile the enclosed block (must run inside an event loop)
+
+    The artifacts are written when the block exits, including when it exits
+    with an error or sys.exit, since failed runs are the ones worth diagnosing.
+
+    Args:
+        enabled: Profile the block; when False this does nothing
+        directory: Profiles directory (defaults to PROFILE_DIR or profiles/);
+            artifacts go to <directory>/<timestamp>/
+
+    Yields:
+        Output directory, or None when disabled
+    """
+    if not enabled:
+        yield None
+        return
+
+    directory = directory or os.getenv("PROFILE_DIR", DEFAULT_PROFILE_DIR)
+    output_dir = os.path.join(directory, datetime.now().strftime("%Y-%m-%d_%H%M%S"))
+    print(f"🔬 Profiling enabled, writing to {output_dir}/")
+
+    task_timer = TaskTimer()
+    task_timer.install(asyncio.get_running_loop())
+    tracemalloc_was_tracing = tracemalloc.is_tracing()
+    if not tracemalloc_was_tracing:
+        tracemalloc.start(TRACEMALLOC_FRAMES)
+    profiler = cProfile.Profile()
+    started = time.perf_counter()
+    profiler.enable()
+
+    try:
+        yield output_dir
+    finally:
+        profiler.disable()
+        wall = time.perf_counter() - started
+        snapshot = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+        if not tracemalloc_was_tracing:
+            tracemalloc.stop()
+        task_timer.uninstall()
+
+        os.makedirs(output_dir, exist_ok=True)
+        profiler.dump_stats(os.path.join(output_dir, "profile.pstats"))
+        with open(os.path.join(output_dir, "hot_functions.txt"), 'w', encoding='utf-8') as f:
+            f.write(_hot_functions(profiler))
+        with open(os.path.join(output_dir, "allocations.txt"), 'w', encoding='utf-8') as f:
+            f.write(_allocations(snapshot, peak))
+        with open(os.path.join(output_dir, "tasks.json"), 'w', encoding='utf-8') as f:
+            json.dump({"wall_seconds": round(wall, 3), **task_timer.breakdown()}, f, ensure_ascii=False, indent=2)
+
+        print(f"🔬 Profile saved: {output_dir}/ ({wall:.1f}s wall, peak {peak / 1024 / 1024:.1f} MB)")
@@ -0,0 +1,288 @@
+"""
+Rate limiting, retries and circuit breaking for outbound API calls
+
+Every external provider (tianapi, SerpAPI/Google, Claude) gets one shared
+ResilientProvider that throttles calls with a token bucket, retries transient
+errors with jittered exponential backoff, and stops calling a provider that
+keeps failing until it has had time to recover.
+"""
+import os
+import time
+import random
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import aiohttp
+
+from scripts.telemetry import current_span
+
+
+class TransientError(Exception):
+    """Error that is worth retrying (e.g. a provider-reported rate limit)"""
+
+
+class CircuitOpenError(Exception):
+    """Raised when a provider's circuit breaker is open and the call is skipped"""
+
+
+def is_transient_error(exc: BaseException) -> bool:
+    """
+    Decide whether an HTTP-layer error is worth retrying
+
+    Connection errors, timeouts, HTTP 429 and 5xx responses are transient;
+    other 4xx responses (bad key, bad request) are not.
+    """
+    if isinstance(exc, aiohttp.ClientResponseError):
+        return exc.status == 429 or exc.status >= 500
+    return isinstance(exc, (aiohttp.ClientError, asyncio.TimeoutError, TransientError))
+
+
+class TokenBucket:
+    """Async token bucket allowing `rate` calls per second with bursts up to `capacity`"""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self._lock: Optional[asyncio.Lock] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def acquire(self) -> float:
+        """
+        Take one token, waiting for it if necessary
+
+        Returns:
+            Seconds spent waiting
+        """
+        if self.rate <= 0:
+            return 0.0
+
+        # Locks are bound to an event loop; sync wrappers run one loop per call
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._loop is not loop:
+            self._lock = asyncio.Lock()
+            self._loop = loop
+
+        async with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+            self.updated_at = now
+
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+
+            wait = (1 - self.tokens) / self.rate
+            await asyncio.sleep(wait)
+            self.tokens = 0.0
+            self.updated_at = time.monotonic()
+            return wait
+
+
+class CircuitBreaker:
+    """Opens after consecutive failures, then lets one trial call through after a cool-down"""
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        """Return True if a call may go ahead"""
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        return False
+
+    def record_success(self):
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+
+    def record_failure(self) -> bool:
+        """
+        Record a failed call
+
+        Returns:
+            True if this failure opened (or re-opened) the circuit
+        """
+        self.consecutive_failures += 1
+        was_trial = self._trial_in_flight
+        self._trial_in_flight = False
+
+        if was_trial or (self.opened_at is None and self.consecutive_failures >= self.failure_threshold):
+            self.opened_at = time.monotonic()
+            return True
+        return False
+
+    def release_trial(self):
+        """End a call that says nothing about the provider's health (cancelled, or a non-transient error)"""
+        self._trial_in_flight = False
+
+
+class ResilientProvider:
+    """Rate limit + retry + circuit breaker wrapper for one external provider"""
+
+    def __init__(
+        self,
+        name: str,
+        rate: float,
+        burst: Optional[float] = None,
+        max_retries: int = 3,
+        base_delay: float = 0.5,
+        max_delay: float = 10.0,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        is_transient: Callable[[BaseException], bool] = is_transient_error
+    ):
+        """
+        Args:
+            name: Provider name used in logs and the run summary
+            rate: Allowed calls per second (0 disables throttling)
+            burst: Token bucket capacity (defaults to max(1, rate))
+            max_retries: Retries after the first attempt for transient errors
+            base_delay: Initial backoff delay in seconds
+            max_delay: Upper bound for a single backoff delay
+            failure_threshold: Consecutive failures that open the circuit
+            reset_timeout: Seconds the circuit stays open before a trial call
+            is_transient: Predicate deciding which errors are retried and count
+                toward opening the circuit
+        """
+        self.name = name
+        self.bucket = TokenBucket(rate, burst)
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.is_transient = is_transient
+
+        self.calls = 0
+        self.successes = 0
+        self.failures = 0
+        self.retries = 0
+        self.short_circuited = 0
+        self.circuit_opens = 0
+        self.throttled_seconds = 0.0
+
+    async def call(self, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run `fn` under this provider's rate limit, retry policy and circuit breaker
+
+        Args:
+            fn: Zero-argument coroutine function performing one attempt
+
+        Returns:
+            The result of the first successful attempt
+
+        Raises:
+            CircuitOpenError: If the circuit is open
+            Exception: The last error once retries are exhausted or it is not transient
+        """
+        self.calls += 1
+        attempt = 0
+
+        while True:
+            if not self.breaker.allow():
+                self.short_circuited += 1
+                raise CircuitOpenError(f"{self.name} circuit open after repeated failures")
+
+            try:
+                self.throttled_seconds += await self.bucket.acquire()
+                result = await fn()
+            except Exception as e:
+                transient = self.is_transient(e)
+                if not transient:
+                    # A bad request or unusable answer doesn't mean the provider is down
+                    self.breaker.release_trial()
+                elif self.breaker.record_failure():
+                    self.circuit_opens += 1
+                    print(f"⚠️  {self.name}: circuit opened after {self.breaker.consecutive_failures} failures")
+
+                if attempt >= self.max_retries or not transient:
+                    self.failures += 1
+                    raise
+
+                attempt += 1
+                self.retries += 1
+                span = current_span()
+                if span is not None:
+                    span.add("retries")
+                await asyncio.sleep(self._backoff(attempt))
+                continue
+            except BaseException:
+                # Cancelled mid-call: free a half-open trial slot so later calls can probe again
+                self.breaker.release_trial()
+                raise
+
+            self.breaker.record_success()
+            self.successes += 1
+            return result
+
+    def stats(self) -> Dict[str, Any]:
+        """Return this provider's counters"""
+        return {
+            "provider": self.name,
+            "calls": self.calls,
+            "successes": self.successes,
+            "failures": self.failures,
+            "retries": self.retries,
+            "short_circuited": self.short_circuited,
+            "circuit_opens": self.circuit_opens,
+            "throttled_seconds": round(self.throttled_seconds, 2)
+        }
+
+    def _backoff(self, attempt: int) -> float:
+        # Full jitter: uniform in [0, min(max_delay, base * 2^attempt)]
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+
+# Default calls per second for each provider; override with <NAME>_RATE_LIMIT
+DEFAULT_RATE_LIMITS = {
+    "tianapi": 2.0,
+    "serpapi": 5.0,
+    "google": 10.0,
+    "claude": 2.0
+}
+
+_providers: Dict[str, ResilientProvider] = {}
+
+
+def get_provider(name: str, **kwargs) -> ResilientProvider:
+    """
+    Return the shared ResilientProvider for `name`, creating it on first use
+
+    <NAME>_RATE_LIMIT and <NAME>_MAX_RETRIES (e.g. SERPAPI_RATE_LIMIT) override
+    the defaults, as does API_MAX_RETRIES for all providers.
+
+    Args:
+        name: Provider name
+        **kwargs: Extra ResilientProvider arguments used on creation
+
+    Returns:
+        Shared provider instance
+    """
+    if name not in _providers:
+        prefix = name.upper()
+        rate = float(os.getenv(f"{prefix}_RATE_LIMIT", DEFAULT_RATE_LIMITS.get(name, 5.0)))
+        max_retries = int(os.getenv(f"{prefix}_MAX_RETRIES", os.getenv("API_MAX_RETRIES", "3")))
+        _providers[name] = ResilientProvider(name, rate=rate, max_retries=max_retries, **kwargs)
+    return _providers[name]
+
+
+def resilience_stats() -> List[Dict[str, Any]]:
+    """Return counters for every provider used in this process"""
+    return [provider.stats() for provider in _providers.values()]
@@ -0,0 +1,214 @@
+// Search functionality, backed by the precomputed bigram index
+const searchInput = document.getElementById('searchInput');
+const filterButtons = document.querySelectorAll('.filter-btn');
+const productCards = Array.from(document.querySelectorAll('.product-card'));
+const noResults = document.getElementById('noResults');
+const searchIndex = JSON.parse(document.getElementById('searchIndex').textContent);
+
+let currentTier = 'all';
+let currentSearch = '';
+let pendingFrame = null;
+
+// Same gram split as build_search_index: whitespace-separated runs,
+// bigrams within a run, runs of one character kept as unigrams
+function queryGrams(query) {
+    const grams = [];
+    query.split(/\s+/).filter(Boolean).forEach(run => {
+        if (run.length <= 2) {
+            grams.push(run);
+        } else {
+            for (let i = 0; i < run.length - 1; i++) {
+                grams.push(run.slice(i, i + 2));
+            }
+        }
+    });
+    return grams;
+}
+
+// Returns the set of matching product indices, or null for "match all"
+function searchProducts(query) {
+    const q = query.trim().toLowerCase();
+    if (!q) return null;
+
+    const postings = [];
+    for (const gram of queryGrams(q)) {
+        const list = searchIndex.grams[gram];
+        if (!list) return new Set();
+        postings.push(list);
+    }
+    postings.sort((a, b) => a.length - b.length);
+
+    // Intersect starting from the shortest posting list, then confirm with a substring test
+    let candidates = postings[0];
+    for (let i = 1; i < postings.length && candidates.length; i++) {
+        const other = new Set(postings[i]);
+        candidates = candidates.filter(idx => other.has(idx));
+    }
+    return new Set(candidates.filter(idx => searchIndex.texts[idx].includes(q)));
+}
+
+// Cards past the first few of each tier are pre-rendered into a JSON shard
+// next to the page. The shard is fetched once those cards are first needed,
+// and they are laid out in chunks that only hold cards while near the
+// viewport; chunks further away are empty placeholders of the same height.
+const content = document.querySelector('.content');
+const lazySections = Array.from(document.querySelectorAll('.lazy-cards'));
+const CHUNK_SIZE = 12;
+const GRID_GAP = 30;
+const MIN_CARD_WIDTH = 450;
+
+let cardHeight = 600;  // estimate until a chunk has been measured
+let shard = null;
+let shardRequest = null;
+let shardFailed = false;
+const chunkIndices = new WeakMap();
+const sectionKeys = new WeakMap();
+
+function loadShard() {
+    if (!shardRequest) {
+        shardRequest = fetch(content.dataset.cardShard)
+            .then(response => {
+                if (!response.ok) throw new Error(`HTTP ${response.status}`);
+                return response.json();
+            })
+            .then(data => {
+                shard = data;
+                document.querySelectorAll('.lazy-chunk[data-near]').forEach(renderChunk);
+            })
+            .catch(() => {
+                // Typically a report opened from disk, where fetch() is not allowed
+                shardFailed = true;
+                lazySections.forEach(section => layoutLazySection(section, []));
+                filterProducts();
+            });
+    }
+    return shardRequest;
+}
+
+function estimateHeight(cards, width) {
+    const columns = Math.max(1, Math.floor((width + GRID_GAP) / (MIN_CARD_WIDTH + GRID_GAP)));
+    const rows = Math.ceil(cards / columns);
+    return rows * cardHeight + (rows - 1) * GRID_GAP;
+}
+
+function renderChunk(chunk) {
+    if (chunk.dataset.rendered) return;
+    const section = chunk.parentElement;
+    const cards = shard[section.dataset.tier];
+    const start = Number(section.dataset.start);
+    chunk.innerHTML = chunkIndices.get(chunk).map(idx => cards[idx - start]).join('');
+    chunk.style.height = '';
+    chunk.dataset.rendered = '1';
+
+    // Refine the estimate used for placeholders from a real row
+    const first = chunk.firstElementChild;
+    if (first) cardHeight = first.offsetHeight || cardHeight;
+}
+
+function unrenderChunk(chunk) {
+    if (!chunk.dataset.rendered) return;
+    chunk.style.height = `${chunk.offsetHeight}px`;
+    chunk.textContent = '';
+    delete chunk.dataset.rendered;
+}
+
+const chunkObserver = new IntersectionObserver(entries => {
+    entries.forEach(entry => {
+        const chunk = entry.target;
+        if (entry.isIntersecting) {
+            chunk.dataset.near = '1';
+            if (shard) renderChunk(chunk); else loadShard();
+        } else {
+            delete chunk.dataset.near;
+            unrenderChunk(chunk);
+        }
+    });
+}, { rootMargin: '1500px 0px' });
+
+// Indices of a lazy section's cards that pass the current tier filter and search
+function lazyIndices(section, matches) {
+    if (shardFailed) return [];
+    if (currentTier !== 'all' && section.dataset.tier !== currentTier) return [];
+    const start = Number(section.dataset.start);
+    const end = start + Number(section.dataset.count);
+    const indices = [];
+    for (let idx = start; idx < end; idx++) {
+        if (matches === null || matches.has(idx)) indices.push(idx);
+    }
+    return indices;
+}
+
+function layoutLazySection(section, indices) {
+    const key = shardFailed ? 'failed' : indices.join(',');
+    if (sectionKeys.get(section) === key) return;
+    sectionKeys.set(section, key);
+
+    section.querySelectorAll('.lazy-chunk').forEach(chunk => chunkObserver.unobserve(chunk));
+    section.textContent = '';
+
+    if (shardFailed) {
+        const status = document.createElement('p');
+        status.className = 'lazy-status';
+        status.textContent = `⚠️ 其余 ${section.dataset.count} 个产品加载失败：请通过网页服务器打开此报告`;
+        section.appendChild(status);
+        return;
+    }
+
+    const width = section.clientWidth;
+    for (let i = 0; i < indices.length; i += CHUNK_SIZE) {
+        const chunk = document.createElement('div');
+        const slice = indices.slice(i, i + CHUNK_SIZE);
+        chunk.className = 'products-grid lazy-chunk';
+        chunk.style.height = `${estimateHeight(slice.length, width)}px`;
+        chunkIndices.set(chunk, slice);
+        section.appendChild(chunk);
+        chunkObserver.observe(chunk);
+    }
+}
+
+function filterProducts() {
+    const matches = searchProducts(currentSearch);
+
+    // Compute visibility first, then apply all class changes in one frame
+    const updates = [];
+    let visibleCount = 0;
+    productCards.forEach(card => {
+        const tierMatch = currentTier === 'all' || card.dataset.tier === currentTier;
+        const searchMatch = matches === null || matches.has(Number(card.dataset.idx));
+        const visible = tierMatch && searchMatch;
+
+        if (visible) visibleCount++;
+        if (card.classList.contains('hidden') === visible) updates.push([card, visible]);
+    });
+
+    const lazyUpdates = lazySections.map(section => [section, lazyIndices(section, matches)]);
+    lazyUpdates.forEach(([, indices]) => { visibleCount += indices.length; });
+
+    if (pendingFrame !== null) cancelAnimationFrame(pendingFrame);
+    pendingFrame = requestAnimationFrame(() => {
+        pendingFrame = null;
+        updates.forEach(([card, visible]) => card.classList.toggle('hidden', !visible));
+        lazyUpdates.forEach(([section, indices]) => layoutLazySection(section, indices));
+        noResults.classList.toggle('hidden', visibleCount !== 0);
+    });
+}
+
+let searchTimer = null;
+searchInput.addEventListener('input', (e) => {
+    clearTimeout(searchTimer);
+    searchTimer = setTimeout(() => {
+        currentSearch = e.target.value;
+        filterProducts();
+    }, 120);
+});
+
+filterButtons.forEach(button => {
+    button.addEventListener('click', () => {
+        filterButtons.forEach(btn => btn.classList.remove('active'));
+        button.classList.add('active');
+        currentTier = button.dataset.tier;
+        filterProducts();
+    });
+});
+
+lazySections.forEach(section => layoutLazySection(section, lazyIndices(section, null)));
@@ -0,0 +1,275 @@
+"""
+Per-stage timing spans and metrics export
+
+Pipeline stages (fetch, search, LLM calls, parsing, organizing, rendering,
+saving) run inside spans that record their duration plus attributes such as
+byte counts, retries and fallback reasons. Finished spans are written as a
+JSON-lines trace, and running totals per stage are exported in Prometheus
+textfile format for node_exporter's textfile collector.
+"""
+import os
+import re
+import json
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional
+
+# Durations kept per stage for the exported quantiles
+QUANTILE_WINDOW = 2000
+
+# Trace files kept in the telemetry directory (oldest are deleted)
+MAX_TRACE_FILES = 30
+
+METRIC_PREFIX = "weibo_analyzer"
+
+# Query strings carry API keys; they are stripped from error messages in traces
+_QUERY_STRING_PATTERN = re.compile(r"\?[^\s'\"]*")
+
+_current_span: ContextVar[Optional["Span"]] = ContextVar("current_span", default=None)
+
+
+class Span:
+    """One timed operation"""
+
+    def __init__(self, name: str, run_id: str, parent: Optional["Span"], attrs: Dict[str, Any]):
+        self.name = name
+        self.run_id = run_id
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent.span_id if parent is not None else None
+        self.attrs = attrs
+        self.started_at = time.time()
+        self.duration_ms = 0.0
+        self.status = "ok"
+
+    def set(self, **attrs):
+        """Set span attributes"""
+        self.attrs.update(attrs)
+
+    def add(self, key: str, amount: float = 1):
+        """Increase a numeric attribute (e.g. bytes or retries)"""
+        self.attrs[key] = self.attrs.get(key, 0) + amount
+
+    def fail(self, error: BaseException):
+        """Mark the span as failed without raising (for errors handled by a fallback)"""
+        self.status = "error"
+        message = _QUERY_STRING_PATTERN.sub("", str(error)) or type(error).__name__
+        self.attrs.setdefault("error", message)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "run_id": self.run_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start": round(self.started_at, 6),
+            "duration_ms": round(self.duration_ms, 3),
+            "status": self.status,
+            **self.attrs
+        }
+
+
+class StageStats:
+    """Running totals for one span name"""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.bytes = 0
+        self.errors = 0
+        self.retries = 0
+        self.recent = deque(maxlen=QUANTILE_WINDOW)
+
+    def record(self, span: Span):
+        seconds = span.duration_ms / 1000
+        self.count += 1
+        self.seconds += seconds
+        self.bytes += int(span.attrs.get("bytes", 0))
+        self.retries += int(span.attrs.get("retries", 0))
+        self.errors += span.status == "error"
+        self.recent.append(seconds)
+
+    def quantile(self, q: float) -> float:
+        if not self.recent:
+            return 0.0
+        ordered = sorted(self.recent)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class Tracer:
+    """Collects spans for a run and keeps cumulative per-stage statistics"""
+
+    def __init__(self):
+        self.run_id = uuid.uuid4().hex[:12]
+        self.started_at = time.time()
+        self.spans: List[Span] = []
+        self.stages: Dict[str, StageStats] = {}
+        self.fallbacks: Dict[str, int] = {}
+
+    @contextmanager
+    def span(self, name: str, **attrs) -> Iterator[Span]:
+        """
+        Time a block of (sync or async) code as a span
+
+        Spans opened inside the block, including in tasks it starts, become
+        its children. An exception marks the span as an error and is re-raised.
+
+        Args:
+            name: Stage name (e.g. "search")
+            **attrs: Initial span attributes
+        """
+        span = Span(name, self.run_id, _current_span.get(), attrs)
+        token = _current_span.set(span)
+        start = time.perf_counter()
+        try:
+            yield span
+        except BaseException as e:
+            span.fail(e)
+            raise
+        finally:
+            span.duration_ms = (time.perf_counter() - start) * 1000
+            _current_span.reset(token)
+            self._finish(span)
+
+    def fallback(self, reason: str, **attrs):
+        """Record that a stage fell back to default output, and why"""
+        self.fallbacks[reason] = self.fallbacks.get(reason, 0) + 1
+        with self.span("fallback", reason=reason, **attrs):
+            pass
+
+    def flush_trace(self, path: str) -> int:
+        """
+        Append finished spans to a JSON-lines trace file and forget them
+
+        Args:
+            path: Trace file path
+
+        Returns:
+            Number of spans written
+        """
+        spans, self.spans = self.spans, []
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with open(path, 'a', encoding='utf-8') as f:
+            for span in spans:
+                f.write(json.dumps(span.to_dict(), ensure_ascii=False) + "\n")
+        return len(spans)
+
+    def write_prometheus(self, path: str):
+        """
+        Write cumulative statistics in Prometheus textfile format (atomically)
+
+        Args:
+            path: Output .prom file
+        """
+        p = METRIC_PREFIX
+        lines = [
+            f"# HELP {p}_stage_duration_seconds Time spent per pipeline stage",
+            f"# TYPE {p}_stage_duration_seconds summary"
+        ]
+        for name, stats in sorted(self.stages.items()):
+            for q in (0.5, 0.95):
+                lines.append(f'{p}_stage_duration_seconds{{stage="{name}",quantile="{q}"}} {stats.quantile(q):.6f}')
+            lines.append(f'{p}_stage_duration_seconds_sum{{stage="{name}"}} {stats.seconds:.6f}')
+            lines.append(f'{p}_stage_duration_seconds_count{{stage="{name}"}} {stats.count}')
+
+        for metric, attr, help_text in (
+            ("stage_bytes_total", "bytes", "Bytes received or written per stage"),
+            ("stage_errors_total", "errors", "Spans that ended with an error per stage"),
+            ("stage_retries_total", "retries", "Retried attempts per stage")
+        ):
+            lines.append(f"# HELP {p}_{metric} {help_text}")
+            lines.append(f"# TYPE {p}_{metric} counter")
+            for name, stats in sorted(self.stages.items()):
+                lines.append(f'{p}_{metric}{{stage="{name}"}} {getattr(stats, attr)}')
+
+        lines.append(f"# HELP {p}_fallbacks_total Concepts that fell back to default output, by reason")
+        lines.append(f"# TYPE {p}_fallbacks_total counter")
+        for reason, count in sorted(self.fallbacks.items()):
+            lines.append(f'{p}_fallbacks_total{{reason="{reason}"}} {count}')
+
+        lines.append(f"# HELP {p}_last_export_timestamp_seconds Time of the last metrics export")
+        lines.append(f"# TYPE {p}_last_export_timestamp_seconds gauge")
+        lines.append(f"{p}_last_export_timestamp_seconds {time.time():.0f}")
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(tmp_path, path)
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """Per-stage totals, slowest stage first"""
+        return sorted(
+            (
+                {"stage": name, "count": s.count, "seconds": round(s.seconds, 2),
+                 "p95_ms": round(s.quantile(0.95) * 1000, 1), "errors": s.errors, "retries": s.retries}
+                for name, s in self.stages.items()
+            ),
+            key=lambda s: s["seconds"],
+            reverse=True
+        )
+
+    def _finish(self, span: Span):
+        self.spans.append(span)
+        self.stages.setdefault(span.name, StageStats()).record(span)
+
+
+_tracer = Tracer()
+
+
+def get_tracer() -> Tracer:
+    """Return the process-wide tracer"""
+    return _tracer
+
+
+def span(name: str, **attrs):
+    """Shortcut for get_tracer().span(...)"""
+    return _tracer.span(name, **attrs)
+
+
+def current_span() -> Optional[Span]:
+    """Return the innermost open span in this context, if any"""
+    return _current_span.get()
+
+
+def export_telemetry(directory: Optional[str] = None) -> Optional[Dict[str, str]]:
+    """
+    Flush the trace and rewrite the Prometheus summary
+
+    TELEMETRY=off disables the export; TELEMETRY_DIR sets the output
+    directory (default .cache/telemetry). Only the newest MAX_TRACE_FILES
+    traces are kept.
+
+    Args:
+        directory: Output directory overriding TELEMETRY_DIR
+
+    Returns:
+        {"trace": path, "metrics": path}, or None when disabled
+    """
+    if os.getenv("TELEMETRY", "on").lower() == "off":
+        return None
+
+    directory = directory or os.getenv("TELEMETRY_DIR", ".cache/telemetry")
+    tracer = get_tracer()
+    trace_path = os.path.join(directory, f"trace-{tracer.run_id}.jsonl")
+    metrics_path = os.path.join(directory, f"{METRIC_PREFIX}.prom")
+
+    tracer.flush_trace(trace_path)
+    tracer.write_prometheus(metrics_path)
+
+    traces = sorted(
+        (entry for entry in os.scandir(directory) if entry.name.startswith("trace-") and entry.name.endswith(".jsonl")),
+        key=lambda entry: entry.stat().st_mtime,
+        reverse=True
+    )
+    for entry in traces[MAX_TRACE_FILES:]:
+        os.remove(entry.path)
+
+    return {"trace": trace_path, "metrics": metrics_path}
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Shared Jinja environment for report rendering
+
+Templates are parsed once per process and their compiled bytecode is cached
+on disk, so later runs skip template parsing entirely. Pages are streamed to disk
+with render_to_file(). Templates can also be precompiled to Python modules
+at build time:
+
+    python scripts/templating.py --precompile
+"""
+import os
+import sys
+import argparse
+from typing import Optional
+
+from jinja2 import (
+    ChoiceLoader,
+    Environment,
+    FileSystemBytecodeCache,
+    FileSystemLoader,
+    ModuleLoader,
+    Template
+)
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates")
+
+# Write buffer for streamed pages; template chunks are small, so they are batched into writes this size
+RENDER_BUFFER_BYTES = 256 * 1024
+
+_env: Optional[Environment] = None
+
+
+def _bytecode_cache_dir() -> str:
+    return os.getenv("JINJA_CACHE_DIR", ".cache/jinja")
+
+
+def _precompiled_dir() -> str:
+    return os.getenv("JINJA_PRECOMPILED_DIR", ".cache/jinja-compiled")
+
+
+def _newest_mtime(directory: str) -> float:
+    newest = 0.0
+    for root, _, files in os.walk(directory):
+        for name in files:
+            newest = max(newest, os.path.getmtime(os.path.join(root, name)))
+    return newest
+
+
+def _precompiled_is_fresh(precompiled_dir: str) -> bool:
+    """Precompiled modules are only used if they are newer than every template source"""
+    if not os.path.isdir(precompiled_dir) or not os.listdir(precompiled_dir):
+        return False
+    return _newest_mtime(precompiled_dir) >= _newest_mtime(TEMPLATE_DIR)
+
+
+def create_template_env(use_precompiled: bool = True, bytecode_cache: bool = True) -> Environment:
+    """
+    Create a Jinja environment for the report templates
+
+    Args:
+        use_precompiled: Serve templates from precompiled modules when they are up to date
+        bytecode_cache: Cache compiled template bytecode on disk
+
+    Returns:
+        Configured Jinja environment
+    """
+    loader = FileSystemLoader(TEMPLATE_DIR)
+    precompiled_dir = _precompiled_dir()
+    if use_precompiled and _precompiled_is_fresh(precompiled_dir):
+        loader = ChoiceLoader([ModuleLoader(precompiled_dir), loader])
+
+    cache = None
+    if bytecode_cache:
+        cache_dir = _bytecode_cache_dir()
+        os.makedirs(cache_dir, exist_ok=True)
+        cache = FileSystemBytecodeCache(directory=cache_dir)
+
+    return Environment(loader=loader, bytecode_cache=cache, auto_reload=False)
+
+
+def get_template_env() -> Environment:
+    """Return the process-wide template environment, creating it on first use"""
+    global _env
+    if _env is None:
+        _env = create_template_env()
+    return _env
+
+
+def get_template(name: str) -> Template:
+    """
+    Load a report template from the shared environment
+
+    Args:
+        name: Template filename in scripts/templates
+
+    Returns:
+        Compiled template (cached after the first call)
+    """
+    return get_template_env().get_template(name)
+
+
+def render_to_file(template: Template, path: str, **context) -> int:
+    """
+    Stream a rendered template to a file
+
+    The template's generate() chunks go through a buffered file handle, so
+    the page is never held in memory as one string. Output goes to a
+    temporary file that is renamed over `path` only after rendering
+    succeeds, so readers never see a half-written page.
+
+    Args:
+        template: Compiled template
+        path: Output file
+        **context: Template variables
+
+    Returns:
+        Size of the written file in bytes
+    """
+    tmp_path = f"{path}.tmp"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8', buffering=RENDER_BUFFER_BYTES) as f:
+            for chunk in template.generate(**context):
+                f.write(chunk)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return os.path.getsize(path)
+
+
+def precompile_templates(target_dir: Optional[str] = None) -> str:
+    """
+    Compile every template in scripts/templates to Python modules
+
+    Args:
+        target_dir: Output directory (defaults to JINJA_PRECOMPILED_DIR)
+
+    Returns:
+        Path to the compiled templates directory
+    """
+    target_dir = target_dir or _precompiled_dir()
+    os.makedirs(target_dir, exist_ok=True)
+
+    env = create_template_env(use_precompiled=False, bytecode_cache=False)
+    env.compile_templates(target_dir, zip=None, ignore_errors=False)
+    return target_dir
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report template utilities")
+    parser.add_argument("--precompile", action="store_true", help="precompile templates to Python modules")
+    parser.add_argument("--target", help="output directory for --precompile")
+    args = parser.parse_args()
+
+    if args.precompile:
+        target = precompile_templates(args.target)
+        print(f"✅ Templates precompiled to: {target}")
+    else:
+        parser.print_help()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Near-duplicate topic collapsing
+
+The board often carries several wordings of the same event. Keywords are
+compared by MinHash estimates of their character-bigram Jaccard similarity,
+and each group of near-duplicates is researched and analyzed once, through
+its highest-ranked member.
+"""
+import re
+import zlib
+import random
+from typing import Dict, List, Optional
+
+from scripts.utils import char_ngrams
+
+# Topic field listing the other members of a collapsed cluster
+CLUSTER_FIELD = "related_topics"
+
+# Mersenne prime used for the universal hash family
+_PRIME = (1 << 61) - 1
+
+# Punctuation and hashtag marks that vary between wordings of the same topic
+_NOISE_PATTERN = re.compile(r"[\W_]+")
+
+
+class MinHasher:
+    """MinHash signatures over character n-grams"""
+
+    def __init__(self, num_perm: int = 64, ngram: int = 2, seed: int = 1):
+        """
+        Args:
+            num_perm: Number of hash functions (signature length)
+            ngram: Character n-gram length
+            seed: Seed for the hash function coefficients
+        """
+        rng = random.Random(seed)
+        self.ngram = ngram
+        self.coefficients = [
+            (rng.randrange(1, _PRIME), rng.randrange(0, _PRIME)) for _ in range(num_perm)
+        ]
+
+    def shingles(self, text: str) -> set:
+        """Character n-grams of `text` with punctuation and hashtag marks removed"""
+        normalized = _NOISE_PATTERN.sub(" ", text.lower())
+        return set(char_ngrams(normalized, self.ngram))
+
+    def signature(self, text: str) -> List[int]:
+        """
+        Compute the MinHash signature of a text
+
+        Args:
+            text: Input text
+
+        Returns:
+            One minimum hash value per hash function (empty text gives an empty list)
+        """
+        hashes = [zlib.crc32(gram.encode("utf-8")) for gram in self.shingles(text)]
+        if not hashes:
+            return []
+        return [min((a * h + b) % _PRIME for h in hashes) for a, b in self.coefficients]
+
+    @staticmethod
+    def similarity(sig_a: List[int], sig_b: List[int]) -> float:
+        """Estimated Jaccard similarity of two signatures"""
+        if not sig_a or not sig_b:
+            return 0.0
+        return sum(1 for a, b in zip(sig_a, sig_b) if a == b) / len(sig_a)
+
+
+def cluster_topics(
+    topics: List[Dict],
+    threshold: float,
+    hasher: Optional[MinHasher] = None
+) -> List[List[Dict]]:
+    """
+    Group topics whose keywords are near-duplicates
+
+    Topics are taken in priority order: each joins the first cluster whose
+    representative (first member) it matches at or above `threshold`
+    estimated Jaccard similarity, or starts a new cluster. Matching is not
+    transitive, so a chain of near-matches can't pull unrelated topics
+    into one cluster.
+
+    Args:
+        topics: Trending topic dictionaries in priority order
+        threshold: Minimum similarity in (0, 1]; 0 or less disables collapsing
+        hasher: MinHasher to use (a default one is created if omitted)
+
+    Returns:
+        List of clusters, each a list of topics
+    """
+    if threshold <= 0 or len(topics) < 2:
+        return [[topic] for topic in topics]
+
+    hasher = hasher or MinHasher()
+    clusters: List[List[Dict]] = []
+    representative_signatures: List[List[int]] = []
+
+    for topic in topics:
+        signature = hasher.signature(topic["keyword"])
+        for cluster, representative in zip(clusters, representative_signatures):
+            if MinHasher.similarity(signature, representative) >= threshold:
+                cluster.append(topic)
+                break
+        else:
+            clusters.append([topic])
+            representative_signatures.append(signature)
+
+    return clusters
+
+
+def collapse_duplicates(topics: List[Dict], threshold: float) -> List[Dict]:
+    """
+    Keep one topic per near-duplicate cluster
+
+    The representative (first member in priority order) gets a `related_topics` list
+    with the keyword, rank and heat of every other member.
+
+    Args:
+        topics: Trending topic dictionaries in priority order
+        threshold: Minimum similarity; 0 or less disables collapsing
+
+    Returns:
+        Representative topics, in input order
+    """
+    representatives = []
+    for cluster in cluster_topics(topics, threshold):
+        representative = cluster[0]
+        if len(cluster) > 1:
+            representative = dict(representative)
+            representative[CLUSTER_FIELD] = [
+                {"keyword": t["keyword"], "rank": t["rank"], "heat_value": t["heat_value"]}
+                for t in cluster[1:]
+            ]
+        representatives.append(representative)
+    return representatives
@@ -0,0 +1,176 @@
+"""
+Trend trajectory engine
+
+Keeps heat_value snapshots for every keyword on the board across runs and
+estimates each topic's velocity and acceleration, so the expensive research
+and LLM stages can go to topics that are still rising instead of simply the
+top of today's board.
+"""
+import os
+import time
+import sqlite3
+from typing import Dict, List, Optional, Tuple
+
+from scripts.analytics_store import DEFAULT_DB_PATH
+
+# Topic fields added by momentum selection and carried through to each concept
+MOMENTUM_FIELDS = ("velocity", "acceleration", "predicted_heat")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS heat_snapshots (
+    keyword TEXT NOT NULL,
+    observed_at REAL NOT NULL,
+    heat_value INTEGER NOT NULL,
+    rank INTEGER,
+    PRIMARY KEY (keyword, observed_at)
+);
+
+CREATE INDEX IF NOT EXISTS idx_heat_snapshots_observed_at ON heat_snapshots(observed_at);
+"""
+
+
+class TrajectoryEngine:
+    """Heat snapshot history plus momentum-based topic selection"""
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        horizon_hours: float = 24.0,
+        min_interval_hours: float = 0.5,
+        lookback_hours: float = 72.0,
+        retention_days: float = 30.0
+    ):
+        """
+        Args:
+            path: SQLite database file (shared with the analytics store by default)
+            horizon_hours: How far ahead heat is projected when ranking topics
+            min_interval_hours: Minimum spacing between snapshots used for a derivative
+            lookback_hours: Oldest snapshot considered when estimating momentum
+            retention_days: Snapshots older than this are pruned
+        """
+        self.path = path or os.getenv("ANALYTICS_DB_PATH", DEFAULT_DB_PATH)
+        self.horizon_hours = horizon_hours
+        self.min_interval_hours = min_interval_hours
+        self.lookback_hours = lookback_hours
+        self.retention_days = retention_days
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(self.path)
+        self._conn.executescript(SCHEMA)
+
+    def record(self, topics: List[Dict], observed_at: Optional[float] = None):
+        """
+        Store a heat snapshot of the board
+
+        Args:
+            topics: Trending topic dictionaries (the whole fetched board)
+            observed_at: Unix timestamp of the fetch (defaults to now)
+        """
+        observed_at = observed_at or time.time()
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO heat_snapshots (keyword, observed_at, heat_value, rank) "
+                "VALUES (?, ?, ?, ?)",
+                [(t["keyword"], observed_at, t["heat_value"], t["rank"]) for t in topics]
+            )
+            self._conn.execute(
+                "DELETE FROM heat_snapshots WHERE observed_at < ?",
+                (observed_at - self.retention_days * 86400,)
+            )
+
+    def momentum(self, topic: Dict, now: Optional[float] = None) -> Dict[str, float]:
+        """
+        Estimate a topic's heat velocity and acceleration from its history
+
+        The current heat is the newest point; earlier points are the most
+        recent snapshots at least `min_interval_hours` apart. Topics with no
+        usable history get zero velocity and acceleration.
+
+        Args:
+            topic: Trending topic dictionary with its current heat_value
+            now: Timestamp of the current heat value (defaults to now)
+
+        Returns:
+            {"velocity": heat/hour, "acceleration": heat/hour², "predicted_heat": heat}
+        """
+        now = now or time.time()
+        points = [(now, float(topic["heat_value"]))] + self._history(topic["keyword"], now)
+
+        velocity = 0.0
+        acceleration = 0.0
+        if len(points) >= 2:
+            velocity = self._slope(points[1], points[0])
+        if len(points) >= 3:
+            previous_velocity = self._slope(points[2], points[1])
+            span_hours = (points[0][0] - points[2][0]) / 3600 / 2
+            acceleration = (velocity - previous_velocity) / span_hours
+
+        horizon = self.horizon_hours
+        predicted = topic["heat_value"] + velocity * horizon + 0.5 * acceleration * horizon ** 2
+
+        return {
+            "velocity": round(velocity, 1),
+            "acceleration": round(acceleration, 2),
+            "predicted_heat": max(0, round(predicted))
+        }
+
+    def select_topics(self, topics: List[Dict], limit: int, now: Optional[float] = None) -> List[Dict]:
+        """
+        Pick the `limit` topics with the highest projected heat
+
+        Each returned topic is annotated with velocity, acceleration and
+        predicted_heat. Board rank is kept unchanged; ties fall back to rank.
+
+        Args:
+            topics: Trending topic dictionaries (the whole fetched board)
+            limit: Number of topics to select
+            now: Timestamp of the current board (defaults to now)
+
+        Returns:
+            Selected topics, ordered by projected heat
+        """
+        annotated = [dict(topic, **self.momentum(topic, now)) for topic in topics]
+        annotated.sort(key=lambda t: (-t["predicted_heat"], t["rank"]))
+        return annotated[:limit]
+
+    def close(self):
+        """Close the database connection"""
+        self._conn.close()
+
+    def _history(self, keyword: str, now: float) -> List[Tuple[float, float]]:
+        """Up to two earlier snapshots, newest first, spaced at least min_interval_hours apart"""
+        rows = self._conn.execute(
+            "SELECT observed_at, heat_value FROM heat_snapshots "
+            "WHERE keyword = ? AND observed_at < ? AND observed_at >= ? "
+            "ORDER BY observed_at DESC",
+            (keyword, now, now - self.lookback_hours * 3600)
+        )
+
+        history = []
+        last_time = now
+        min_gap = self.min_interval_hours * 3600
+        for observed_at, heat_value in rows:
+            if last_time - observed_at >= min_gap:
+                history.append((observed_at, float(heat_value)))
+                last_time = observed_at
+                if len(history) == 2:
+                    break
+        return history
+
+    @staticmethod
+    def _slope(earlier: Tuple[float, float], later: Tuple[float, float]) -> float:
+        hours = (later[0] - earlier[0]) / 3600
+        return (later[1] - earlier[1]) / hours
+
+
+def create_trajectory_engine_from_env() -> TrajectoryEngine:
+    """
+    Build the trajectory engine from environment variables
+
+    MOMENTUM_HORIZON_HOURS overrides the projection horizon; snapshots share
+    ANALYTICS_DB_PATH with the analytics store.
+    """
+    return TrajectoryEngine(horizon_hours=float(os.getenv("MOMENTUM_HORIZON_HOURS", "24")))
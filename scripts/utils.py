@@ -4,19 +4,33 @@ Utility functions for Weibo Trends Analyzer
 import os
 import re
 import json
-import requests
+import asyncio
+import aiohttp
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 
+from scripts.cache import SearchCache
+from scripts.http_client import HTTPSessionPool, get_http_pool, run_sync
+from scripts.resilience import get_provider
+from scripts.telemetry import get_tracer, span
+
 
 class WeiboAPIClient:
     """Client for fetching Weibo trending topics"""
 
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, http_pool: Optional[HTTPSessionPool] = None):
         self.api_key = api_key
         self.base_url = "https://apis.tianapi.com/weibohot/index"
+        self.http_pool = http_pool or get_http_pool()
+        self.provider = get_provider("tianapi")
+        # True when the last fetch fell back to the bundled mock board
+        self.used_mock_data = False
 
     def fetch_trending_topics(self, limit: int = 15) -> List[Dict]:
+        """Synchronous wrapper around fetch_trending_topics_async"""
+        return run_sync(self.fetch_trending_topics_async(limit))
+
+    async def fetch_trending_topics_async(self, limit: int = 15) -> List[Dict]:
         """
         Fetch trending topics from Weibo API
 
@@ -26,40 +40,40 @@ class WeiboAPIClient:
         Returns:
             List of trending topic dictionaries
         """
-        try:
-            response = requests.get(
-                self.base_url,
-                params={"key": self.api_key},
-                timeout=10
-            )
-            response.raise_for_status()
-
-            data = response.json()
-
-            if data.get("code") != 200:
-                raise Exception(f"API Error: {data.get('msg', 'Unknown error')}")
-
-            topics = data.get("result", {}).get("list", [])
-
-            # Parse and structure the data
-            parsed_topics = []
-            for idx, topic in enumerate(topics[:limit], 1):
-                parsed_topics.append({
-                    "rank": idx,
-                    "keyword": topic.get("hotword", ""),
-                    "heat_value": self._extract_heat_value(topic.get("hotwordnum", "")),
-                    "tag": topic.get("hottag", ""),
-                    "category": self._extract_category(topic.get("hotwordnum", ""))
-                })
-
-            return parsed_topics
-
-        except requests.exceptions.RequestException as e:
-            print(f"❌ Failed to fetch Weibo trending topics: {e}")
-            return self._load_mock_data(limit)
-        except Exception as e:
-            print(f"❌ Error processing API response: {e}")
-            return self._load_mock_data(limit)
+        self.used_mock_data = False
+        with span("fetch", limit=limit) as fetch_span:
+            try:
+                data = await self.provider.call(
+                    lambda: self.http_pool.get_json(self.base_url, params={"key": self.api_key})
+                )
+
+                if data.get("code") != 200:
+                    raise Exception(f"API Error: {data.get('msg', 'Unknown error')}")
+
+                topics = data.get("result", {}).get("list", [])
+
+                # Parse and structure the data
+                parsed_topics = []
+                for idx, topic in enumerate(topics[:limit], 1):
+                    parsed_topics.append({
+                        "rank": idx,
+                        "keyword": topic.get("hotword", ""),
+                        "heat_value": self._extract_heat_value(topic.get("hotwordnum", "")),
+                        "tag": topic.get("hottag", ""),
+                        "category": self._extract_category(topic.get("hotwordnum", ""))
+                    })
+
+                fetch_span.set(topics=len(parsed_topics))
+                return parsed_topics
+
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                print(f"❌ Failed to fetch Weibo trending topics: {e}")
+                fetch_span.fail(e)
+                return self._load_mock_data(limit)
+            except Exception as e:
+                print(f"❌ Error processing API response: {e}")
+                fetch_span.fail(e)
+                return self._load_mock_data(limit)
 
     def _extract_heat_value(self, hotwordnum: str) -> int:
         """Extract numeric heat value from hotwordnum field"""
@@ -96,18 +110,58 @@ class WeiboAPIClient:
                     })
 
                 print("⚠️  Using mock data as fallback")
+                self.used_mock_data = True
+                get_tracer().fallback("mock_board")
                 return parsed_topics
         except Exception as e:
             print(f"❌ Failed to load mock data: {e}")
             return []
 
 
+# Research queries run per topic. Each query's result lines are split across
+# its fields in order: (field, number of lines), where None takes the rest.
+DEFAULT_RESEARCH_QUERIES = [
+    {
+        # Context & Background
+        "template": "{keyword} 微博 新闻背景 讨论",
+        "num_results": 5,
+        "fields": [("social_media", 2), ("news_background", None)],
+        "fallback": {
+            "social_media": "⚠️ 搜索结果受限",
+            "news_background": "⚠️ 搜索结果受限"
+        }
+    },
+    {
+        # User Insights & Market Potential
+        "template": "{keyword} 用户需求 产品 市场",
+        "num_results": 5,
+        "fields": [("user_insights", 3), ("market_potential", None)],
+        "fallback": {
+            "user_insights": "⚠️ 搜索结果受限",
+            "market_potential": "基于通用市场分析"
+        }
+    }
+]
+
+
 class SearchAPIClient:
     """Client for web search API (SerpAPI or Google Custom Search)"""
 
-    def __init__(self, api_key: str, search_engine: str = "serpapi"):
+    def __init__(
+        self,
+        api_key: str,
+        search_engine: str = "serpapi",
+        http_pool: Optional[HTTPSessionPool] = None,
+        cache: Optional[SearchCache] = None,
+        offline: bool = False,
+        research_queries: Optional[List[Dict]] = None
+    ):
         self.api_key = api_key
         self.search_engine = search_engine
+        self.http_pool = http_pool or get_http_pool()
+        self.cache = cache
+        self.offline = offline
+        self.research_queries = research_queries or DEFAULT_RESEARCH_QUERIES
 
         if search_engine == "serpapi":
             self.base_url = "https://serpapi.com/search"
@@ -116,7 +170,13 @@ class SearchAPIClient:
         else:
             raise ValueError(f"Unsupported search engine: {search_engine}")
 
+        self.provider = get_provider(search_engine)
+
     def search(self, query: str, num_results: int = 5) -> List[Dict]:
+        """Synchronous wrapper around search_async"""
+        return run_sync(self.search_async(query, num_results))
+
+    async def search_async(self, query: str, num_results: int = 5) -> List[Dict]:
         """
         Perform web search
 
@@ -127,16 +187,37 @@ class SearchAPIClient:
         Returns:
             List of search result dictionaries
         """
-        try:
-            if self.search_engine == "serpapi":
-                return self._search_serpapi(query, num_results)
-            elif self.search_engine == "google":
-                return self._search_google(query, num_results)
-        except Exception as e:
-            print(f"❌ Search failed for query '{query}': {e}")
-            return []
-
-    def _search_serpapi(self, query: str, num_results: int) -> List[Dict]:
+        with span("search", engine=self.search_engine, query=query) as search_span:
+            cache_key = None
+            if self.cache is not None:
+                cache_key = SearchCache.make_key(self.search_engine, query, num_results)
+                cached = self.cache.get(cache_key)
+                if cached is not None:
+                    search_span.set(cache="hit", results=len(cached))
+                    return cached
+
+            if self.offline:
+                print(f"⚠️  Offline: no cached results for query '{query}'")
+                return []
+
+            try:
+                if self.search_engine == "serpapi":
+                    results = await self._search_serpapi(query, num_results)
+                elif self.search_engine == "google":
+                    results = await self._search_google(query, num_results)
+            except Exception as e:
+                print(f"❌ Search failed for query '{query}': {e}")
+                search_span.fail(e)
+                return []
+
+            # Empty results are not cached so a failed or thin search is retried next run
+            if results and cache_key is not None:
+                self.cache.set(cache_key, results)
+
+            search_span.set(results=len(results))
+            return results
+
+    async def _search_serpapi(self, query: str, num_results: int) -> List[Dict]:
         """Search using SerpAPI"""
         params = {
             "q": query,
@@ -146,10 +227,7 @@ class SearchAPIClient:
             "gl": "cn"      # China region
         }
 
-        response = requests.get(self.base_url, params=params, timeout=10)
-        response.raise_for_status()
-
-        data = response.json()
+        data = await self.provider.call(lambda: self.http_pool.get_json(self.base_url, params=params))
         results = []
 
         for item in data.get("organic_results", [])[:num_results]:
@@ -161,7 +239,7 @@ class SearchAPIClient:
 
         return results
 
-    def _search_google(self, query: str, num_results: int) -> List[Dict]:
+    async def _search_google(self, query: str, num_results: int) -> List[Dict]:
         """Search using Google Custom Search API"""
         params = {
             "key": self.api_key,
@@ -171,10 +249,7 @@ class SearchAPIClient:
             "lr": "lang_zh-CN"
         }
 
-        response = requests.get(self.base_url, params=params, timeout=10)
-        response.raise_for_status()
-
-        data = response.json()
+        data = await self.provider.call(lambda: self.http_pool.get_json(self.base_url, params=params))
         results = []
 
         for item in data.get("items", [])[:num_results]:
@@ -187,6 +262,10 @@ class SearchAPIClient:
         return results
 
     def research_topic(self, keyword: str) -> Dict[str, str]:
+        """Synchronous wrapper around research_topic_async"""
+        return run_sync(self.research_topic_async(keyword))
+
+    async def research_topic_async(self, keyword: str) -> Dict[str, str]:
         """
         Conduct comprehensive research on a trending topic
 
@@ -196,42 +275,30 @@ class SearchAPIClient:
         Returns:
             Dictionary with research findings
         """
-        research = {
-            "social_media": "",
-            "news_background": "",
-            "user_insights": "",
-            "market_potential": ""
-        }
-
-        # Search 1: Context & Background
-        query1 = f"{keyword} 微博 新闻背景 讨论"
-        results1 = self.search(query1, num_results=5)
-
-        if results1:
-            context = []
-            for r in results1:
-                context.append(f"{r['title']}: {r['snippet']}")
-
-            research["social_media"] = "\n".join(context[:2])
-            research["news_background"] = "\n".join(context[2:])
-        else:
-            research["social_media"] = "⚠️ 搜索结果受限"
-            research["news_background"] = "⚠️ 搜索结果受限"
-
-        # Search 2: User Insights & Market Potential
-        query2 = f"{keyword} 用户需求 产品 市场"
-        results2 = self.search(query2, num_results=5)
-
-        if results2:
-            insights = []
-            for r in results2:
-                insights.append(f"{r['title']}: {r['snippet']}")
-
-            research["user_insights"] = "\n".join(insights[:3])
-            research["market_potential"] = "\n".join(insights[3:])
-        else:
-            research["user_insights"] = "⚠️ 搜索结果受限"
-            research["market_potential"] = "基于通用市场分析"
+        research = {}
+        for spec in self.research_queries:
+            for field, _ in spec["fields"]:
+                research[field] = ""
+
+        # All research queries are independent, so they run concurrently
+        with span("research", keyword=keyword):
+            all_results = await asyncio.gather(*(
+                self.search_async(spec["template"].format(keyword=keyword), num_results=spec.get("num_results", 5))
+                for spec in self.research_queries
+            ))
+
+        for spec, results in zip(self.research_queries, all_results):
+            if results:
+                lines = [f"{r['title']}: {r['snippet']}" for r in results]
+
+                # Split the result lines across the query's fields in order
+                start = 0
+                for field, count in spec["fields"]:
+                    end = len(lines) if count is None else start + count
+                    research[field] = "\n".join(lines[start:end])
+                    start = end
+            else:
+                research.update(spec["fallback"])
 
         return research
 
@@ -250,6 +317,148 @@ def format_display_timestamp(dt: Optional[datetime] = None) -> str:
     return dt.strftime("%Y年%m月%d日 %H:%M:%S")
 
 
+class JSONStreamExtractor:
+    """
+    Incrementally find the first complete top-level JSON value in streamed text
+
+    Chunks are scanned as they arrive, tracking bracket depth and string
+    state, so the value is available the moment its closing bracket streams
+    in. Text before the opening bracket is skipped, and only the value's own
+    chunks are kept.
+    """
+
+    def __init__(self, opening: str = "{"):
+        """
+        Args:
+            opening: "{" to extract an object, "[" to extract an array
+        """
+        self.opening = opening
+        self.closing = "}" if opening == "{" else "]"
+        self._significant = re.compile(r'["\\' + re.escape(opening) + re.escape(self.closing) + ']')
+        self._parts: List[str] = []
+        self._depth = 0
+        self._in_string = False
+        self._escape_pending = False
+        self.result: Optional[str] = None
+
+    def feed(self, chunk: str) -> Optional[str]:
+        """
+        Consume the next chunk of text
+
+        Args:
+            chunk: Next piece of the response
+
+        Returns:
+            The complete JSON text once the top-level value has closed, else None
+        """
+        if self.result is not None or not chunk:
+            return self.result
+
+        pos = 0
+        begin = 0
+        if self._escape_pending:
+            # The previous chunk ended on a backslash inside a string
+            pos = 1
+            self._escape_pending = False
+
+        while True:
+            if self._depth == 0:
+                begin = chunk.find(self.opening, pos)
+                if begin < 0:
+                    return None
+                self._depth = 1
+                pos = begin + 1
+                continue
+
+            match = self._significant.search(chunk, pos)
+            if match is None:
+                self._parts.append(chunk[begin:])
+                return None
+
+            char = match.group()
+            pos = match.end()
+
+            if self._in_string:
+                if char == "\\":
+                    if pos >= len(chunk):
+                        self._escape_pending = True
+                    else:
+                        pos += 1
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char == self.opening:
+                self._depth += 1
+            elif char == self.closing:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._parts.append(chunk[begin:pos])
+                    self.result = "".join(self._parts)
+                    self._parts = []
+                    return self.result
+
+
+def extract_json_object(text: str, opening: str = "{") -> Optional[str]:
+    """Return the first complete top-level JSON object (or array) in text, if any"""
+    return JSONStreamExtractor(opening).feed(text)
+
+
+def char_ngrams(text: str, n: int = 2) -> List[str]:
+    """
+    Split text into overlapping character n-grams
+
+    Character n-grams suit Chinese text, which has no word separators.
+    Whitespace breaks the text into separate runs so no n-gram spans it.
+
+    Args:
+        text: Input text
+        n: n-gram length
+
+    Returns:
+        n-grams in order of appearance (runs shorter than n are kept whole)
+    """
+    grams = []
+    for run in text.split():
+        if len(run) <= n:
+            grams.append(run)
+        else:
+            grams.extend(run[i:i + n] for i in range(len(run) - n + 1))
+    return grams
+
+
+def build_search_index(products: List[Dict]) -> Dict:
+    """
+    Build the dashboard's client-side search index
+
+    Each product's searchable text (keyword, related topic keywords and
+    product name, lowercased) is indexed by character unigrams and bigrams.
+    The page intersects the posting lists of a query's bigrams (or its single
+    character) and then confirms candidates with a substring test against
+    `texts`.
+
+    Args:
+        products: Products in the order their cards are rendered
+
+    Returns:
+        {"texts": [...], "grams": {gram: [product indices]}}
+    """
+    texts = []
+    grams: Dict[str, List[int]] = {}
+
+    for idx, product in enumerate(products):
+        keywords = [product.get('keyword', '')]
+        keywords.extend(related["keyword"] for related in product.get("related_topics", []))
+        text = f"{' '.join(keywords)} {product.get('product_name', '')}".lower()
+        texts.append(text)
+
+        # dict.fromkeys dedups in order of appearance, so the index is the same under any hash seed
+        for gram in dict.fromkeys(char_ngrams(text, 1) + char_ngrams(text, 2)):
+            grams.setdefault(gram, []).append(idx)
+
+    return {"texts": texts, "grams": grams}
+
+
 def validate_product_concept(concept: Dict) -> bool:
     """
     Validate that a product concept has all required fields
@@ -305,23 +514,3 @@ def calculate_score_tier(score: int) -> Tuple[str, str, str]:
     else:
         return ("其他", "📋 其他", "other")
 
-
-def save_json_data(data: Dict, output_dir: str, filename: str) -> str:
-    """
-    Save data as JSON file
-
-    Args:
-        data: Data to save
-        output_dir: Output directory
-        filename: Filename
-
-    Returns:
-        Path to saved file
-    """
-    os.makedirs(output_dir, exist_ok=True)
-    filepath = os.path.join(output_dir, filename)
-
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
-
-    return filepath
@@ -6,14 +6,36 @@ Analyzes Weibo trending topics and generates creative product ideas
 import os
 import sys
 import asyncio
+import argparse
 import json
+import hashlib
+import sqlite3
 from datetime import datetime
-from typing import Dict, List
-from jinja2 import Environment, FileSystemLoader
+from typing import Dict, List, Optional, Tuple
 
 # Add parent directory to path to import utils
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
+from scripts.analytics_store import AnalyticsStore
+from scripts.assets import HASH_LENGTH, page_assets, precompress, precompress_enabled, remove_with_siblings
+from scripts.cache import (
+    CacheMissError,
+    LLMResponseCache,
+    SearchCache,
+    create_llm_cache_from_env,
+    create_search_cache_from_env
+)
+from scripts.checkpoint import RunCheckpoint
+from scripts.concept_index import ConceptIndex
+from scripts.data_format import find_data_files, load_results, save_results
+from scripts.generate_index import generate_index_html, get_report_files
+from scripts.http_client import close_http_pool
+from scripts.profiling import profile_run, profiling_enabled
+from scripts.resilience import get_provider, is_transient_error, resilience_stats
+from scripts.telemetry import export_telemetry, get_tracer, span
+from scripts.templating import RENDER_BUFFER_BYTES, get_template, render_to_file
+from scripts.topic_clusters import CLUSTER_FIELD, collapse_duplicates
+from scripts.trajectory import MOMENTUM_FIELDS, TrajectoryEngine, create_trajectory_engine_from_env
 from scripts.utils import (
     WeiboAPIClient,
     SearchAPIClient,
@@ -21,17 +43,83 @@ from scripts.utils import (
     format_display_timestamp,
     validate_product_concept,
     calculate_score_tier,
-    save_json_data
+    build_search_index,
+    extract_json_object,
+    JSONStreamExtractor
 )
 
 # Import Claude Agent SDK
 try:
-    from claude_agent_sdk import query
+    from claude_agent_sdk import CLIConnectionError, CLINotFoundError, ProcessError, query
 except ImportError:
     print("❌ Error: claude-agent-sdk not installed. Please run: pip install claude-agent-sdk")
     sys.exit(1)
 
 
+# Fields the model must return for each product concept (body of the JSON template)
+CONCEPT_JSON_FIELDS = """  "product_name": "产品名称（简短、有吸引力）",
+  "market_category": "市场赛道（如：文创、家居、科技配件、时尚饰品等）",
+  "target_audience": "目标人群（具体描述年龄、兴趣、收入水平等）",
+  "description": "详细产品描述（如何与热搜话题结合，解决什么问题，有什么特色）",
+  "manufacturing_details": "生产特点（生产方式、材料、起订量、成本结构等）",
+  "score_breakdown": {
+    "development_potential": <0-40分>,
+    "interest_level": <0-20分>,
+    "life_utility": <0-20分>,
+    "production_ease": <0-20分>
+  },
+  "total_score": <总分0-100>,
+  "score_justification": "评分理由（简要说明各维度评分依据）\""""
+
+# Topic fields added before analysis that are carried through to each concept
+CARRIED_TOPIC_FIELDS = MOMENTUM_FIELDS + (CLUSTER_FIELD,)
+
+SCORING_RUBRIC = """**评分标准**：
+1. 可发展度 (40分)：市场规模15分 + 技术可行性10分 + 趋势持久性10分 + 竞争格局5分
+2. 有趣度 (20分)：创意独特性10分 + 情感吸引力5分 + 传播潜力5分
+3. 生活有用度 (20分)：日常整合度10分 + 解决问题能力5分 + 受众规模5分
+4. 生产容易度 (20分)：制造复杂度10分 + 材料可得性5分 + 小批量成本5分
+"""
+
+
+def is_transient_llm_error(exc: BaseException) -> bool:
+    """
+    Decide whether a failed Claude call is worth retrying
+
+    Timeouts, lost connections and crashed CLI runs are transient, as are API
+    errors reported with status 429 or 5xx. A missing CLI, other API errors
+    and unusable output are not, so they neither retry nor count toward
+    opening the Claude circuit.
+    """
+    if isinstance(exc, CLINotFoundError):
+        return False
+    # Reported by newer SDKs on the error raised for a failed API call
+    status = getattr(exc, "api_error_status", None)
+    if status is not None:
+        return status == 429 or status >= 500
+    return isinstance(exc, (ProcessError, CLIConnectionError, ConnectionError)) or is_transient_error(exc)
+
+
+def format_topic_brief(topic: Dict, research: Dict) -> str:
+    """Format a topic and its research findings for inclusion in a prompt"""
+    return f"""**热搜话题**：{topic['keyword']}
+**排名**：第{topic['rank']}名
+**热度值**：{topic['heat_value']:,}
+
+**背景研究**：
+社交媒体讨论：
+{research['social_media']}
+
+新闻背景：
+{research['news_background']}
+
+用户洞察：
+{research['user_insights']}
+
+市场潜力：
+{research['market_potential']}"""
+
+
 class WeiboTrendsAnalyzer:
     """Main analyzer class"""
 
@@ -41,13 +129,33 @@ class WeiboTrendsAnalyzer:
         search_api_key: str,
         anthropic_api_key: str,
         search_engine: str = "serpapi",
-        anthropic_base_url: str = None
+        anthropic_base_url: str = None,
+        search_cache: Optional[SearchCache] = None,
+        llm_cache: Optional[LLMResponseCache] = None,
+        trajectory: Optional[TrajectoryEngine] = None,
+        replay_date: Optional[str] = None
     ):
+        self.llm_cache = llm_cache
+        self.trajectory = trajectory
+        replay_only = llm_cache is not None and llm_cache.replay_only
+        # In replay-only mode the topics come from this day's saved report, not the live board
+        self.replay_date = (replay_date or format_timestamp()) if replay_only else None
+
         self.weibo_client = WeiboAPIClient(tianapi_key)
-        self.search_client = SearchAPIClient(search_api_key, search_engine)
+        self.search_client = SearchAPIClient(
+            search_api_key, search_engine, cache=search_cache, offline=replay_only
+        )
         self.anthropic_api_key = anthropic_api_key
         self.anthropic_base_url = anthropic_base_url
 
+        self.llm_provider = get_provider("claude", is_transient=is_transient_llm_error)
+
+        # Everything besides the prompt that changes the model's answer; part of the LLM cache key
+        self.llm_settings = {
+            "model": os.getenv("ANTHROPIC_MODEL", "default"),
+            "base_url": anthropic_base_url or ""
+        }
+
         # Set environment variables for Claude SDK
         os.environ["ANTHROPIC_API_KEY"] = anthropic_api_key
 
@@ -72,111 +180,228 @@ class WeiboTrendsAnalyzer:
             Product concept dictionary
         """
         keyword = topic["keyword"]
-        rank = topic["rank"]
-        heat_value = topic["heat_value"]
 
         # Construct prompt for Claude
         prompt = f"""
 你是一位专业的产品设计师和市场分析师。请根据以下微博热搜话题，生成创意产品概念。
 
-**热搜话题**：{keyword}
-**排名**：第{rank}名
-**热度值**：{heat_value:,}
-
-**背景研究**：
-社交媒体讨论：
-{research['social_media']}
-
-新闻背景：
-{research['news_background']}
-
-用户洞察：
-{research['user_insights']}
-
-市场潜力：
-{research['market_potential']}
+{format_topic_brief(topic, research)}
 
 ---
 
 请基于以上信息，设计1个创意小商品，并按照以下格式返回JSON（仅返回JSON，不要其他文字）：
 
 {{
-  "product_name": "产品名称（简短、有吸引力）",
-  "market_category": "市场赛道（如：文创、家居、科技配件、时尚饰品等）",
-  "target_audience": "目标人群（具体描述年龄、兴趣、收入水平等）",
-  "description": "详细产品描述（如何与热搜话题结合，解决什么问题，有什么特色）",
-  "manufacturing_details": "生产特点（生产方式、材料、起订量、成本结构等）",
-  "score_breakdown": {{
-    "development_potential": <0-40分>,
-    "interest_level": <0-20分>,
-    "life_utility": <0-20分>,
-    "production_ease": <0-20分>
-  }},
-  "total_score": <总分0-100>,
-  "score_justification": "评分理由（简要说明各维度评分依据）"
+{CONCEPT_JSON_FIELDS}
 }}
 
-**评分标准**：
-1. 可发展度 (40分)：市场规模15分 + 技术可行性10分 + 趋势持久性10分 + 竞争格局5分
-2. 有趣度 (20分)：创意独特性10分 + 情感吸引力5分 + 传播潜力5分
-3. 生活有用度 (20分)：日常整合度10分 + 解决问题能力5分 + 受众规模5分
-4. 生产容易度 (20分)：制造复杂度10分 + 材料可得性5分 + 小批量成本5分
-"""
+{SCORING_RUBRIC}"""
 
         try:
-            # Use Claude Agent SDK to generate product concept
-            response_text = ""
-            async for message in query(prompt=prompt):
-                if hasattr(message, 'content'):
-                    response_text += str(message.content)
-                else:
-                    response_text += str(message)
-
-            # Parse JSON response
-            # Try to extract JSON from response
-            json_start = response_text.find('{')
-            json_end = response_text.rfind('}') + 1
-
-            if json_start >= 0 and json_end > json_start:
-                json_str = response_text[json_start:json_end]
-                concept = json.loads(json_str)
-
-                # Add topic information
-                concept["keyword"] = keyword
-                concept["rank"] = rank
-                concept["heat_value"] = heat_value
-                concept["tag"] = topic.get("tag", "")
-                concept["category"] = topic.get("category", "")
-
-                # Add research summary
-                concept["research_summary"] = research
-
-                # Validate concept
-                if validate_product_concept(concept):
-                    # Calculate tier
-                    tier_name, tier_badge, tier_class = calculate_score_tier(
-                        concept["total_score"]
-                    )
-                    concept["tier_name"] = tier_name
-                    concept["tier_badge"] = tier_badge
-                    concept["tier_class"] = tier_class
+            cache_key, json_str = await self._cached_llm_call(prompt)
+
+            if json_str is not None:
+                with span("parse", keyword=keyword) as parse_span:
+                    concept = self._complete_concept(json.loads(json_str), topic, research)
+                    parse_span.set(valid=concept is not None)
+
+                if concept is not None:
+                    # Only responses that produced a valid concept are worth replaying
+                    if self.llm_cache is not None:
+                        self.llm_cache.set(cache_key, json_str)
 
                     return concept
                 else:
                     print(f"⚠️  Invalid product concept for '{keyword}'")
-                    return self._create_fallback_concept(topic, research)
+                    return self._create_fallback_concept(topic, research, reason="invalid_concept")
 
             else:
                 print(f"⚠️  Failed to parse JSON for '{keyword}'")
-                return self._create_fallback_concept(topic, research)
+                return self._create_fallback_concept(topic, research, reason="no_json")
 
+        except CacheMissError:
+            raise
         except Exception as e:
             print(f"❌ Error analyzing topic '{keyword}': {e}")
-            return self._create_fallback_concept(topic, research)
+            return self._create_fallback_concept(topic, research, reason=type(e).__name__)
+
+    async def analyze_topic_batch(self, batch: List[Tuple[Dict, Dict]]) -> List[Dict]:
+        """
+        Analyze several topics with a single Claude request
+
+        The scoring rubric is sent once for the whole batch and the model
+        returns a JSON array with one concept per topic. Elements that are
+        missing or fail validation are retried with analyze_single_topic.
+
+        Args:
+            batch: (topic, research) pairs, in rank order
+
+        Returns:
+            Product concept dictionaries in the same order as `batch`
+        """
+        if len(batch) == 1:
+            topic, research = batch[0]
+            return [await self.analyze_single_topic(topic, research)]
+
+        topic_sections = "\n\n".join(
+            f"### 话题 {idx}\n{format_topic_brief(topic, research)}"
+            for idx, (topic, research) in enumerate(batch, 1)
+        )
+
+        prompt = f"""
+你是一位专业的产品设计师和市场分析师。请根据以下{len(batch)}个微博热搜话题，分别为每个话题生成创意产品概念。
+
+{topic_sections}
+
+---
+
+请基于以上信息，为每个话题各设计1个创意小商品，按话题顺序返回一个包含{len(batch)}个元素的JSON数组（仅返回JSON数组，不要其他文字），每个元素格式如下：
+
+{{
+  "keyword": "对应的热搜话题（原样填写）",
+{CONCEPT_JSON_FIELDS}
+}}
+
+{SCORING_RUBRIC}"""
+
+        elements = []
+        try:
+            cache_key, json_str = await self._cached_llm_call(prompt, opening="[")
+            if json_str is not None:
+                with span("parse", topics=len(batch)):
+                    elements = [e for e in json.loads(json_str) if isinstance(e, dict)]
+                if elements and self.llm_cache is not None:
+                    self.llm_cache.set(cache_key, json_str)
+            else:
+                print(f"⚠️  Failed to parse JSON array for batch of {len(batch)}")
+        except CacheMissError:
+            raise
+        except Exception as e:
+            print(f"❌ Error analyzing batch of {len(batch)}: {e}")
+
+        # Match elements to topics by keyword, falling back to position when the counts agree
+        by_keyword = {e.get("keyword"): e for e in elements}
+        positional = len(elements) == len(batch)
+
+        concepts = []
+        retries = 0
+        for idx, (topic, research) in enumerate(batch):
+            raw = by_keyword.get(topic["keyword"]) or (elements[idx] if positional else None)
+            concept = self._complete_concept(dict(raw), topic, research) if raw else None
+
+            if concept is None:
+                retries += 1
+                concept = await self.analyze_single_topic(topic, research)
+            concepts.append(concept)
+
+        if retries:
+            print(f"  🔁 Retried {retries}/{len(batch)} topic(s) from the batch individually")
+
+        return concepts
+
+    async def _cached_llm_call(self, prompt: str, opening: str = "{") -> Tuple[str, Optional[str]]:
+        """
+        Get the JSON answer for a prompt from the LLM cache or from Claude
+
+        Args:
+            prompt: Prompt to send
+            opening: "{" to extract an object, "[" to extract an array
+
+        Returns:
+            (cache key, JSON text or None)
+
+        Raises:
+            CacheMissError: On a miss in replay-only mode
+        """
+        with span("llm", prompt_bytes=len(prompt.encode("utf-8"))) as llm_span:
+            cache_key = LLMResponseCache.make_key(prompt, self.llm_settings)
+            cached = self.llm_cache.lookup(cache_key) if self.llm_cache else None
+
+            if cached is not None:
+                llm_span.set(cache="hit")
+                json_str = extract_json_object(cached, opening)
+            else:
+                llm_span.set(cache="miss" if self.llm_cache else "off")
+                json_str = await self.llm_provider.call(lambda: self._query_llm(prompt, opening))
+
+            llm_span.set(bytes=len(json_str.encode("utf-8")) if json_str else 0)
+            return cache_key, json_str
 
-    def _create_fallback_concept(self, topic: Dict, research: Dict) -> Dict:
-        """Create a basic fallback concept when AI analysis fails"""
-        return {
+    def _complete_concept(self, concept: Dict, topic: Dict, research: Dict) -> Optional[Dict]:
+        """
+        Attach topic information to a model-generated concept and validate it
+
+        Args:
+            concept: Concept fields parsed from the model's JSON
+            topic: Trending topic dictionary
+            research: Research findings dictionary
+
+        Returns:
+            The completed concept, or None if it fails validation
+        """
+        # Add topic information
+        concept["keyword"] = topic["keyword"]
+        concept["rank"] = topic["rank"]
+        concept["heat_value"] = topic["heat_value"]
+        concept["tag"] = topic.get("tag", "")
+        concept["category"] = topic.get("category", "")
+        concept.update({key: topic[key] for key in CARRIED_TOPIC_FIELDS if key in topic})
+
+        # Add research summary
+        concept["research_summary"] = research
+
+        # Validate concept
+        if not validate_product_concept(concept):
+            return None
+
+        # Calculate tier
+        tier_name, tier_badge, tier_class = calculate_score_tier(
+            concept["total_score"]
+        )
+        concept["tier_name"] = tier_name
+        concept["tier_badge"] = tier_badge
+        concept["tier_class"] = tier_class
+
+        return concept
+
+    async def _query_llm(self, prompt: str, opening: str = "{") -> Optional[str]:
+        """
+        Run one Claude query and return the JSON in its answer
+
+        The response is scanned incrementally as it streams in; as soon as
+        the top-level JSON value closes the rest of the stream is cancelled.
+
+        Args:
+            prompt: Prompt to send
+            opening: "{" to extract an object, "[" to extract an array
+
+        Returns:
+            The JSON text, or None if the response contained none
+        """
+        extractor = JSONStreamExtractor(opening)
+        stream = query(prompt=prompt)
+        try:
+            async for message in stream:
+                if extractor.feed(self._message_text(message)) is not None:
+                    break
+        finally:
+            await stream.aclose()
+        return extractor.result
+
+    @staticmethod
+    def _message_text(message) -> str:
+        """Return the text blocks of an assistant message (other messages carry no answer text)"""
+        content = getattr(message, "content", None)
+        if isinstance(content, str):
+            return content
+        if isinstance(content, list):
+            return "".join(getattr(block, "text", "") for block in content)
+        return ""
+
+    def _create_fallback_concept(self, topic: Dict, research: Dict, reason: str = "analysis_failed") -> Dict:
+        """Create a basic fallback concept when AI analysis fails (`reason` is recorded in telemetry)"""
+        get_tracer().fallback(reason, keyword=topic["keyword"])
+        concept = {
             "keyword": topic["keyword"],
             "rank": topic["rank"],
             "heat_value": topic["heat_value"],
@@ -195,18 +420,184 @@ class WeiboTrendsAnalyzer:
             },
             "total_score": 50,
             "score_justification": "⚠️ AI分析失败，使用默认评分",
+            "fallback_reason": reason,
             "research_summary": research,
             "tier_name": "其他",
             "tier_badge": "📋 其他",
             "tier_class": "other"
         }
+        concept.update({key: topic[key] for key in CARRIED_TOPIC_FIELDS if key in topic})
+        return concept
+
+    async def _analyze_concurrently(
+        self,
+        topics: List[Dict],
+        concurrency: int,
+        search_concurrency: int,
+        llm_concurrency: int,
+        checkpoint: Optional[RunCheckpoint] = None
+    ) -> List[Dict]:
+        """
+        Research and analyze topics as a concurrent pipeline
+
+        Each topic still goes research -> AI analysis, but up to `concurrency`
+        topics are in flight at once, with separate caps on concurrent
+        searches and concurrent LLM calls.
+
+        Args:
+            topics: Trending topic dictionaries, in rank order
+            concurrency: Maximum number of topics in flight
+            search_concurrency: Maximum number of concurrent research calls
+            llm_concurrency: Maximum number of concurrent LLM calls
+            checkpoint: Run checkpoint that each finished topic is appended to
 
-    async def analyze_trends(self, limit: int = 10) -> Dict:
+        Returns:
+            Product concepts in the same order as `topics`
+        """
+        topic_slots = asyncio.Semaphore(concurrency)
+        search_slots = asyncio.Semaphore(search_concurrency)
+        llm_slots = asyncio.Semaphore(llm_concurrency)
+        total = len(topics)
+        completed = 0
+
+        async def process(topic: Dict) -> Dict:
+            nonlocal completed
+            async with topic_slots:
+                async with search_slots:
+                    research = await self.search_client.research_topic_async(topic["keyword"])
+                async with llm_slots:
+                    concept = await self.analyze_single_topic(topic, research)
+
+            if checkpoint is not None:
+                checkpoint.record(concept)
+
+            # Topics finish out of order, so each progress line is self-contained
+            completed += 1
+            print(
+                f"  ✅ [{completed}/{total}] #{topic['rank']} {topic['keyword']} → "
+                f"{concept['product_name']} - Score: {concept['total_score']}/100 ({concept['tier_badge']})"
+            )
+            return concept
+
+        # gather() returns results in submission order, i.e. rank order
+        return list(await asyncio.gather(*(process(topic) for topic in topics)))
+
+    async def _analyze_in_batches(
+        self,
+        topics: List[Dict],
+        batch_size: int,
+        search_concurrency: int,
+        llm_concurrency: int,
+        checkpoint: Optional[RunCheckpoint] = None
+    ) -> List[Dict]:
+        """
+        Research all topics, then analyze them `batch_size` at a time per Claude request
+
+        Args:
+            topics: Trending topic dictionaries, in rank order
+            batch_size: Number of topics per Claude request
+            search_concurrency: Maximum number of concurrent research calls
+            llm_concurrency: Maximum number of concurrent batch requests
+            checkpoint: Run checkpoint that each finished topic is appended to
+
+        Returns:
+            Product concepts in the same order as `topics`
+        """
+        search_slots = asyncio.Semaphore(search_concurrency)
+        llm_slots = asyncio.Semaphore(llm_concurrency)
+
+        async def research(topic: Dict) -> Dict:
+            async with search_slots:
+                return await self.search_client.research_topic_async(topic["keyword"])
+
+        print(f"  🔎 Researching {len(topics)} topics...")
+        researched = await asyncio.gather(*(research(topic) for topic in topics))
+        pairs = list(zip(topics, researched))
+
+        batches = [pairs[i:i + batch_size] for i in range(0, len(pairs), batch_size)]
+        completed = 0
+
+        async def process(batch: List[Tuple[Dict, Dict]]) -> List[Dict]:
+            nonlocal completed
+            async with llm_slots:
+                concepts = await self.analyze_topic_batch(batch)
+
+            completed += 1
+            print(f"  🤖 Batch {completed}/{len(batches)} done")
+            for concept in concepts:
+                if checkpoint is not None:
+                    checkpoint.record(concept)
+                print(f"    ✅ #{concept['rank']} {concept['keyword']} → {concept['product_name']} - "
+                      f"Score: {concept['total_score']}/100 ({concept['tier_badge']})")
+            return concepts
+
+        results = await asyncio.gather(*(process(batch) for batch in batches))
+        return [concept for concepts in results for concept in concepts]
+
+    def _select_topics(self, board: List[Dict], limit: int, topic_selection: str) -> List[Dict]:
+        """
+        Record a heat snapshot of the board and choose the topics to analyze
+
+        Args:
+            board: Fetched trending topics in board order
+            limit: Number of topics to analyze
+            topic_selection: "rank" or "momentum"
+
+        Returns:
+            Topics to research and analyze
+        """
+        if self.trajectory is None:
+            return board[:limit]
+
+        # Mock data would pollute the heat history with stale values
+        if not self.weibo_client.used_mock_data:
+            self.trajectory.record(board)
+
+        if topic_selection != "momentum":
+            return board[:limit]
+
+        topics = self.trajectory.select_topics(board, limit)
+        promoted = [t for t in topics if t["rank"] > limit]
+        print(f"📈 Momentum selection: {len(promoted)} rising topic(s) promoted from below #{limit}")
+        for topic in topics:
+            print(f"  #{topic['rank']:<3} {topic['keyword']}  "
+                  f"{topic['velocity']:+.0f}/h → {topic['predicted_heat']} in {self.trajectory.horizon_hours:g}h")
+        print()
+        return topics
+
+    async def analyze_trends(
+        self,
+        limit: int = 10,
+        concurrency: int = 1,
+        search_concurrency: Optional[int] = None,
+        llm_concurrency: Optional[int] = None,
+        batch_size: int = 1,
+        topic_selection: str = "rank",
+        candidate_pool: int = 50,
+        dedup_threshold: float = 0.0,
+        checkpoint: Optional[RunCheckpoint] = None
+    ) -> Dict:
         """
         Main analysis workflow
 
+        With a checkpoint, each finished topic is appended to it as soon as it
+        is done. A checkpoint that already has a topic list resumes that run:
+        the board is not fetched again and only topics without a finished
+        concept are analyzed. The results belong to the checkpoint's run date,
+        which callers should publish them under.
+
         Args:
             limit: Number of trends to analyze
+            concurrency: Number of topics processed at once (1 = sequential)
+            search_concurrency: Maximum concurrent research calls (defaults to `concurrency`)
+            llm_concurrency: Maximum concurrent LLM calls (defaults to `concurrency`)
+            batch_size: Topics per Claude request (1 = one request per topic)
+            topic_selection: "rank" analyzes the top of the board; "momentum" picks
+                the topics with the highest projected heat from `candidate_pool`
+            candidate_pool: Board entries fetched for snapshots and momentum selection
+            dedup_threshold: Keyword similarity at which topics are analyzed as one
+                cluster (0 disables near-duplicate collapsing)
+            checkpoint: Run checkpoint to append progress to, or to resume from
 
         Returns:
             Complete analysis results dictionary
@@ -214,17 +605,202 @@ class WeiboTrendsAnalyzer:
         print(f"🚀 Starting Weibo Trends Analysis...")
         print(f"📅 {format_display_timestamp()}\n")
 
-        # Step 1: Fetch trending topics
-        print("📊 Step 1: Fetching Weibo trending topics...")
-        topics = self.weibo_client.fetch_trending_topics(limit=limit)
+        # Step 1: Fetch trending topics (a resumed run keeps the topics it started with)
+        if checkpoint is not None and checkpoint.started:
+            topics = checkpoint.topics
+            print(f"♻️  Resuming {checkpoint.path}: "
+                  f"{len(checkpoint.concepts)}/{len(topics)} topics already analyzed\n")
+        else:
+            topics = await self._fetch_topics(limit, topic_selection, candidate_pool, dedup_threshold)
+            if not topics:
+                print("❌ No topics fetched. Exiting.")
+                return {"error": "No topics available"}
+            if checkpoint is not None:
+                checkpoint.start(topics, self.replay_date or format_timestamp())
+
+        # Step 2: Research and analyze each topic
+        if checkpoint is None:
+            product_concepts = await self._analyze_topics(
+                topics, concurrency, search_concurrency, llm_concurrency, batch_size
+            )
+        else:
+            pending = checkpoint.pending()
+            fresh = await self._analyze_topics(
+                pending, concurrency, search_concurrency, llm_concurrency, batch_size, checkpoint
+            ) if pending else []
+            by_keyword = {**checkpoint.concepts, **{c["keyword"]: c for c in fresh}}
+            product_concepts = [by_keyword[topic["keyword"]] for topic in topics]
 
+        # Step 3: Sort and categorize
+        return self.organize_results(product_concepts)
+
+    async def refresh_trends(
+        self,
+        previous_results: Optional[Dict],
+        limit: int = 10,
+        heat_change_ratio: float = 0.5,
+        concurrency: int = 1,
+        search_concurrency: Optional[int] = None,
+        llm_concurrency: Optional[int] = None,
+        batch_size: int = 1,
+        topic_selection: str = "rank",
+        candidate_pool: int = 50,
+        dedup_threshold: float = 0.0
+    ) -> Optional[Dict]:
+        """
+        Incremental analysis against an earlier report
+
+        Only topics missing from `previous_results`, whose earlier analysis
+        fell back to a placeholder concept, or whose heat moved by at least
+        `heat_change_ratio` since they were last analyzed, go through research
+        and AI analysis. Nothing is polled while the board is mock data. Other concepts are kept with their rank
+        refreshed; heat_value stays at the analyzed value so slow drift still
+        adds up to a re-analysis.
+
+        Args:
+            previous_results: Results dictionary to update (None starts from scratch)
+            limit: Number of trends to track
+            heat_change_ratio: Relative heat change that triggers re-analysis
+            concurrency, search_concurrency, llm_concurrency, batch_size,
+            topic_selection, candidate_pool, dedup_threshold: As for analyze_trends
+
+        Returns:
+            Updated results dictionary, or None if nothing needed analysis
+        """
+        print(f"🔄 Polling Weibo trending topics ({format_display_timestamp()})...")
+        topics = await self._fetch_topics(limit, topic_selection, candidate_pool, dedup_threshold)
         if not topics:
-            print("❌ No topics fetched. Exiting.")
-            return {"error": "No topics available"}
+            print("❌ No topics fetched, keeping the current report")
+            return None
+        if self.weibo_client.used_mock_data:
+            # The mock board is not today's board; don't compare it with or merge it into the live report
+            print("⚠️  Trending board unavailable (mock data), keeping the current report")
+            return None
+
+        known = {p["keyword"]: p for p in (previous_results or {}).get("all_products", [])}
+        # A topic already covered as a near-duplicate of an analyzed one is not new;
+        # its own heat at analysis time is kept in the cluster entry
+        aliases = {
+            related["keyword"]: (p, related)
+            for p in known.values()
+            for related in p.get(CLUSTER_FIELD, [])
+        }
 
-        print(f"✅ Fetched {len(topics)} trending topics\n")
+        changed = []
+        new_count = 0
+        retry_count = 0
+        for topic in topics:
+            if topic["keyword"] in known:
+                concept = known[topic["keyword"]]
+                previous_heat = concept.get("heat_value") or 0
+            elif topic["keyword"] in aliases:
+                concept, related = aliases[topic["keyword"]]
+                previous_heat = related.get("heat_value") or 0
+            else:
+                changed.append(topic)
+                new_count += 1
+                continue
+
+            if concept.get("fallback_reason"):
+                # A failed analysis is tried again, as on a resumed run
+                changed.append(topic)
+                retry_count += 1
+                continue
+
+            if abs(topic["heat_value"] - previous_heat) >= heat_change_ratio * max(previous_heat, 1):
+                changed.append(topic)
+            elif concept["keyword"] == topic["keyword"]:
+                concept["rank"] = topic["rank"]
+                concept.update({key: topic[key] for key in CARRIED_TOPIC_FIELDS if key in topic})
+
+        print(f"  🆕 {new_count} new, 🔁 {retry_count} retried, "
+              f"🔥 {len(changed) - new_count - retry_count} heat changed, "
+              f"⏭️  {len(topics) - len(changed)} unchanged\n")
+        if not changed:
+            return None
+
+        fresh = await self._analyze_topics(
+            changed, concurrency, search_concurrency, llm_concurrency, batch_size
+        )
+        for concept in fresh:
+            # Earlier concepts for topics now collapsed into this cluster are superseded
+            for related in concept.get(CLUSTER_FIELD, []):
+                known.pop(related["keyword"], None)
+            # So is a fallback concept this topic was collapsed into
+            representative = aliases.get(concept["keyword"], (None, None))[0]
+            if representative is not None and representative.get("fallback_reason"):
+                known.pop(representative["keyword"], None)
+            known[concept["keyword"]] = concept
+
+        return self.organize_results(list(known.values()))
+
+    async def _fetch_topics(
+        self,
+        limit: int,
+        topic_selection: str,
+        candidate_pool: int,
+        dedup_threshold: float
+    ) -> List[Dict]:
+        """Fetch the board and choose the topics to analyze (empty if nothing was fetched)"""
+        if self.replay_date is not None:
+            # Cached answers are keyed by prompts built from the original topics
+            print(f"📊 Step 1: Loading the topics of the {self.replay_date} report (replay)...")
+            topics = load_report_topics(self.replay_date)[:limit]
+            if topics:
+                print(f"✅ Loaded {len(topics)} topics\n")
+            return topics
+
+        print("📊 Step 1: Fetching Weibo trending topics...")
+        fetch_limit = max(limit, candidate_pool) if self.trajectory is not None else limit
+        board = await self.weibo_client.fetch_trending_topics_async(limit=fetch_limit)
+
+        if not board:
+            return []
+
+        print(f"✅ Fetched {len(board)} trending topics\n")
+        topics = self._select_topics(board, limit, topic_selection)
+
+        # Near-duplicate wordings of one event are researched and analyzed once
+        representatives = collapse_duplicates(topics, dedup_threshold)
+        if len(representatives) < len(topics):
+            print(f"🧬 Collapsed {len(topics)} topics into {len(representatives)} clusters:")
+            for topic in representatives:
+                if topic.get(CLUSTER_FIELD):
+                    related = "、".join(t["keyword"] for t in topic[CLUSTER_FIELD])
+                    print(f"  #{topic['rank']} {topic['keyword']} ← {related}")
+            print()
+        return representatives
+
+    async def _analyze_topics(
+        self,
+        topics: List[Dict],
+        concurrency: int,
+        search_concurrency: Optional[int],
+        llm_concurrency: Optional[int],
+        batch_size: int,
+        checkpoint: Optional[RunCheckpoint] = None
+    ) -> List[Dict]:
+        """Research and analyze topics using the configured execution mode"""
+        if batch_size > 1:
+            print(f"🔍 Step 2: Researching and analyzing topics (batches of {batch_size})...")
+            return await self._analyze_in_batches(
+                topics,
+                batch_size=batch_size,
+                search_concurrency=search_concurrency or concurrency,
+                llm_concurrency=llm_concurrency or concurrency,
+                checkpoint=checkpoint
+            )
+
+        if concurrency > 1:
+            print(f"🔍 Step 2: Researching and analyzing topics (concurrency: {concurrency})...")
+            return await self._analyze_concurrently(
+                topics,
+                concurrency=concurrency,
+                search_concurrency=search_concurrency or concurrency,
+                llm_concurrency=llm_concurrency or concurrency,
+                checkpoint=checkpoint
+            )
 
-        # Step 2: Research and analyze each topic
         print("🔍 Step 2: Researching and analyzing topics...")
         product_concepts = []
 
@@ -234,43 +810,57 @@ class WeiboTrendsAnalyzer:
 
             # Conduct web research
             print(f"  🔎 Researching background...")
-            research = self.search_client.research_topic(keyword)
+            research = await self.search_client.research_topic_async(keyword)
 
             # Analyze with Claude
             print(f"  🤖 Generating product concept with AI...")
             concept = await self.analyze_single_topic(topic, research)
+            if checkpoint is not None:
+                checkpoint.record(concept)
 
             product_concepts.append(concept)
             print(f"  ✅ {concept['product_name']} - Score: {concept['total_score']}/100 ({concept['tier_badge']})")
 
-        # Step 3: Sort and categorize
+        return product_concepts
+
+    def organize_results(self, product_concepts: List[Dict]) -> Dict:
+        """
+        Sort concepts by score and group them into tiers
+
+        Args:
+            product_concepts: Product concept dictionaries
+
+        Returns:
+            Complete analysis results dictionary
+        """
         print(f"\n📊 Step 3: Organizing results...")
-        product_concepts.sort(key=lambda x: x["total_score"], reverse=True)
-
-        # Categorize by tier
-        excellent = [p for p in product_concepts if p["total_score"] >= 80]
-        good = [p for p in product_concepts if 60 <= p["total_score"] < 80]
-        other = [p for p in product_concepts if p["total_score"] < 60]
-
-        # Calculate statistics
-        avg_score = sum(p["total_score"] for p in product_concepts) / len(product_concepts) if product_concepts else 0
-
-        results = {
-            "metadata": {
-                "generated_at": format_display_timestamp(),
-                "total_analyzed": len(product_concepts),
-                "average_score": round(avg_score, 1),
-                "excellent_count": len(excellent),
-                "good_count": len(good),
-                "other_count": len(other)
-            },
-            "products": {
-                "excellent": excellent,
-                "good": good,
-                "other": other
-            },
-            "all_products": product_concepts
-        }
+        with span("organize", concepts=len(product_concepts)):
+            product_concepts.sort(key=lambda x: x["total_score"], reverse=True)
+
+            # Categorize by tier
+            excellent = [p for p in product_concepts if p["total_score"] >= 80]
+            good = [p for p in product_concepts if 60 <= p["total_score"] < 80]
+            other = [p for p in product_concepts if p["total_score"] < 60]
+
+            # Calculate statistics
+            avg_score = sum(p["total_score"] for p in product_concepts) / len(product_concepts) if product_concepts else 0
+
+            results = {
+                "metadata": {
+                    "generated_at": format_display_timestamp(),
+                    "total_analyzed": len(product_concepts),
+                    "average_score": round(avg_score, 1),
+                    "excellent_count": len(excellent),
+                    "good_count": len(good),
+                    "other_count": len(other)
+                },
+                "products": {
+                    "excellent": excellent,
+                    "good": good,
+                    "other": other
+                },
+                "all_products": product_concepts
+            }
 
         print(f"\n✅ Analysis complete!")
         print(f"  🏆 Excellent (≥80): {len(excellent)}")
@@ -280,46 +870,330 @@ class WeiboTrendsAnalyzer:
 
         return results
 
-    def generate_html_report(self, results: Dict, output_dir: str = "reports") -> str:
+    def generate_html_report(
+        self,
+        results: Dict,
+        output_dir: str = "reports",
+        inline_cards: Optional[int] = None,
+        run_date: Optional[str] = None
+    ) -> str:
         """
         Generate HTML report from analysis results
 
+        Only the first `inline_cards` cards of each tier are rendered into the
+        page. The remaining cards are pre-rendered into a JSON card shard next
+        to the page, which the page fetches when the reader scrolls or searches
+        and renders only as they come into view.
+
         Args:
             results: Analysis results dictionary
             output_dir: Output directory
+            inline_cards: Cards per tier rendered into the page (defaults to
+                DASHBOARD_INLINE_CARDS; 0 renders every card into the page)
+            run_date: Report date (YYYY-MM-DD, defaults to today)
 
         Returns:
             Path to generated HTML file
         """
         print(f"\n📝 Generating HTML report...")
+        if inline_cards is None:
+            inline_cards = int(os.getenv("DASHBOARD_INLINE_CARDS", "12"))
+
+        with span("render") as render_span:
+            # Load template (parsed once per process, bytecode cached on disk)
+            template = get_template("dashboard_template.html")
+
+            # Precomputed search index, in card render order (excellent, good, other)
+            products = results["products"]
+            search_index = build_search_index(products["excellent"] + products["good"] + products["other"])
+            search_index_json = json.dumps(search_index, ensure_ascii=False, separators=(",", ":"))
+
+            # Cards are numbered across tiers in render order, matching the search index
+            tier_offsets = {}
+            page_cards = {}
+            lazy_cards = {}
+            offset = 0
+            for tier in ("excellent", "good", "other"):
+                tier_offsets[tier] = offset
+                page_cards[tier] = products[tier][:inline_cards] if inline_cards > 0 else products[tier]
+                remaining = len(products[tier]) - len(page_cards[tier])
+                if remaining:
+                    lazy_cards[tier] = {"start": offset + len(page_cards[tier]), "count": remaining}
+                offset += len(products[tier])
+
+            # Save HTML file
+            os.makedirs(output_dir, exist_ok=True)
+            filename = f"weibo-trends-analysis-{run_date or format_timestamp()}.html"
+            filepath = os.path.join(output_dir, filename)
+
+            # Cards beyond the inline ones go to a shard the page fetches on demand
+            shard_filename = filename.replace(".html", ".cards.json")
+            shard_path = os.path.join(output_dir, shard_filename)
+            card_shard = None
+            shard_size = 0
+            if lazy_cards:
+                version, shard_size = self._write_card_shard(shard_path, {
+                    tier: [(lazy["start"] + i, product)
+                           for i, product in enumerate(products[tier][len(page_cards[tier]):])]
+                    for tier, lazy in lazy_cards.items()
+                })
+                # The version query keeps browsers from pairing a page with a stale shard
+                card_shard = f"{shard_filename}?v={version}"
+            else:
+                remove_with_siblings(shard_path)
+
+            # Stream the rendered template straight to disk (replaced atomically when complete)
+            size = render_to_file(
+                template,
+                filepath,
+                assets=page_assets(output_dir, css="dashboard.css", js="dashboard.js"),
+                metadata=results["metadata"],
+                excellent_products=page_cards["excellent"],
+                good_products=page_cards["good"],
+                other_products=page_cards["other"],
+                tier_offsets=tier_offsets,
+                lazy_cards=lazy_cards,
+                card_shard=card_shard,
+                # "</" must not appear inside an inline <script>
+                search_index_json=search_index_json.replace("</", "<\\/")
+            )
+            if precompress_enabled():
+                precompress(filepath)
+            render_span.set(bytes=size + shard_size, lazy_cards=sum(l["count"] for l in lazy_cards.values()))
 
-        # Load template
-        template_dir = os.path.join(os.path.dirname(__file__), "templates")
-        env = Environment(loader=FileSystemLoader(template_dir))
-        template = env.get_template("dashboard_template.html")
-
-        # Render template
-        html_content = template.render(
-            metadata=results["metadata"],
-            excellent_products=results["products"]["excellent"],
-            good_products=results["products"]["good"],
-            other_products=results["products"]["other"]
-        )
+        print(f"✅ HTML report saved: {filepath}")
+        if lazy_cards:
+            print(f"  🗂️  {sum(l['count'] for l in lazy_cards.values())} card(s) load on demand from {shard_filename}")
+        return filepath
 
-        # Save HTML file
-        os.makedirs(output_dir, exist_ok=True)
-        filename = f"weibo-trends-analysis-{format_timestamp()}.html"
-        filepath = os.path.join(output_dir, filename)
+    def _write_card_shard(self, path: str, cards: Dict[str, List[Tuple[int, Dict]]]) -> Tuple[str, int]:
+        """
+        Pre-render cards into the page's on-demand card shard
 
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+        The shard maps each tier to its card HTML, in card order, and is
+        streamed to a temporary file that replaces `path` when complete.
 
-        print(f"✅ HTML report saved: {filepath}")
-        return filepath
+        Args:
+            path: Shard file
+            cards: Tier -> (card index, product) pairs
+
+        Returns:
+            (content version hash, size in bytes)
+        """
+        product_card = get_template("dashboard_card.html").module.product_card
+        digest = hashlib.sha1()
+        tmp_path = f"{path}.tmp"
+
+        with open(tmp_path, 'w', encoding='utf-8', buffering=RENDER_BUFFER_BYTES) as f:
+            def write(text: str):
+                f.write(text)
+                digest.update(text.encode('utf-8'))
+
+            write("{")
+            for n, (tier, entries) in enumerate(cards.items()):
+                write(("," if n else "") + json.dumps(tier) + ":[")
+                for i, (idx, product) in enumerate(entries):
+                    html = str(product_card(product, tier, idx)).strip()
+                    write(("," if i else "") + json.dumps(html, ensure_ascii=False))
+                write("]")
+            write("}")
+        os.replace(tmp_path, path)
+
+        if precompress_enabled():
+            precompress(path)
+        return digest.hexdigest()[:HASH_LENGTH], os.path.getsize(path)
+
+
+def load_daily_results(output_dir: str = "reports") -> Optional[Dict]:
+    """
+    Load today's analysis results, if a report was already written
+
+    Args:
+        output_dir: Reports directory
+
+    Returns:
+        Results dictionary, or None if there is no readable report for today
+    """
+    json_path = find_data_files(output_dir).get(format_timestamp())
+    if json_path is None:
+        return None
+    try:
+        return load_results(json_path)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        print(f"⚠️  Ignoring unreadable {json_path}: {e}")
+        return None
+
+
+def load_report_topics(date_str: str, output_dir: str = "reports") -> List[Dict]:
+    """
+    Rebuild the topic list a saved report was analyzed from
+
+    Args:
+        date_str: Report date (YYYY-MM-DD)
+        output_dir: Reports directory
+
+    Returns:
+        Topics in board order (empty if there is no readable report for that date)
+    """
+    json_path = find_data_files(output_dir).get(date_str)
+    if json_path is None:
+        print(f"❌ No saved report for {date_str} in {output_dir}/")
+        return []
+    try:
+        results = load_results(json_path)
+    except (OSError, ValueError) as e:
+        print(f"❌ Unreadable {json_path}: {e}")
+        return []
+
+    topics = []
+    for concept in sorted(results.get("all_products", []), key=lambda c: c.get("rank", 0)):
+        topic = {
+            "rank": concept["rank"],
+            "keyword": concept["keyword"],
+            "heat_value": concept["heat_value"],
+            "tag": concept.get("tag", ""),
+            "category": concept.get("category", "")
+        }
+        topic.update({key: concept[key] for key in CARRIED_TOPIC_FIELDS if key in concept})
+        topics.append(topic)
+    return topics
+
+
+def publish_results(
+    analyzer: WeiboTrendsAnalyzer,
+    results: Dict,
+    output_dir: str = "reports",
+    run_date: Optional[str] = None
+) -> Tuple[str, str]:
+    """
+    Write a run's results: similar-concept links, daily JSON, analytics store and HTML report
+
+    Earlier reports missing from the analytics store are backfilled first.
+
+    Args:
+        analyzer: Analyzer used to render the HTML report
+        results: Analysis results dictionary
+        output_dir: Reports directory
+        run_date: Report date (YYYY-MM-DD, defaults to today)
+
+    Returns:
+        (JSON path, HTML path)
+    """
+    run_date = run_date or format_timestamp()
+    similar_k = int(os.getenv("SIMILAR_CONCEPTS_K", "3"))
+
+    # Reports missing from the analytics store (e.g. after a cold cache) are ingested
+    # first, so history queries and similar-concept links see every earlier run
+    try:
+        store = AnalyticsStore()
+        backfilled = store.backfill(output_dir)
+        store.close()
+        if backfilled:
+            print(f"✅ Analytics store backfilled from {len(backfilled)} earlier report(s)")
+    except sqlite3.Error as e:
+        print(f"⚠️  Failed to backfill analytics store: {e}")
+
+    # Link each concept to its nearest concepts from earlier runs
+    concept_index = None
+    try:
+        concept_index = ConceptIndex()
+        concept_index.sync()
+        if similar_k > 0:
+            linked = concept_index.annotate(results["all_products"], k=similar_k, exclude_run_date=run_date)
+            print(f"✅ Found similar past concepts for {linked} product(s)")
+    except sqlite3.Error as e:
+        print(f"⚠️  Similar-concept lookup unavailable: {e}")
+
+    # Save JSON data (optional)
+    with span("save") as save_span:
+        json_path = save_results(results, output_dir, run_date)
+        save_span.set(bytes=os.path.getsize(json_path))
+    print(f"✅ JSON data saved: {json_path}")
+
+    # Append this run to the historical analytics store and the similarity index
+    try:
+        store = AnalyticsStore()
+        stored = store.ingest_results(results, run_date=run_date)
+        store.close()
+        print(f"✅ Analytics store updated: {stored} concept(s)")
+        if concept_index is not None:
+            concept_index.sync()
+    except sqlite3.Error as e:
+        print(f"⚠️  Failed to update analytics store: {e}")
+    finally:
+        if concept_index is not None:
+            concept_index.close()
+
+    # Generate HTML report
+    html_path = analyzer.generate_html_report(results, output_dir, run_date=run_date)
+    return json_path, html_path
+
+
+async def run_polling(
+    analyzer: WeiboTrendsAnalyzer,
+    interval_minutes: float,
+    heat_change_ratio: float,
+    max_polls: Optional[int] = None,
+    **analysis_options
+):
+    """
+    Poll the board and update today's report in place
+
+    Each poll diffs the board against today's report, analyzes only new or
+    heat-changed topics, and rewrites the JSON, HTML and index when anything
+    changed. A new day starts a new report.
+
+    Args:
+        analyzer: Configured analyzer
+        interval_minutes: Minutes between polls
+        heat_change_ratio: Relative heat change that triggers re-analysis
+        max_polls: Stop after this many polls (None = run until interrupted)
+        **analysis_options: Passed to refresh_trends
+    """
+    print(f"⏰ Polling every {interval_minutes:g} min "
+          f"(re-analysis at ±{heat_change_ratio:.0%} heat change)\n")
+    polls = 0
+
+    while True:
+        polls += 1
+        try:
+            results = await analyzer.refresh_trends(
+                load_daily_results(), heat_change_ratio=heat_change_ratio, **analysis_options
+            )
+            if results is not None:
+                _, html_path = publish_results(analyzer, results)
+                generate_index_html(get_report_files())
+                print(f"✅ Report updated in place: {html_path}")
+        except CacheMissError:
+            raise
+        except Exception as e:
+            print(f"❌ Poll failed, retrying next interval: {e}")
+
+        export_telemetry()
+
+        if max_polls and polls >= max_polls:
+            return
+
+        print(f"💤 Next poll in {interval_minutes:g} min\n")
+        await asyncio.sleep(interval_minutes * 60)
 
 
 async def main():
     """Main entry point"""
+    parser = argparse.ArgumentParser(description="Analyze Weibo trending topics")
+    parser.add_argument("--poll", action="store_true",
+                        help="keep running and update today's report with new or changed topics")
+    parser.add_argument("--interval", type=float,
+                        help="minutes between polls (default: $POLL_INTERVAL_MINUTES or 15)")
+    parser.add_argument("--max-polls", type=int, help="stop polling after this many polls")
+    parser.add_argument("--resume", action="store_true",
+                        help="continue the last interrupted run from its checkpoint")
+    parser.add_argument("--profile", action="store_true",
+                        help="profile the run (cProfile, tracemalloc, asyncio tasks) into $PROFILE_DIR or profiles/")
+    args = parser.parse_args()
+
     # Load configuration from environment variables
     tianapi_key = os.getenv("TIANAPI_KEY")
     search_api_key = os.getenv("SEARCH_API_KEY")
@@ -327,6 +1201,13 @@ async def main():
     anthropic_base_url = os.getenv("ANTHROPIC_BASE_URL")  # Optional: for third-party APIs
     search_engine = os.getenv("SEARCH_ENGINE", "serpapi")  # serpapi or google
     analysis_limit = int(os.getenv("ANALYSIS_LIMIT", "10"))
+    analysis_concurrency = int(os.getenv("ANALYSIS_CONCURRENCY", "1"))
+    search_concurrency = int(os.getenv("SEARCH_CONCURRENCY", "0")) or None
+    llm_concurrency = int(os.getenv("LLM_CONCURRENCY", "0")) or None
+    llm_batch_size = int(os.getenv("LLM_BATCH_SIZE", "1"))
+    topic_selection = os.getenv("TOPIC_SELECTION", "rank")  # rank or momentum
+    candidate_pool = int(os.getenv("MOMENTUM_CANDIDATE_POOL", "50"))
+    dedup_threshold = float(os.getenv("DEDUP_THRESHOLD", "0"))  # 0 (default) disables collapsing
 
     # Validate required environment variables
     if not all([tianapi_key, search_api_key, anthropic_api_key]):
@@ -335,32 +1216,111 @@ async def main():
         sys.exit(1)
 
     # Initialize analyzer
+    llm_cache = create_llm_cache_from_env()
+    replay_only = llm_cache is not None and llm_cache.replay_only
+    replay_date = os.getenv("REPLAY_DATE") or format_timestamp()
+    if replay_only:
+        print(f"♻️  Replay-only mode: regenerating the {replay_date} report from cached search and AI results")
+    search_cache = create_search_cache_from_env(ignore_ttl=replay_only)
+    try:
+        trajectory = create_trajectory_engine_from_env()
+    except sqlite3.Error as e:
+        print(f"⚠️  Heat history unavailable, falling back to board rank: {e}")
+        trajectory = None
     analyzer = WeiboTrendsAnalyzer(
         tianapi_key=tianapi_key,
         search_api_key=search_api_key,
         anthropic_api_key=anthropic_api_key,
         search_engine=search_engine,
-        anthropic_base_url=anthropic_base_url
+        anthropic_base_url=anthropic_base_url,
+        search_cache=search_cache,
+        llm_cache=llm_cache,
+        trajectory=trajectory,
+        replay_date=replay_date
     )
 
-    # Run analysis
-    results = await analyzer.analyze_trends(limit=analysis_limit)
-
-    if "error" in results:
-        print(f"❌ Analysis failed: {results['error']}")
-        sys.exit(1)
-
-    # Save JSON data (optional)
-    json_filename = f"weibo-trends-data-{format_timestamp()}.json"
-    json_path = save_json_data(results, "reports", json_filename)
-    print(f"✅ JSON data saved: {json_path}")
-
-    # Generate HTML report
-    html_path = analyzer.generate_html_report(results)
-
-    print(f"\n🎉 All done! Check the reports in the 'reports/' directory.")
-    print(f"📄 HTML Report: {html_path}")
-    print(f"📊 JSON Data: {json_path}")
+    analysis_options = {
+        "limit": analysis_limit,
+        "concurrency": analysis_concurrency,
+        "search_concurrency": search_concurrency,
+        "llm_concurrency": llm_concurrency,
+        "batch_size": llm_batch_size,
+        "topic_selection": topic_selection,
+        "candidate_pool": candidate_pool,
+        "dedup_threshold": dedup_threshold
+    }
+
+    with profile_run(profiling_enabled(args.profile)):
+        if args.poll:
+            # Long-running mode: keep today's report fresh, analyzing only what changed
+            interval = args.interval or float(os.getenv("POLL_INTERVAL_MINUTES", "15"))
+            heat_change_ratio = float(os.getenv("POLL_HEAT_CHANGE", "0.5"))
+            try:
+                await run_polling(analyzer, interval, heat_change_ratio, args.max_polls, **analysis_options)
+            except CacheMissError as e:
+                print(f"❌ {e}")
+                sys.exit(1)
+            finally:
+                await close_http_pool()
+        else:
+            # Completed topics are checkpointed so an interrupted run can be resumed
+            checkpoint = RunCheckpoint.latest() if args.resume else None
+            if args.resume and checkpoint is None:
+                print("📭 No checkpoint to resume, starting a new run")
+            checkpoint = checkpoint or RunCheckpoint.create()
+
+            # Run analysis
+            try:
+                results = await analyzer.analyze_trends(**analysis_options, checkpoint=checkpoint)
+            except CacheMissError as e:
+                print(f"❌ {e}")
+                sys.exit(1)
+            finally:
+                await close_http_pool()
+
+            if "error" in results:
+                print(f"❌ Analysis failed: {results['error']}")
+                sys.exit(1)
+
+            # A resumed run belongs to the day it started, not the day it finished
+            run_date = checkpoint.run_date or analyzer.replay_date
+            if args.resume and run_date and run_date != format_timestamp():
+                print(f"📅 Saving the resumed run under its start date {run_date}")
+
+            json_path, html_path = publish_results(analyzer, results, run_date=run_date)
+            checkpoint.discard()
+
+            print(f"\n🎉 All done! Check the reports in the 'reports/' directory.")
+            print(f"📄 HTML Report: {html_path}")
+            print(f"📊 JSON Data: {json_path}")
+
+    if search_cache is not None:
+        stats = search_cache.stats()
+        print(f"💾 Search cache: {stats['hits']} hits, {stats['misses']} misses, "
+              f"{stats['evictions']} evicted, {stats['entries']} entries")
+        search_cache.close()
+
+    for stats in resilience_stats():
+        print(f"🛡️  {stats['provider']}: {stats['calls']} calls, {stats['retries']} retries, "
+              f"{stats['failures']} failed, {stats['short_circuited']} short-circuited, "
+              f"{stats['throttled_seconds']}s throttled")
+
+    if llm_cache is not None:
+        stats = llm_cache.stats()
+        print(f"💾 LLM cache: {stats['hits']} hits, {stats['misses']} misses, "
+              f"{stats['evictions']} evicted, {stats['entries']} entries")
+        llm_cache.close()
+
+    tracer = get_tracer()
+    for stats in tracer.summary():
+        print(f"⏱️  {stats['stage']}: {stats['count']} span(s), {stats['seconds']}s total, "
+              f"p95 {stats['p95_ms']} ms, {stats['errors']} error(s), {stats['retries']} retries")
+    if tracer.fallbacks:
+        print("⚠️  Fallbacks: " + ", ".join(f"{reason} × {n}" for reason, n in tracer.fallbacks.items()))
+
+    exported = export_telemetry()
+    if exported is not None:
+        print(f"📈 Trace: {exported['trace']}, metrics: {exported['metrics']}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,36 @@
+import os
+import sys
+from types import SimpleNamespace
+from typing import Callable, List
+
+import pytest
+
+# Tests import the scripts as the "scripts" package, like the scripts themselves do
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts import resilience, weibo_analyzer
+
+
+class StubLLM:
+    """Stand-in for claude_agent_sdk.query that answers each prompt with `respond(prompt)`"""
+
+    def __init__(self):
+        self.prompts: List[str] = []
+        self.respond: Callable[[str], str] = lambda prompt: ""
+
+    async def query(self, prompt: str, **kwargs):
+        self.prompts.append(prompt)
+        answer = self.respond(prompt)
+        # Stream the answer in small chunks, like assistant message deltas
+        for start in range(0, len(answer), 16):
+            yield SimpleNamespace(content=[SimpleNamespace(text=answer[start:start + 16])])
+
+
+@pytest.fixture
+def stub_llm(monkeypatch):
+    """Route the analyzer's Claude calls to a StubLLM, without rate limiting or shared breaker state"""
+    monkeypatch.setenv("CLAUDE_RATE_LIMIT", "0")
+    monkeypatch.setattr(resilience, "_providers", {})
+    stub = StubLLM()
+    monkeypatch.setattr(weibo_analyzer, "query", stub.query)
+    return stub
@@ -0,0 +1,82 @@
+import asyncio
+import json
+
+from scripts.weibo_analyzer import WeiboTrendsAnalyzer
+
+RESEARCH = {
+    "social_media": "讨论热烈",
+    "news_background": "多家媒体报道",
+    "user_insights": "年轻人关注",
+    "market_potential": "周边需求旺盛"
+}
+
+TOPICS = [
+    {"keyword": "北京下雪", "rank": 1, "heat_value": 120000},
+    {"keyword": "春晚节目单", "rank": 2, "heat_value": 80000},
+    {"keyword": "元宵灯会", "rank": 3, "heat_value": 50000},
+]
+
+
+def _concept(keyword):
+    return {
+        "keyword": keyword,
+        "product_name": f"{keyword}冰箱贴",
+        "market_category": "文创",
+        "target_audience": "18-35岁年轻人群",
+        "description": "热搜主题周边",
+        "manufacturing_details": "小批量印刷",
+        "score_breakdown": {"development_potential": 30, "interest_level": 15,
+                            "life_utility": 10, "production_ease": 15},
+        "total_score": 70,
+        "score_justification": "测试"
+    }
+
+
+def _single_topic_answer(prompt):
+    keyword = next(t["keyword"] for t in TOPICS if f"**热搜话题**：{t['keyword']}" in prompt)
+    return json.dumps(_concept(keyword), ensure_ascii=False)
+
+
+def _analyze_batch():
+    analyzer = WeiboTrendsAnalyzer("test", "test", "test")
+    return asyncio.run(analyzer.analyze_topic_batch([(topic, RESEARCH) for topic in TOPICS]))
+
+
+def test_batch_answer_covers_every_topic(stub_llm):
+    stub_llm.respond = lambda prompt: json.dumps([_concept(t["keyword"]) for t in TOPICS], ensure_ascii=False)
+
+    concepts = _analyze_batch()
+
+    assert len(stub_llm.prompts) == 1
+    assert [c["keyword"] for c in concepts] == [t["keyword"] for t in TOPICS]
+    assert not any(c.get("fallback_reason") for c in concepts)
+
+
+def test_topics_missing_from_the_batch_are_analyzed_individually(stub_llm):
+    def respond(prompt):
+        if "### 话题" in prompt:
+            # The model skipped the middle topic and broke the last one
+            broken = dict(_concept("元宵灯会"), product_name="")
+            return json.dumps([_concept("北京下雪"), broken], ensure_ascii=False)
+        return _single_topic_answer(prompt)
+
+    stub_llm.respond = respond
+
+    concepts = _analyze_batch()
+
+    assert len(stub_llm.prompts) == 3
+    assert "**热搜话题**：春晚节目单" in stub_llm.prompts[1]
+    assert "**热搜话题**：元宵灯会" in stub_llm.prompts[2]
+    assert [c["product_name"] for c in concepts] == [f"{t['keyword']}冰箱贴" for t in TOPICS]
+    assert not any(c.get("fallback_reason") for c in concepts)
+
+
+def test_unparseable_batch_falls_back_to_one_request_per_topic(stub_llm):
+    stub_llm.respond = lambda prompt: "抱歉，暂时无法生成" if "### 话题" in prompt else _single_topic_answer(prompt)
+
+    concepts = _analyze_batch()
+
+    assert len(stub_llm.prompts) == 1 + len(TOPICS)
+    assert [c["keyword"] for c in concepts] == [t["keyword"] for t in TOPICS]
+    assert [c["rank"] for c in concepts] == [1, 2, 3]
+    assert not any(c.get("fallback_reason") for c in concepts)
@@ -0,0 +1,36 @@
+from scripts.checkpoint import RunCheckpoint
+
+TOPICS = [{"keyword": "北京下雪", "rank": 1}, {"keyword": "春晚节目单", "rank": 2}]
+
+
+def test_resumed_checkpoint_keeps_its_run_date(tmp_path):
+    checkpoint = RunCheckpoint.create(str(tmp_path))
+    checkpoint.start(TOPICS, "2026-01-11")
+
+    resumed = RunCheckpoint.latest(str(tmp_path))
+
+    assert resumed.path == checkpoint.path
+    assert resumed.run_date == "2026-01-11"
+    assert resumed.topics == TOPICS
+
+
+def test_pending_after_a_crash_mid_write(tmp_path):
+    topics = TOPICS + [{"keyword": "冬奥会开幕", "rank": 3}, {"keyword": "元宵灯会", "rank": 4}]
+    checkpoint = RunCheckpoint.create(str(tmp_path))
+    checkpoint.start(topics, "2026-01-11")
+    checkpoint.record({"keyword": "北京下雪", "product_name": "雪景冰箱贴"})
+    checkpoint.record({"keyword": "春晚节目单", "product_name": "", "fallback_reason": "LLM timeout"})
+    checkpoint.record({"keyword": "冬奥会开幕", "product_name": "吉祥物徽章"})
+
+    # The process dies while writing the last record
+    with open(checkpoint.path, "rb+") as f:
+        f.truncate(f.seek(0, 2) - 10)
+
+    resumed = RunCheckpoint.latest(str(tmp_path))
+
+    assert [t["keyword"] for t in resumed.pending()] == ["春晚节目单", "冬奥会开幕", "元宵灯会"]
+    assert list(resumed.concepts) == ["北京下雪"]
+
+    # New records start on a line of their own after the cut-off one is dropped
+    resumed.record({"keyword": "元宵灯会", "product_name": "灯笼夜灯"})
+    assert [t["keyword"] for t in RunCheckpoint(resumed.path).pending()] == ["春晚节目单", "冬奥会开幕"]
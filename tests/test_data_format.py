@@ -0,0 +1,44 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from scripts.data_format import data_filename, find_data_files, load_metadata, load_results, save_results
+
+DATE = "2026-01-11"
+
+PLACEHOLDER = "搜索不可用"
+
+
+def _results():
+    excellent = {"keyword": "北京下雪", "rank": 1, "total_score": 85, "product_name": "雪景冰箱贴",
+                 "research_summary": {"social_media": "雪景刷屏", "trends": PLACEHOLDER, "sources": 3}}
+    other = {"keyword": "春晚节目单", "rank": 2, "total_score": 40, "product_name": "春晚盲盒",
+             "research_summary": {"social_media": PLACEHOLDER, "trends": PLACEHOLDER}}
+    return {
+        "metadata": {"generated_at": "2026-01-11 08:00:00", "total_analyzed": 2, "average_score": 62.5},
+        "products": {"excellent": [excellent], "good": [], "other": [other]},
+        "all_products": [excellent, other]
+    }
+
+
+@pytest.mark.parametrize("fmt", ["json", "ndjson"])
+def test_save_and_load_round_trip(tmp_path, fmt):
+    path = save_results(_results(), str(tmp_path), DATE, fmt)
+
+    assert os.path.basename(path) == data_filename(DATE, fmt)
+    loaded = load_results(path)
+    assert loaded == _results()
+    # Tier lists share product objects with all_products, as after organize_results()
+    assert loaded["products"]["excellent"][0] is loaded["all_products"][0]
+    assert load_metadata(path) == _results()["metadata"]
+
+
+@pytest.mark.parametrize("fmt, other", [("json", "ndjson"), ("ndjson", "json")])
+def test_save_removes_the_other_format(tmp_path, fmt, other):
+    save_results(_results(), str(tmp_path), DATE, other)
+
+    path = save_results(_results(), str(tmp_path), DATE, fmt)
+
+    assert sorted(os.listdir(tmp_path)) == [data_filename(DATE, fmt)]
+    assert find_data_files(str(tmp_path)) == {DATE: Path(path)}
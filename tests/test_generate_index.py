@@ -0,0 +1,68 @@
+import os
+
+from scripts import generate_index
+from scripts.data_format import save_results
+from scripts.generate_index import MANIFEST_FILENAME, update_manifest
+
+RESULTS = {
+    "metadata": {"generated_at": "2026-01-11 09:00:00", "total_analyzed": 1},
+    "products": {"excellent": [], "good": [], "other": []},
+    "all_products": []
+}
+
+
+def _write_report(reports_path, date_str="2026-01-11"):
+    save_results(RESULTS, str(reports_path), date_str)
+    (reports_path / f"weibo-trends-analysis-{date_str}.html").write_text("<html></html>", encoding="utf-8")
+
+
+def _count_crc_reads(monkeypatch):
+    reads = []
+    original = generate_index._file_crc32
+
+    def counting(path):
+        reads.append(path.name)
+        return original(path)
+
+    monkeypatch.setattr(generate_index, "_file_crc32", counting)
+    return reads
+
+
+def test_manifest_is_unchanged_after_a_fresh_checkout(tmp_path):
+    stat_cache = str(tmp_path / "stat-cache.json")
+    reports_path = tmp_path / "reports"
+    reports_path.mkdir()
+    _write_report(reports_path)
+
+    update_manifest(str(reports_path), stat_cache)
+    manifest_file = reports_path / MANIFEST_FILENAME
+    before = manifest_file.read_bytes()
+
+    # A checkout rewrites every file with a new mtime but the same content
+    for path in reports_path.iterdir():
+        if path.name != MANIFEST_FILENAME:
+            os.utime(path, (1_900_000_000, 1_900_000_000))
+    manifest = update_manifest(str(reports_path), stat_cache)
+
+    assert manifest_file.read_bytes() == before
+    assert manifest["reports"]["2026-01-11"]["json"]["metadata"]["total_analyzed"] == 1
+    assert "mtime" not in manifest["reports"]["2026-01-11"]["json"]
+
+
+def test_unchanged_files_are_not_read_again(tmp_path, monkeypatch):
+    stat_cache = str(tmp_path / "stat-cache.json")
+    reports_path = tmp_path / "reports"
+    reports_path.mkdir()
+    _write_report(reports_path, "2026-01-11")
+    update_manifest(str(reports_path), stat_cache)
+
+    _write_report(reports_path, "2026-01-12")
+    reads = _count_crc_reads(monkeypatch)
+    manifest = update_manifest(str(reports_path), stat_cache)
+
+    assert reads == ["weibo-trends-data-2026-01-12.json"]
+    assert set(manifest["reports"]) == {"2026-01-11", "2026-01-12"}
+
+    reads.clear()
+    update_manifest(str(reports_path), stat_cache)
+    assert reads == []
@@ -0,0 +1,49 @@
+import time
+import asyncio
+
+import pytest
+
+from scripts.http_client import HTTPSessionPool
+
+
+async def _stalled_server(stall_seconds: float):
+    """Server that accepts connections and sends nothing for stall_seconds"""
+    async def handle(reader, writer):
+        await asyncio.sleep(stall_seconds)
+        writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    return server, f"http://127.0.0.1:{port}/"
+
+
+def test_pool_timeout_applies_without_per_call_override():
+    async def run():
+        server, url = await _stalled_server(3)
+        pool = HTTPSessionPool(timeout=0.5)
+        started = time.perf_counter()
+        try:
+            with pytest.raises(asyncio.TimeoutError):
+                await pool.get_json(url)
+        finally:
+            await pool.close()
+            server.close()
+        return time.perf_counter() - started
+
+    assert asyncio.run(run()) < 2
+
+
+def test_per_call_timeout_overrides_pool_timeout():
+    async def run():
+        server, url = await _stalled_server(3)
+        pool = HTTPSessionPool(timeout=30)
+        started = time.perf_counter()
+        try:
+            with pytest.raises(asyncio.TimeoutError):
+                await pool.get_json(url, timeout=0.5)
+        finally:
+            await pool.close()
+            server.close()
+        return time.perf_counter() - started
+
+    assert asyncio.run(run()) < 2
@@ -0,0 +1,43 @@
+import json
+
+from scripts.utils import JSONStreamExtractor, extract_json_object
+
+
+def _feed_split(text, split, opening="{"):
+    """Stream `text` in two chunks cut at `split`"""
+    extractor = JSONStreamExtractor(opening)
+    first = extractor.feed(text[:split])
+    return first if first is not None else extractor.feed(text[split:])
+
+
+def test_braces_inside_strings_do_not_close_the_object():
+    value = {"product_name": "大括号}}抱枕", "description": "用{和[装饰的]周边"}
+    text = "分析结果如下：" + json.dumps(value, ensure_ascii=False) + "\n以上。"
+
+    for split in range(len(text) + 1):
+        assert json.loads(_feed_split(text, split)) == value
+
+
+def test_escaped_quotes_and_backslashes_split_across_chunks():
+    value = {"slogan": '他说"热搜}"很火', "path": "C:\\周边\\", "tail": "\\\"}"}
+    text = json.dumps(value, ensure_ascii=False)
+
+    for split in range(len(text) + 1):
+        assert json.loads(_feed_split(text, split)) == value
+
+
+def test_object_streamed_one_character_at_a_time():
+    value = {"keyword": "北京下雪", "scores": [80, 90], "nested": {"a": {"b": "}"}}}
+    text = "```json\n" + json.dumps(value, ensure_ascii=False) + "\n```"
+    extractor = JSONStreamExtractor()
+
+    results = [extractor.feed(char) for char in text]
+
+    done = results.index(next(r for r in results if r is not None))
+    assert text[done] == "}" and text[done + 1:] == "\n```"
+    assert json.loads(extractor.result) == value
+
+
+def test_array_extraction_and_incomplete_input():
+    assert json.loads(extract_json_object('先说明 [{"k": "]"}, [1]] 后文 [2]', "[")) == [{"k": "]"}, [1]]
+    assert extract_json_object('{"keyword": "未完') is None
@@ -0,0 +1,36 @@
+import os
+import copy
+import shutil
+
+from scripts.analytics_store import AnalyticsStore
+from scripts.data_format import find_data_files, load_results
+from scripts.weibo_analyzer import WeiboTrendsAnalyzer, publish_results
+
+REPO_REPORTS = find_data_files(
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "reports")
+)
+
+
+def test_cold_analytics_store_is_backfilled_before_annotation(tmp_path, monkeypatch):
+    monkeypatch.setenv("ANALYTICS_DB_PATH", str(tmp_path / "cold-cache" / "analytics.sqlite"))
+    monkeypatch.setenv("REPORT_ASSETS", "inline")
+    monkeypatch.setenv("PRECOMPRESS", "off")
+
+    # Two earlier reports on disk, none of them in the (empty) analytics store
+    reports_dir = tmp_path / "reports"
+    reports_dir.mkdir()
+    past = sorted(REPO_REPORTS.items())[-2:]
+    for _, path in past:
+        shutil.copy(path, reports_dir / path.name)
+
+    # Today's run re-analyzes one of the earlier topics
+    results = load_results(past[-1][1])
+    analyzer = WeiboTrendsAnalyzer("test", "test", "test")
+    today = copy.deepcopy(results)
+    publish_results(analyzer, today, str(reports_dir), run_date="2099-01-01")
+
+    store = AnalyticsStore()
+    stats = store.stats()
+    store.close()
+    assert (stats["runs"], stats["first_run"], stats["last_run"]) == (3, past[0][0], "2099-01-01")
+    assert any(p["similar_concepts"] for p in today["all_products"])
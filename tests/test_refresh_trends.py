@@ -0,0 +1,61 @@
+import asyncio
+
+from scripts.weibo_analyzer import WeiboTrendsAnalyzer
+
+
+def _previous_results(alias_heat):
+    concept = {
+        "keyword": "北京下雪",
+        "rank": 1,
+        "heat_value": 2000,
+        "total_score": 70,
+        "related_topics": [{"keyword": "#北京下雪#", "rank": 2, "heat_value": alias_heat}]
+    }
+    return {"all_products": [concept]}
+
+
+def _refresh(previous_results, board, mock_board=False):
+    """Run refresh_trends against a fixed board; returns the topics sent for analysis"""
+    analyzer = WeiboTrendsAnalyzer("test", "test", "test")
+    analyzed = []
+
+    async def fetch_topics(*args):
+        analyzer.weibo_client.used_mock_data = mock_board
+        return board
+
+    async def analyze_topics(topics, *args):
+        analyzed.extend(topics)
+        return []
+
+    analyzer._fetch_topics = fetch_topics
+    analyzer._analyze_topics = analyze_topics
+    asyncio.run(analyzer.refresh_trends(previous_results, heat_change_ratio=0.5))
+    return [topic["keyword"] for topic in analyzed]
+
+
+def test_alias_heat_change_triggers_reanalysis():
+    # The alias nearly doubled, while still close to the representative's heat
+    board = [{"keyword": "#北京下雪#", "rank": 1, "heat_value": 1900}]
+
+    assert _refresh(_previous_results(alias_heat=1000), board) == ["#北京下雪#"]
+
+
+def test_unchanged_alias_is_not_reanalyzed():
+    # The alias's heat is far below the representative's but has not moved
+    board = [{"keyword": "#北京下雪#", "rank": 1, "heat_value": 1000}]
+
+    assert _refresh(_previous_results(alias_heat=1000), board) == []
+
+
+def test_fallback_concept_is_retried_at_unchanged_heat():
+    previous = _previous_results(alias_heat=1000)
+    previous["all_products"][0]["fallback_reason"] = "analysis_failed"
+    board = [{"keyword": "北京下雪", "rank": 1, "heat_value": 2000}]
+
+    assert _refresh(previous, board) == ["北京下雪"]
+
+
+def test_mock_board_is_not_polled():
+    board = [{"keyword": "完全不同的话题", "rank": 1, "heat_value": 5000}]
+
+    assert _refresh(_previous_results(alias_heat=1000), board, mock_board=True) == []
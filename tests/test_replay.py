@@ -0,0 +1,45 @@
+import asyncio
+
+from scripts.cache import LLMResponseCache
+from scripts.data_format import save_results
+from scripts.weibo_analyzer import WeiboTrendsAnalyzer
+
+REPLAY_DATE = "2026-01-11"
+
+CONCEPTS = [
+    {"keyword": "春晚节目单", "rank": 2, "heat_value": 80000, "tag": "热", "category": "综艺",
+     "total_score": 70, "product_name": "春晚盲盒", "velocity": 120.0},
+    {"keyword": "北京下雪", "rank": 1, "heat_value": 120000, "tag": "", "category": "",
+     "total_score": 85, "product_name": "雪景冰箱贴",
+     "related_topics": [{"keyword": "#北京初雪#", "rank": 5, "heat_value": 30000}]},
+]
+
+
+def _replay_analyzer(tmp_path):
+    cache = LLMResponseCache(str(tmp_path / "llm.sqlite"), replay_only=True)
+    analyzer = WeiboTrendsAnalyzer("test", "test", "test", llm_cache=cache, replay_date=REPLAY_DATE)
+
+    async def live_board(*args, **kwargs):
+        raise AssertionError("replay must not fetch the live board")
+
+    analyzer.weibo_client.fetch_trending_topics_async = live_board
+    return analyzer
+
+
+def test_replay_loads_topics_from_the_saved_report(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    save_results({"metadata": {}, "products": {}, "all_products": CONCEPTS}, "reports", REPLAY_DATE)
+
+    topics = asyncio.run(_replay_analyzer(tmp_path)._fetch_topics(10, "rank", 50, 0.0))
+
+    assert [t["keyword"] for t in topics] == ["北京下雪", "春晚节目单"]
+    assert topics[0]["heat_value"] == 120000
+    assert topics[0]["related_topics"] == CONCEPTS[1]["related_topics"]
+    assert topics[1]["velocity"] == 120.0
+    assert "product_name" not in topics[1]
+
+
+def test_replay_without_a_saved_report_has_no_topics(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    assert asyncio.run(_replay_analyzer(tmp_path)._fetch_topics(10, "rank", 50, 0.0)) == []
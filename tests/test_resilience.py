@@ -0,0 +1,79 @@
+import asyncio
+
+import pytest
+from claude_agent_sdk import CLIJSONDecodeError, CLINotFoundError, ProcessError
+
+from scripts.resilience import CircuitOpenError, ResilientProvider, TransientError
+from scripts.weibo_analyzer import is_transient_llm_error
+
+
+def _provider(**kwargs):
+    options = dict(rate=0, max_retries=0, failure_threshold=2, reset_timeout=0.05)
+    options.update(kwargs)
+    return ResilientProvider("test", **options)
+
+
+def _fail_with(exc):
+    async def fn():
+        raise exc
+    return fn
+
+
+async def _ok():
+    return "ok"
+
+
+def test_transient_failures_open_the_circuit():
+    async def run():
+        provider = _provider()
+        for _ in range(2):
+            with pytest.raises(TransientError):
+                await provider.call(_fail_with(TransientError("503")))
+        with pytest.raises(CircuitOpenError):
+            await provider.call(_ok)
+        return provider
+
+    assert asyncio.run(run()).circuit_opens == 1
+
+
+def test_non_transient_failures_do_not_open_the_circuit():
+    async def run():
+        provider = _provider()
+        for _ in range(5):
+            with pytest.raises(ValueError):
+                await provider.call(_fail_with(ValueError("bad request")))
+        return await provider.call(_ok), provider
+
+    result, provider = asyncio.run(run())
+    assert result == "ok"
+    assert provider.circuit_opens == 0
+
+
+def test_cancelled_half_open_trial_frees_the_trial_slot():
+    async def run():
+        provider = _provider(failure_threshold=1)
+        with pytest.raises(TransientError):
+            await provider.call(_fail_with(TransientError("503")))
+        await asyncio.sleep(0.06)
+
+        # The half-open trial call is cancelled before it finishes
+        trial = asyncio.ensure_future(provider.call(lambda: asyncio.sleep(10)))
+        await asyncio.sleep(0)
+        trial.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await trial
+
+        return await provider.call(_ok), provider.breaker.state
+
+    assert asyncio.run(run()) == ("ok", "closed")
+
+
+@pytest.mark.parametrize("exc, transient", [
+    (ProcessError("CLI crashed", exit_code=1), True),
+    (asyncio.TimeoutError(), True),
+    (CLINotFoundError("claude not installed"), False),
+    (CLIJSONDecodeError("{", ValueError("truncated")), False),
+    (ValueError("malformed prompt"), False),
+])
+def test_llm_error_classification(exc, transient):
+    assert is_transient_llm_error(exc) is transient
@@ -0,0 +1,43 @@
+import os
+import sys
+import subprocess
+
+from scripts.utils import build_search_index
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PRODUCTS = [
+    {"keyword": "北京下雪", "product_name": "雪景冰箱贴",
+     "related_topics": [{"keyword": "#北京初雪#"}]},
+    {"keyword": "iPhone 17 发布", "product_name": "Phone Case Pro"},
+    {"keyword": "春晚节目单", "product_name": "春晚主题盲盒"},
+]
+
+BUILD_SCRIPT = f"""
+import json
+from scripts.utils import build_search_index
+print(json.dumps(build_search_index({PRODUCTS!r}), ensure_ascii=False))
+"""
+
+
+def _build_with_hash_seed(seed: str) -> str:
+    env = dict(os.environ, PYTHONHASHSEED=seed)
+    result = subprocess.run(
+        [sys.executable, "-c", BUILD_SCRIPT],
+        cwd=REPO_ROOT, env=env, capture_output=True, text=True, check=True
+    )
+    return result.stdout
+
+
+def test_index_is_identical_under_different_hash_seeds():
+    outputs = {_build_with_hash_seed(seed) for seed in ("1", "2", "3")}
+
+    assert len(outputs) == 1
+
+
+def test_index_finds_products_by_bigram():
+    index = build_search_index(PRODUCTS)
+
+    assert index["grams"]["下雪"] == [0]
+    assert index["grams"]["春晚"] == [2]
+    assert "#北京初雪#" in index["texts"][0]
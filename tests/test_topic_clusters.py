@@ -0,0 +1,48 @@
+import pytest
+
+from scripts.topic_clusters import CLUSTER_FIELD, cluster_topics, collapse_duplicates
+
+# Recommended DEDUP_THRESHOLD when collapsing is enabled
+THRESHOLD = 0.8
+
+
+def _topics(*keywords):
+    return [{"keyword": keyword, "rank": rank, "heat_value": 1000 - rank}
+            for rank, keyword in enumerate(keywords, start=1)]
+
+
+def test_same_topic_with_hashtag_marks_is_collapsed():
+    collapsed = collapse_duplicates(_topics("#北京下雪#", "北京下雪"), THRESHOLD)
+
+    assert [t["keyword"] for t in collapsed] == ["#北京下雪#"]
+    assert collapsed[0][CLUSTER_FIELD] == [{"keyword": "北京下雪", "rank": 2, "heat_value": 998}]
+
+
+@pytest.mark.parametrize("first, second", [
+    ("iPhone 16", "iPhone 17"),
+    ("A股大涨", "港股大涨"),
+    ("春晚节目单公布", "春晚节目单"),
+])
+def test_near_miss_pairs_stay_separate(first, second):
+    collapsed = collapse_duplicates(_topics(first, second), THRESHOLD)
+
+    assert [t["keyword"] for t in collapsed] == [first, second]
+    assert all(CLUSTER_FIELD not in t for t in collapsed)
+
+
+def test_chained_near_matches_are_not_merged_transitively():
+    # Each neighbour pair estimates ~0.77, the two ends only ~0.56
+    topics = _topics("abcdefgh", "bcdefghi", "cdefghij")
+
+    clusters = cluster_topics(topics, 0.7)
+
+    assert [[t["keyword"] for t in cluster] for cluster in clusters] == [
+        ["abcdefgh", "bcdefghi"],
+        ["cdefghij"],
+    ]
+
+
+def test_zero_threshold_disables_collapsing():
+    topics = _topics("#北京下雪#", "北京下雪")
+
+    assert collapse_duplicates(topics, 0) == topics